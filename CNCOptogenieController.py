@@ -1,13 +1,17 @@
 # CNCOptogenieController.py
 
+import logging
 import sys
-from PySide6.QtWidgets import QApplication, QMainWindow, QHBoxLayout, QVBoxLayout, QWidget, QPushButton, QTextEdit
+from PySide6.QtWidgets import QApplication, QMainWindow, QHBoxLayout, QVBoxLayout, QWidget, QPushButton
+from PySide6.QtCore import QTimer
 from ui.components.TopBar import TopBar
 from ui.components.WorkListPanel import WorkListPanel
 from ui.components.RecipeLibraryPanel import RecipeLibraryPanel
 from ui.components.PlateGrid import PlateGrid
+from ui.components.LogView import LogView
 from src.data_controller import DataController
 from src.main_controller import MainController
+from src.log_bus import get_logger
 from ui.styles import modern_style  # Import the style sheet
 
 class CNCOptogenieController(QMainWindow):
@@ -26,9 +30,10 @@ class CNCOptogenieController(QMainWindow):
             }
         """)
 
-        # Initialize the database
-        self.data_controller = DataController()
-        self.data_controller.initialize_db()
+        # Initialize the database (one shared data layer for the whole app)
+        self.data_controller = DataController.shared()
+
+        self.log = get_logger("ui")
 
         # Initialize MainController without ports
         self.main_controller = MainController(self)
@@ -48,17 +53,8 @@ class CNCOptogenieController(QMainWindow):
         self.start_sequence_button.setStyleSheet("background-color: #2962ff; color: white; border-radius: 8px;")
         main_layout.addWidget(self.start_sequence_button)
 
-        # Log Window
-        self.log_window = QTextEdit()
-        self.log_window.setReadOnly(True)
-        self.log_window.setStyleSheet("""
-            QTextEdit {
-                background-color: #1e1e1e;
-                color: #d4d4d4;
-                font-family: Monaco, monospace;
-                font-size: 12px;
-            }
-        """)
+        # Log Window (batched from the shared log bus)
+        self.log_window = LogView(self.main_controller.log_bus)
         main_layout.addWidget(self.log_window)
         
         # Body Layout
@@ -83,11 +79,27 @@ class CNCOptogenieController(QMainWindow):
         
         self.setCentralWidget(main_widget)
 
-    def log_message(self, message):
-        """Append a log message to the log window."""
-        if hasattr(self, 'log_window'):
-            self.log_window.append(message)
-        print(message)  # Also print to console for debugging
+        # Hand Scheduled works to idle rigs and pick up finished ones
+        self.dispatch_timer = QTimer(self)
+        self.dispatch_timer.timeout.connect(self.dispatch_rigs)
+        self.dispatch_timer.start(2000)
+
+    def log_message(self, message, level=logging.INFO):
+        """Log a message; the log window picks it up on its next flush."""
+        self.log.log(level, message)
+
+    def dispatch_rigs(self):
+        """Poll the rig registry; only starts new works when auto-run is on."""
+        try:
+            finished = self.main_controller.rigs.collect(self.main_controller.data_controller)
+            started = []
+            if self.top_bar.auto_run_button.isChecked():
+                _, started = self.main_controller.dispatch_scheduled()
+            if finished or started:
+                self.work_list_panel.refresh_work_list()
+            self.top_bar.update_rig_status()
+        except Exception as e:
+            self.log_message(f"Error dispatching works: {e}", logging.ERROR)
 
     def start_sequence(self):
         """Start the sequence for moving and activating the LED."""
@@ -0,0 +1,148 @@
+# benchmarks/db_benchmark.py
+
+"""
+DataController benchmark on a large works table.
+
+    python -m benchmarks.db_benchmark [--rows 100000] [--repeat 5]
+
+Builds the same database twice in a temporary directory:
+
+  baseline – rollback journal, no indexes (the schema before WAL/indexes)
+  tuned    – WAL journal, synchronous=NORMAL, indexes from db/schema.sql
+
+with DataController's read cache off, and reports the median time of the
+queries the app runs most. It then repeats the point lookups with sqlite3's
+statement cache disabled, and a UI-style refresh loop with the read cache on. Commit timings
+depend heavily on the disk: WAL with synchronous=NORMAL saves the fsyncs a
+rollback journal needs, which a RAM-backed temp directory does not show.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+import src.data_controller as dc
+from src.data_controller import DataController
+
+INDEXES = ("idx_works_status", "idx_works_recipe_id")
+STATUSES = ["Finished"] * 98 + ["Scheduled", "In Progress"]
+
+
+def build(path, rows, tuned):
+    controller = DataController(path, journal_mode="WAL" if tuned else "DELETE", cache_size=0)
+    controller.initialize_db()
+    conn = controller.connection
+    if not tuned:
+        for index in INDEXES:
+            conn.execute(f"DROP INDEX IF EXISTS {index}")
+    rng = random.Random(1)
+    conn.executemany(
+        "INSERT INTO recipes (name, intensity, pulse_duration, frequency, spot_size) "
+        "VALUES (?, ?, ?, ?, ?)",
+        [(f"sweep-{i}", rng.randint(0, 255), rng.randint(1, 50), rng.randint(1, 20), 2.0)
+         for i in range(200)])
+    conn.executemany(
+        "INSERT INTO works (name, recipe_id, duration, status, priority) VALUES (?, ?, ?, ?, ?)",
+        [(f"work-{i}", rng.randint(1, 200), 60, rng.choice(STATUSES), rng.randint(0, 3))
+         for i in range(rows)])
+    conn.execute("INSERT INTO recipes (name, intensity, pulse_duration, frequency, spot_size) "
+                 "VALUES ('unused', 1, 1, 1, 1)")
+    conn.commit()
+    conn.execute("ANALYZE")
+    return controller
+
+
+def median_time(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def scenarios(controller, rows):
+    rng = random.Random(2)
+    ids = [rng.randint(1, rows) for _ in range(1000)]
+    scheduled = controller.get_scheduled_works()[:200]
+
+    def claim_and_release():
+        work = controller.claim_next_work()
+        controller.update_work_status(work[0], "Scheduled")
+
+    def recipe_in_use():
+        try:
+            controller.delete_recipe(1)
+        except Exception:
+            pass
+
+    def status_updates():
+        for work in scheduled:
+            controller.update_work_status(work[0], "Scheduled")
+
+    def point_lookups():
+        for work_id in ids:
+            controller.get_work_by_id(work_id)
+
+    return {
+        "get_works('Scheduled')":         controller.get_scheduled_works,
+        "claim_next_work + release":      claim_and_release,
+        "delete_recipe (in-use check)":   recipe_in_use,
+        "200 × update_work_status":       status_updates,
+        "1000 × get_work_by_id":          point_lookups,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, tuned in (("baseline", False), ("tuned", True)):
+            controller = build(os.path.join(tmp, f"{label}.db"), args.rows, tuned)
+            results[label] = {name: median_time(fn, args.repeat)
+                              for name, fn in scenarios(controller, args.rows).items()}
+            controller.close()
+
+        # Point lookups again with the prepared-statement cache switched off
+        cache_size = dc.STATEMENT_CACHE_SIZE
+        dc.STATEMENT_CACHE_SIZE = 0
+        try:
+            controller = DataController(os.path.join(tmp, "tuned.db"), cache_size=0)
+            lookups = scenarios(controller, args.rows)["1000 × get_work_by_id"]
+            no_cache = median_time(lookups, args.repeat)
+            controller.close()
+        finally:
+            dc.STATEMENT_CACHE_SIZE = cache_size
+
+        # A work list refresh: every Scheduled work and its recipe, repeatedly
+        refresh = {}
+        for label, size in (("off", 0), ("on", 512)):
+            controller = DataController(os.path.join(tmp, "tuned.db"), cache_size=size)
+
+            def refresh_list():
+                for work in controller.get_scheduled_works()[:200]:
+                    controller.get_recipe_by_id(work[2])
+
+            refresh[label] = median_time(refresh_list, args.repeat)
+            stats = controller.cache_stats()
+            controller.close()
+
+    print(f"works table: {args.rows} rows, median of {args.repeat} runs (ms)\n")
+    print(f"{'':32} {'baseline':>10} {'tuned':>10} {'speed-up':>9}")
+    for name in results["baseline"]:
+        base, tuned = results["baseline"][name] * 1e3, results["tuned"][name] * 1e3
+        print(f"{name:32} {base:10.2f} {tuned:10.2f} {base / tuned:8.1f}×")
+    print(f"\n1000 × get_work_by_id without statement cache: {no_cache * 1e3:.2f} ms")
+    print(f"work list refresh, read cache off: {refresh['off'] * 1e3:.2f} ms, "
+          f"on: {refresh['on'] * 1e3:.2f} ms ({stats['hits']} hits, {stats['misses']} misses)")
+
+
+if __name__ == "__main__":
+    main()
@@ -15,5 +15,32 @@ CREATE TABLE IF NOT EXISTS works (
     recipe_id INTEGER,
     duration INTEGER,
     status TEXT CHECK(status IN ('Scheduled', 'In Progress', 'Finished')) NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
     FOREIGN KEY (recipe_id) REFERENCES recipes (id)
 );
+
+-- Recipe library search: name prefix and order, and parameter ranges
+CREATE INDEX IF NOT EXISTS idx_recipes_name ON recipes (name COLLATE NOCASE, id);
+CREATE INDEX IF NOT EXISTS idx_recipes_intensity ON recipes (intensity);
+CREATE INDEX IF NOT EXISTS idx_recipes_frequency ON recipes (frequency);
+CREATE INDEX IF NOT EXISTS idx_recipes_pulse_duration ON recipes (pulse_duration);
+CREATE INDEX IF NOT EXISTS idx_recipes_spot_size ON recipes (spot_size);
+
+-- get_works(status) and the run queue (claim_next_work) filter on status,
+-- the queue in (priority DESC, id) order; delete_recipe counts works by recipe_id
+CREATE INDEX IF NOT EXISTS idx_works_status ON works (status, priority DESC);
+CREATE INDEX IF NOT EXISTS idx_works_recipe_id ON works (recipe_id);
+
+-- Per-step run telemetry, written in batches by src/telemetry.py
+CREATE TABLE IF NOT EXISTS run_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    work_id INTEGER,
+    rig TEXT,
+    point_index INTEGER,
+    event TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    value REAL,
+    message TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_run_events_work ON run_events (work_id, timestamp);
@@ -1,5 +1,7 @@
 import serial
 import time
+from src.kinematics import MotionLimits
+from src.path_planner import order_points
 
 # Define the COM ports for the G-code printer and Arduino
 gcode_port = '/dev/cu.usbserial-1130'  # Change to the correct port for your G-code printer
@@ -63,8 +65,13 @@ def moveTo(x, y):
 # Initialize the printer
 initPrinter()
 
+# Visit the slide centres in the order with the least travel from home
+limits = MotionLimits(feedrate=speed, acceleration=acceleration)
+route = order_points(slideCentres, start=(0, 0), cost=limits.move_time)
+print(f"Route {route.order}: {route.travel_time:.1f} s travel, {route.saving:.1f} s saved")
+
 # Move to each slide center sequentially with a 5-second delay between movements
-for center in slideCentres:
+for center in route.points:
     moveTo(center[0], center[1])
     print(f"Moved to ({center[0]}, {center[1]})")
 
@@ -3,13 +3,68 @@ Arduino laser-pulser host driver   –   v2.0
 Protocol:  R,intensity,sequenceSeconds,frequencyHz,pulseDurationMs
 """
 
-import time, serial
+import queue, threading, time, serial
+from collections import deque
+from concurrent.futures import Future, FIRST_COMPLETED, wait
+from dataclasses import dataclass
 from serial import SerialException
+from src.log_bus import get_logger
+
+log = get_logger("arduino")
+
+
+@dataclass(frozen=True)
+class SerialEvent:
+    """One line received from the Arduino, stamped on arrival."""
+    timestamp: float
+    line:      str
+
+
+@dataclass(frozen=True)
+class RecipeCommand:
+    """A validated recipe, ready to be sent as one ``R,...`` line."""
+    intensity:         int
+    sequence_seconds:  int
+    frequency_hz:      int
+    pulse_duration_ms: int
+
+    @property
+    def line(self) -> str:
+        return (f"R,{self.intensity},{self.sequence_seconds},"
+                f"{self.frequency_hz},{self.pulse_duration_ms}")
+
+    @property
+    def done_timeout(self) -> float:
+        # dynamic timeout: whole sequence + 20 % + 5 s
+        return self.sequence_seconds * 1.2 + 5
+
+
+@dataclass
+class StagedRecipe:
+    """A recipe encoded and subscribed for, waiting only for its write."""
+    recipe: RecipeCommand
+    data:   bytes
+    ack:    Future
+    err:    Future
+    done:   Future
+
 
 class ArduinoController:
-    def __init__(self, port: str, baud_rate: int = 115200):
+    def __init__(self, port: str, baud_rate: int = 115200,
+                 event_queue_size: int = 1000,
+                 serial_factory=None, reset_delay: float = 2):
         self.port, self.baud = port, baud_rate
+        # serial.Serial by default; src.simulators.LaserArduinoSimulator for tests
+        self.serial_factory, self.reset_delay = serial_factory, reset_delay
         self.ser = None
+        # every received line, oldest dropped first once full
+        self.events = queue.Queue(maxsize=event_queue_size)
+        # lines no subscriber took yet, for await_response (like unread input)
+        self._unclaimed = deque(maxlen=event_queue_size)
+        self._subscribers = []                     # [(token, Future)]
+        self._lock = threading.Lock()
+        self._reader = None
+        self._stop_reader = threading.Event()
         self.connect()
 
     # ───────────────────────────────────────────────────────────
@@ -17,62 +72,158 @@ class ArduinoController:
     # ───────────────────────────────────────────────────────────
     def connect(self) -> bool:
         try:
+            self._stop_reader.set()              # closing the port wakes the reader
             if self.ser and self.ser.is_open:
                 self.ser.close()
-            self.ser = serial.Serial(self.port, self.baud, timeout=1)
-            time.sleep(2)                             # auto-reset pause
+            self._stop_reader_thread()
+            factory = self.serial_factory or serial.Serial
+            self.ser = factory(self.port, self.baud, timeout=1)
+            time.sleep(self.reset_delay)              # auto-reset pause
             self.ser.reset_input_buffer()
             self.ser.reset_output_buffer()
+            with self._lock:
+                self._unclaimed.clear()
+            self._start_reader_thread()
             return True
         except SerialException as e:
-            print(f"[Serial] connect failed: {e}")
+            log.error(f"[Serial] connect failed: {e}")
             self.ser = None
             return False
 
     def reconnect(self) -> bool:
-        print("[Serial] reconnecting …")
+        log.warning("[Serial] reconnecting …")
+        self._stop_reader_thread()
         if self.ser and self.ser.is_open:
             self.ser.close()
         time.sleep(1)
         return self.connect()
 
     def close(self):
+        self._stop_reader.set()          # closing the port wakes the reader
         if self.ser and self.ser.is_open:
             self.ser.close()
             self.ser = None
+        self._stop_reader_thread()
+
+    # ───────────────────────────────────────────────────────────
+    #  Background reader & response dispatcher
+    # ───────────────────────────────────────────────────────────
+    def _start_reader_thread(self):
+        self._stop_reader.clear()
+        self._reader = threading.Thread(target=self._reader_loop,
+                                        name=f"arduino-reader-{self.port}",
+                                        daemon=True)
+        self._reader.start()
+
+    def _stop_reader_thread(self):
+        self._stop_reader.set()
+        if self._reader and self._reader is not threading.current_thread():
+            self._reader.join(timeout=2)
+        self._reader = None
+
+    def _reader_loop(self):
+        ser = self.ser
+        while not self._stop_reader.is_set():
+            try:
+                raw = ser.readline()
+            except (SerialException, OSError, TypeError) as e:
+                if not self._stop_reader.is_set():
+                    log.error(f"[Serial] reader stopped: {e}")
+                    self._fail_subscribers(e)
+                return
+            line = raw.decode('ascii', errors='replace').strip()
+            if line:
+                self._dispatch(SerialEvent(time.time(), line))
+
+    def _dispatch(self, event: SerialEvent):
+        log.debug(f"Arduino response: {event.line}")
+        try:
+            self.events.put_nowait(event)
+        except queue.Full:
+            self.events.get_nowait()
+            self.events.put_nowait(event)
+
+        with self._lock:
+            matched = [(t, f) for t, f in self._subscribers if t in event.line]
+            self._subscribers = [(t, f) for t, f in self._subscribers
+                                 if t not in event.line]
+            if not matched:
+                self._unclaimed.append(event)
+        for _, future in matched:
+            if not future.done():
+                future.set_result(event)
+
+    def _fail_subscribers(self, exc):
+        with self._lock:
+            pending, self._subscribers = self._subscribers, []
+        for _, future in pending:
+            if not future.done():
+                future.set_exception(SerialException(str(exc)))
+
+    def subscribe(self, token: str) -> Future:
+        """
+        Future resolved with the next SerialEvent whose line contains
+        ``token`` (e.g. ACK, DONE, OK, ERR, PROGRESS).
+
+        Subscribe *before* writing the command that triggers the reply so
+        that a fast answer cannot be missed.
+        """
+        future = Future()
+        with self._lock:
+            self._subscribers.append((token, future))
+        return future
+
+    def _claim_or_subscribe(self, token: str) -> Future:
+        """
+        Future of the oldest unclaimed line containing ``token`` (already
+        resolved; it and the lines before it are consumed, as reading the
+        serial buffer used to), or else of the next one to arrive.
+        """
+        future = Future()
+        with self._lock:
+            for k, event in enumerate(self._unclaimed):
+                if token in event.line:
+                    for _ in range(k + 1):
+                        self._unclaimed.popleft()
+                    future.set_result(event)
+                    return future
+            self._subscribers.append((token, future))
+        return future
+
+    def unsubscribe(self, future: Future):
+        with self._lock:
+            self._subscribers = [(t, f) for t, f in self._subscribers
+                                 if f is not future]
+        future.cancel()
 
     # ───────────────────────────────────────────────────────────
     #  Helper: wait for specific response
     # ───────────────────────────────────────────────────────────
-    def _await(self, expected_response, timeout=5):
+    def _await(self, expected_response, timeout=5, future=None):
         """Wait for a specific response from Arduino with timeout."""
         if not self.ser or not self.ser.is_open:
             return None
 
-        start_time = time.time()
-        while (time.time() - start_time) < timeout:
-            try:
-                if self.ser.in_waiting > 0:
-                    response = self.ser.readline().decode('ascii').strip()
-                    print(f"Arduino response: {response}")
-                    if expected_response in response:
-                        return response
-                time.sleep(0.1)
-            except SerialException:
-                self.reconnect()
-                return None
-        return None
+        future = future or self._claim_or_subscribe(expected_response)
+        try:
+            return future.result(timeout=timeout).line
+        except SerialException:
+            self.reconnect()
+            return None
+        except Exception:
+            self.unsubscribe(future)
+            return None
 
     # ───────────────────────────────────────────────────────────
     #  Public API
     # ───────────────────────────────────────────────────────────
-    def send_recipe_command(self,
-                            intensity:        float,
-                            sequence_seconds: float,
-                            frequency_hz:     float,
-                            pulse_duration_ms:float):
+    def prepare_recipe(self,
+                       intensity:        float,
+                       sequence_seconds: float,
+                       frequency_hz:     float,
+                       pulse_duration_ms:float) -> "RecipeCommand":
         """
-        Send one pulse-train recipe.
+        Validate one pulse-train recipe and build its command.
 
         intensity         – 0-255
         sequence_seconds  – total length of the train
@@ -99,24 +250,71 @@ class ArduinoController:
             raise ValueError(f"Pulse duration ({pulse_i} ms) exceeds "
                              f"period ({int(period_ms)} ms) for {freq_i} Hz")
 
-        # ---- build & send command ---------------------------------
-        cmd = f"R,{intensity_i},{seq_i},{freq_i},{pulse_i}"
-        print(f"[Host] → {cmd}")
+        return RecipeCommand(intensity_i, seq_i, freq_i, pulse_i)
+
+    def stage_recipe(self, recipe: "RecipeCommand") -> StagedRecipe:
+        """
+        Encode a prepared recipe and subscribe to its replies without sending it.
+
+        The firmware starts a train as soon as it parses an ``R`` line, so this
+        is as far ahead as a recipe can be uploaded. Stage only once the
+        previous train has reported DONE; ``fire_recipe`` or ``discard_recipe``
+        must follow.
+        """
+        return StagedRecipe(recipe, (recipe.line + "\n").encode(),
+                            self.subscribe("ACK"), self.subscribe("ERR"),
+                            self.subscribe("DONE"))
+
+    def discard_recipe(self, staged: StagedRecipe):
+        for future in (staged.ack, staged.err, staged.done):
+            self.unsubscribe(future)
+
+    def start_recipe(self, recipe: "RecipeCommand") -> Future:
+        """
+        Send a prepared recipe and wait for its ACK.
+
+        Returns the Future of the matching DONE line; the pulse train is
+        running on the Arduino when this returns.
+        """
+        return self.fire_recipe(self.stage_recipe(recipe))
+
+    def fire_recipe(self, staged: StagedRecipe) -> Future:
+        """Write a staged recipe and wait for its ACK; returns the DONE Future."""
+        log.debug(f"[Host] → {staged.recipe.line}")
+        ack, err, done = staged.ack, staged.err, staged.done
         try:
-            self.ser.write((cmd + "\n").encode())
+            self.ser.write(staged.data)
             self.ser.flush()
         except SerialException as e:
+            self.discard_recipe(staged)
             raise RuntimeError("Serial write failed") from e
 
         # ---- handshake --------------------------------------------
-        if not self._await("ACK", timeout=2):
+        wait((ack, err), timeout=2, return_when=FIRST_COMPLETED)
+        self.unsubscribe(err)
+        if err.done() and not err.cancelled() and not ack.done():
+            self.unsubscribe(ack)
+            self.unsubscribe(done)
+            raise RuntimeError("Arduino rejected recipe (ERR)")
+        if not self._await("ACK", future=ack, timeout=0):
+            self.unsubscribe(done)
             raise RuntimeError("ACK not received")
+        return done
 
-        # dynamic timeout: whole sequence + 20 % + 5 s
-        if not self._await("DONE", timeout=seq_i * 1.2 + 5):
+    def send_recipe_command(self,
+                            intensity:        float,
+                            sequence_seconds: float,
+                            frequency_hz:     float,
+                            pulse_duration_ms:float):
+        """Send one pulse-train recipe and block until the Arduino reports DONE."""
+        recipe = self.prepare_recipe(intensity, sequence_seconds,
+                                     frequency_hz, pulse_duration_ms)
+        done = self.start_recipe(recipe)
+
+        if not self._await("DONE", future=done, timeout=recipe.done_timeout):
             raise RuntimeError("DONE not received in time")
 
-        print("[Host] ✓ sequence complete")
+        log.info("[Host] ✓ sequence complete")
         return True
 
     def test_connection(self):
@@ -125,17 +323,23 @@ class ArduinoController:
             return False
 
         try:
+            ok = self.subscribe("OK")
             self.ser.write(b'TEST\n')
-            response = self._await("OK", timeout=2)
+            response = self._await("OK", timeout=2, future=ok)
             return response is not None
         except Exception as e:
-            print(f"Error testing Arduino connection: {e}")
+            log.error(f"Error testing Arduino connection: {e}")
             return False
-        
+
     def await_response(self, token: str = "DONE", timeout: float = 60):
         """
         Public wrapper around the internal _await().
         Keeps backward-compatibility while giving other modules a
         stable, non-underscored API.
+
+        Like the old serial-buffer read, a matching line that arrived before
+        the call is returned if no subscriber has taken it (replies awaited
+        through ``subscribe``, e.g. by ``send_recipe_command``, are taken).
+        Callers that can should still ``subscribe`` before writing.
         """
-        return self._await(token, timeout)
\ No newline at end of file
+        return self._await(token, timeout)
@@ -0,0 +1,65 @@
+# src/calibration.py
+
+"""
+Plate calibration from jogged reference points.
+
+The nominal plate layout (RAW mm) is related to machine coordinates by a
+least-squares affine fit over three or more reference points. Every other
+well or point on the plate is then derived from the fit instead of being
+jogged to by hand.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.coords import CoordSystem
+
+
+@dataclass
+class PlateCalibration:
+    matrix: np.ndarray        # 3×3 affine, nominal RAW → CNC
+    residuals: np.ndarray     # per reference point, mm
+    n_points: int
+
+    @property
+    def rms_error(self) -> float:
+        return float(np.sqrt(np.mean(self.residuals ** 2))) if self.n_points else 0.0
+
+    @property
+    def max_error(self) -> float:
+        return float(self.residuals.max()) if self.n_points else 0.0
+
+    def apply(self, points_raw) -> np.ndarray:
+        """Machine (CNC) coordinates for nominal RAW points, N×2."""
+        pts = np.asarray(points_raw, dtype=float).reshape(-1, 2)
+        return pts @ self.matrix[:2, :2].T + self.matrix[:2, 2]
+
+    def coord_system(self, mag_factor=4.0) -> CoordSystem:
+        """CoordSystem whose RAW → CNC conversion is this fit."""
+        return CoordSystem(mag_factor=mag_factor, cnc_transform=self.matrix)
+
+
+def fit_affine(nominal_raw, measured_cnc) -> PlateCalibration:
+    """
+    Least-squares affine fit mapping nominal RAW points to measured CNC points.
+
+    Needs at least three reference points that are not collinear. With
+    exactly three the fit is exact and the residuals are zero.
+    """
+    src = np.asarray(nominal_raw, dtype=float).reshape(-1, 2)
+    dst = np.asarray(measured_cnc, dtype=float).reshape(-1, 2)
+    if len(src) != len(dst):
+        raise ValueError("Nominal and measured point lists differ in length")
+    if len(src) < 3:
+        raise ValueError("Calibration needs at least 3 reference points")
+
+    design = np.column_stack([src, np.ones(len(src))])
+    coeffs, _, rank, _ = np.linalg.lstsq(design, dst, rcond=None)
+    if rank < 3:
+        raise ValueError("Reference points are collinear; pick points spread over the plate")
+
+    matrix = np.eye(3)
+    matrix[:2, :] = coeffs.T
+    residuals = np.linalg.norm(design @ coeffs - dst, axis=1)
+    return PlateCalibration(matrix=matrix, residuals=residuals, n_points=len(src))
@@ -0,0 +1,245 @@
+# src/cli.py
+
+"""
+Command-line runner for scripts and quick checks, without the GUI.
+
+    python -m src.cli works [--status Scheduled]
+    python -m src.cli run WORK_ID --gcode PORT --arduino PORT
+    python -m src.cli calibrate --gcode PORT [--dwell 5]
+    python -m src.cli test [--gcode PORT] [--arduino PORT]
+
+Only the standard library is imported up front; each command imports the
+``src`` modules it needs when it runs, and nothing here imports Qt or
+matplotlib. ``--timing`` prints where start-up time went.
+"""
+
+import argparse
+import sys
+import time
+
+_T0 = time.perf_counter()
+
+
+class StartupTimer:
+    """Collects ``(label, seconds since start)`` marks for ``--timing``."""
+
+    def __init__(self, enabled):
+        self.enabled = enabled
+        self.marks = [("cli imported", time.perf_counter() - _T0)]
+
+    def mark(self, label):
+        self.marks.append((label, time.perf_counter() - _T0))
+
+    def report(self):
+        if not self.enabled:
+            return
+        print("\nTiming (s since src.cli was imported):", file=sys.stderr)
+        previous = 0.0
+        for label, t in self.marks:
+            print(f"  {t:8.3f}  (+{t - previous:.3f})  {label}", file=sys.stderr)
+            previous = t
+
+
+# ───────────────────────── commands ─────────────────────────
+def cmd_works(args, timer):
+    from src.data_controller import DataController
+    timer.mark("imported data_controller")
+
+    data_controller = DataController.shared(args.db)
+    works = data_controller.get_works(status=args.status)
+    timer.mark("queried works")
+    print(f"{'ID':>5}  {'Status':<12} {'Prio':>4}  {'Dur (s)':>7}  {'Recipe':<20} Name")
+    for work in works:
+        print(f"{work[0]:>5}  {work[4]:<12} {work[5]:>4}  {work[3]:>7}  "
+              f"{str(work[6]):<20} {work[1]}")
+    data_controller.close()
+    return 0
+
+
+def _connect_printer(args, timer):
+    from src.gcode_printer_controller import GCodePrinterController
+    timer.mark("imported gcode_printer_controller")
+    printer = GCodePrinterController(port=args.gcode, reset_delay=args.reset_delay)
+    if not printer.ser:
+        raise RuntimeError(f"Failed to connect to G-code printer on {args.gcode}")
+    timer.mark("printer port open")
+    return printer
+
+
+def _connect_arduino(args, timer):
+    from src.arduino_controller import ArduinoController
+    timer.mark("imported arduino_controller")
+    arduino = ArduinoController(port=args.arduino, reset_delay=args.reset_delay)
+    if not arduino.ser:
+        raise RuntimeError(f"Failed to connect to Arduino on {args.arduino}")
+    timer.mark("arduino port open")
+    return arduino
+
+
+def cmd_run(args, timer):
+    from src.coords import WELL_CENTERS_RAW, CoordSystem
+    from src.data_controller import DataController
+    from src.dosimetry import work_dose, describe
+    from src.run_engine import RunEngine, plan_job
+    from src.settle import SettlePolicy
+    from src.telemetry import TelemetryWriter
+    timer.mark("imported run modules")
+
+    data_controller = DataController.shared(args.db)
+    work = data_controller.get_work_by_id(args.work_id)
+    if not work:
+        print(f"Work {args.work_id} not found", file=sys.stderr)
+        return 1
+    recipe = data_controller.get_recipe_by_id(work[2])
+    if not recipe:
+        print(f"Recipe {work[2]} of work {args.work_id} not found", file=sys.stderr)
+        return 1
+    timer.mark("loaded work")
+
+    printer = _connect_printer(args, timer)
+    arduino = None
+    telemetry = TelemetryWriter(data_controller)
+    try:
+        arduino = _connect_arduino(args, timer)
+        engine = RunEngine(printer, arduino, settle=SettlePolicy(dwell_s=args.dwell),
+                           telemetry=telemetry, name="cli")
+        job, plan = plan_job(work, recipe, WELL_CENTERS_RAW, CoordSystem(mag_factor=4),
+                             printer, home=not args.no_home)
+        timer.mark("planned route")
+
+        first = []
+
+        def show(event):
+            if not first:
+                first.append(event)
+                timer.mark("first command")
+            print(f"[{event.state.value:<11}] {event.message}"
+                  + (f"  (~{event.remaining:.0f} s left)" if event.remaining else ""))
+
+        engine.add_listener(show)
+        print(f"Work {work[0]} ({work[1]}): route {job.labels}, "
+              f"{plan.travel_time:.1f} s travel")
+        print(f"Dose: {describe(work_dose(work, recipe), n_wells=len(job.labels))}")
+        data_controller.update_work_status(work[0], "In Progress")
+        try:
+            ok = engine.run(job)
+        except KeyboardInterrupt:
+            engine.abort()
+            ok = False
+        data_controller.update_work_status(work[0], "Finished" if ok else "Scheduled")
+        return 0 if ok else 1
+    finally:
+        for device in (printer, arduino):
+            if device:
+                device.close()
+        telemetry.close()
+        data_controller.close()
+
+
+def cmd_calibrate(args, timer):
+    from src.coords import WELL_CENTERS_RAW, CoordSystem
+    timer.mark("imported coords")
+
+    coords = CoordSystem(mag_factor=4)
+    printer = _connect_printer(args, timer)
+    try:
+        printer.init_printer()
+        timer.mark("homed")
+        for i, (x_raw, y_raw) in enumerate(WELL_CENTERS_RAW):
+            x, y = coords.raw_to_cnc(x_raw, y_raw)
+            print(f"Well {i + 1}: CNC ({x:.2f}, {y:.2f})")
+            printer.move_to(x, y)
+            if args.dwell is None:
+                input("  Check alignment, then press Enter for the next well...")
+            else:
+                time.sleep(args.dwell)
+        return 0
+    finally:
+        printer.close()
+
+
+def cmd_test(args, timer):
+    if not args.gcode and not args.arduino:
+        print("Nothing to test: give --gcode and/or --arduino", file=sys.stderr)
+        return 2
+    ok = True
+    if args.arduino:
+        arduino = _connect_arduino(args, timer)
+        try:
+            passed = arduino.test_connection()
+            timer.mark("arduino answered")
+            print(f"Arduino on {args.arduino}: {'OK' if passed else 'no response'}")
+            ok &= bool(passed)
+        finally:
+            arduino.close()
+    if args.gcode:
+        printer = _connect_printer(args, timer)
+        try:
+            printer.wait_for_move_completion(timeout=10)
+            timer.mark("printer answered")
+            print(f"Printer on {args.gcode}: OK ({printer.last_position})")
+        except Exception as e:
+            print(f"Printer on {args.gcode}: {e}")
+            ok = False
+        finally:
+            printer.close()
+    return 0 if ok else 1
+
+
+# ───────────────────────── parser ───────────────────────────
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m src.cli",
+                                     description="Run CNC Optogenie works without the GUI")
+    parser.add_argument("--db", default="db/cnc_optogenie.db")
+    parser.add_argument("--timing", action="store_true",
+                        help="print import and start-up timing to stderr")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def add_ports(p, gcode=True, arduino=True, required=False):
+        if gcode:
+            p.add_argument("--gcode", required=required, help="G-code printer serial port")
+        if arduino:
+            p.add_argument("--arduino", required=required, help="Arduino serial port")
+        p.add_argument("--reset-delay", type=float, default=2.0,
+                       help="seconds to wait after opening a port for the board "
+                            "to reset (default 2; 0 if auto-reset is disabled)")
+
+    p = sub.add_parser("works", help="list works")
+    p.add_argument("--status", choices=["Scheduled", "In Progress", "Finished"])
+    p.set_defaults(func=cmd_works)
+
+    p = sub.add_parser("run", help="run one work on the nominal well centres")
+    p.add_argument("work_id", type=int)
+    add_ports(p, required=True)
+    p.add_argument("--dwell", type=float, default=0.25,
+                   help="settle dwell after each move, seconds (default 0.25)")
+    p.add_argument("--no-home", action="store_true",
+                   help="skip homing; the printer must already be at X0 Y0")
+    p.set_defaults(func=cmd_run)
+
+    p = sub.add_parser("calibrate", help="visit each well centre for an alignment check")
+    add_ports(p, arduino=False, required=True)
+    p.add_argument("--dwell", type=float,
+                   help="seconds at each well instead of waiting for Enter")
+    p.set_defaults(func=cmd_calibrate)
+
+    p = sub.add_parser("test", help="check that the devices answer")
+    add_ports(p)
+    p.set_defaults(func=cmd_test)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    timer = StartupTimer(args.timing)
+    try:
+        return args.func(args, timer)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        timer.report()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
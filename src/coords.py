@@ -1,7 +1,26 @@
 # coords.py  – drop this in src/
 from dataclasses import dataclass
+from functools import cached_property
 
-@dataclass
+FRAMES = ("raw", "disp", "cnc")
+
+# Nominal well centres of the 3-well holder, RAW mm
+WELL_CENTERS_RAW = [
+    (84.93, 36.40),
+    (27.03, 36.40),
+    (51.46, 91.20),
+]
+
+
+def _apply(m, x, y):
+    """Apply a 3×3 homography (nested tuples) to one point."""
+    u = m[0][0]*x + m[0][1]*y + m[0][2]
+    v = m[1][0]*x + m[1][1]*y + m[1][2]
+    w = m[2][0]*x + m[2][1]*y + m[2][2]
+    return (u/w, v/w)
+
+
+@dataclass(frozen=True)
 class CoordSystem:
     """
     Immutable helper that knows how to convert between:
@@ -9,9 +28,22 @@ class CoordSystem:
       • RAW   – real-world mm on your microscope slide
       • DISP  – pixels shown in PlateGrid
       • CNC   – mm in the printer's G-code coordinate frame
+
+    Every frame pair is a 3×3 homogeneous matrix (an affine transform or a
+    full homography), precomputed once per instance. The ``*_many`` methods
+    convert N×2 arrays in one NumPy operation.
     """
     mag_factor: float = 4.0           # px / mm in your current UI
+    # Optional 3×3 RAW → CNC matrix, e.g. from a plate calibration fit.
+    # None keeps the plain X/Y swap.
+    cnc_transform: tuple | None = None
+
+    def __post_init__(self):
+        if self.cnc_transform is not None:      # accept lists / arrays, store hashable
+            object.__setattr__(self, "cnc_transform", tuple(
+                tuple(float(v) for v in row) for row in self.cnc_transform))
 
+    # ─── single points ────────────────────────────────────────────
     def raw_to_disp(self, x_mm: float, y_mm: float) -> tuple[float, float]:
         """(mm,mm) → (px,px) for drawing.  Y axis is inverted for Matplotlib."""
         return (y_mm*self.mag_factor,        # X display = Yraw
@@ -22,8 +54,68 @@ class CoordSystem:
                 x_px/self.mag_factor)
 
     def raw_to_cnc(self, x_mm: float, y_mm: float) -> tuple[float, float]:
-        """Swap X/Y only – printer’s origin and axes match RAW size."""
+        """Swap X/Y – printer’s origin and axes match RAW size – unless
+        a calibrated ``cnc_transform`` is set."""
+        if self.cnc_transform is not None:
+            return _apply(self._matrices[("raw", "cnc")], x_mm, y_mm)
         return (y_mm, x_mm)
 
     def cnc_to_raw(self, x_mm: float, y_mm: float) -> tuple[float, float]:
+        if self.cnc_transform is not None:
+            return _apply(self._matrices[("cnc", "raw")], x_mm, y_mm)
         return (y_mm, x_mm)
+
+    # ─── matrices ─────────────────────────────────────────────────
+    @cached_property
+    def _matrices(self) -> dict:
+        """Pure-Python 3×3 matrices for every ordered pair of frames."""
+        import numpy as np
+
+        m = self.mag_factor
+        swap = np.array([[0, 1, 0], [1, 0, 0], [0, 0, 1]], dtype=float)
+        to_raw = {
+            "raw":  np.eye(3),
+            "disp": np.array([[0, 1/m, 0], [1/m, 0, 0], [0, 0, 1]]),
+            "cnc":  np.linalg.inv(np.array(self.cnc_transform, dtype=float))
+                    if self.cnc_transform is not None else swap,
+        }
+        from_raw = {frame: np.linalg.inv(mat) for frame, mat in to_raw.items()}
+        return {
+            (src, dst): tuple(tuple(float(v) for v in row)
+                              for row in from_raw[dst] @ to_raw[src])
+            for src in FRAMES for dst in FRAMES
+        }
+
+    @cached_property
+    def _arrays(self) -> dict:
+        import numpy as np
+        return {key: np.array(mat) for key, mat in self._matrices.items()}
+
+    def matrix(self, src: str, dst: str):
+        """3×3 NumPy matrix taking homogeneous ``src`` points to ``dst``."""
+        return self._arrays[(src, dst)].copy()
+
+    # ─── batches ──────────────────────────────────────────────────
+    def transform(self, points, src: str, dst: str):
+        """Convert an N×2 array-like of ``src`` points to an N×2 ``dst`` array."""
+        import numpy as np
+
+        pts = np.asarray(points, dtype=float).reshape(-1, 2)
+        m = self._arrays[(src, dst)]
+        out = pts @ m[:2, :2].T + m[:2, 2]
+        if m[2, 0] or m[2, 1] or m[2, 2] != 1:          # projective part
+            w = pts @ m[2, :2] + m[2, 2]
+            out /= w[:, None]
+        return out
+
+    def raw_to_disp_many(self, points):
+        return self.transform(points, "raw", "disp")
+
+    def disp_to_raw_many(self, points):
+        return self.transform(points, "disp", "raw")
+
+    def raw_to_cnc_many(self, points):
+        return self.transform(points, "raw", "cnc")
+
+    def cnc_to_raw_many(self, points):
+        return self.transform(points, "cnc", "raw")
@@ -1,130 +1,511 @@
 # src/data_controller.py
 
+import os
 import sqlite3
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+from src.log_bus import get_logger
+
+DEFAULT_DB_PATH = "db/cnc_optogenie.db"
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), "..", "db", "schema.sql")
+# Prepared statements kept per connection (sqlite3 default: 128)
+STATEMENT_CACHE_SIZE = 256
+# Recipe parameters search_recipes() can filter by range
+RECIPE_FILTER_COLUMNS = ("intensity", "frequency", "pulse_duration", "spot_size")
+
+log = get_logger("db")
+
+class ReadCache:
+    """
+    Thread-safe LRU of query results with hit/miss counters.
+
+    ``generation`` moves on every invalidation; ``put`` drops a result whose
+    query started before one, so a read racing a write cannot cache stale rows.
+    """
+
+    MISSING = object()
+
+    def __init__(self, maxsize=512):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.generation = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key, self.MISSING)
+            if value is self.MISSING:
+                self.misses += 1
+                return self.MISSING
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value, generation=None):
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *keys, kind=None):
+        """Drop ``keys``, and every entry whose key starts with ``kind``."""
+        with self._lock:
+            self.generation += 1
+            for key in keys:
+                self._entries.pop(key, None)
+            if kind is not None:
+                for key in [k for k in self._entries if k[0] == kind]:
+                    del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+class _ThreadReader:
+    """Holds one thread's reader connection; it dies with the thread's locals."""
+    __slots__ = ("connection", "__weakref__")
+
+    def __init__(self, connection):
+        self.connection = connection
+
+
+def _close_reader(connection, readers, lock):
+    with lock:
+        readers.discard(connection)
+    connection.close()
+
 
 class DataController:
-    def __init__(self, db_path="db/cnc_optogenie.db"):
+    """
+    SQLite access for recipes and works.
+
+    Use ``DataController.shared()`` for the process-wide instance. All writes
+    go through one connection guarded by a lock; reads use one connection per
+    thread, so worker threads can query and update works without opening
+    connections of their own. A thread's reader is closed when the thread
+    exits. ``busy_timeout`` makes SQLite wait for a lock
+    held by another process (e.g. the scheduler) instead of failing with
+    "database is locked".
+
+    File databases use WAL journaling: readers never block the writer, and
+    a commit appends to the log instead of rewriting the rollback journal.
+    Every query is a fixed SQL string with ``?`` parameters, so sqlite3's
+    per-connection statement cache reuses its prepared statement.
+
+    Recipe and work reads are served from an in-process LRU cache. Writes
+    through this controller invalidate the entries they touch; a change of
+    ``PRAGMA data_version`` (a commit by another process, such as the
+    scheduler) clears it; that is checked at most every ``version_check_s``
+    and never waits for a write in progress.
+    """
+
+    _shared = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, db_path=DEFAULT_DB_PATH, busy_timeout=5.0, journal_mode="WAL",
+                 cache_size=512, version_check_s=0.25):
         self.db_path = db_path
-        self.connection = None
+        self.busy_timeout = busy_timeout
+        self.journal_mode = journal_mode
+        self.cache = ReadCache(cache_size)
+        self._data_version = None
+        self.version_check_s = version_check_s
+        self._next_version_check = 0.0
+        self.connection = None           # the writer
+        self._write_lock = threading.RLock()
+        self._local = threading.local()  # per-thread _ThreadReader
+        self._readers = set()            # open reader connections
+        self._initialized = False
         self.connect()
 
+    @classmethod
+    def shared(cls, db_path=DEFAULT_DB_PATH):
+        """The process-wide DataController for ``db_path``, initialised once."""
+        with cls._shared_lock:
+            controller = cls._shared.get(db_path)
+            if controller is None or controller.connection is None:
+                controller = cls._shared[db_path] = cls(db_path)
+                controller.initialize_db()
+            return controller
+
+    def _open(self):
+        connection = sqlite3.connect(self.db_path, timeout=self.busy_timeout,
+                                     check_same_thread=False,
+                                     cached_statements=STATEMENT_CACHE_SIZE)
+        connection.execute("PRAGMA foreign_keys = ON;")
+        connection.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout * 1000)};")
+        if self.db_path != ":memory:" and self.journal_mode:
+            connection.execute(f"PRAGMA journal_mode = {self.journal_mode};")
+            if self.journal_mode.upper() == "WAL":
+                # Durable at checkpoints; a crash can lose only the last commits
+                connection.execute("PRAGMA synchronous = NORMAL;")
+        return connection
+
     def connect(self):
-        self.connection = sqlite3.connect(self.db_path)
-        self.connection.execute("PRAGMA foreign_keys = ON;")
+        self.connection = self._open()
+
+    @contextmanager
+    def _writing(self):
+        """Cursor on the writer connection; commits on success, rolls back on error."""
+        with self._write_lock:
+            cursor = self.connection.cursor()
+            try:
+                yield cursor
+                self.connection.commit()
+            except Exception:
+                self.connection.rollback()
+                raise
+
+    @contextmanager
+    def _reading(self):
+        """Cursor on this thread's reader connection."""
+        if self.db_path == ":memory:":
+            # Every connection to :memory: is a separate database
+            with self._write_lock:
+                yield self.connection.cursor()
+            return
+        reader = getattr(self._local, "reader", None)
+        if reader is None:
+            connection = self._open()
+            with self._write_lock:
+                self._readers.add(connection)
+            reader = self._local.reader = _ThreadReader(connection)
+            # Thread-local values are released when their thread ends
+            weakref.finalize(reader, _close_reader, connection, self._readers, self._write_lock)
+        yield reader.connection.cursor()
+
+    def _cached(self, key, query):
+        """``query()`` through the read cache."""
+        self._check_external_writes()
+        value = self.cache.get(key)
+        if value is ReadCache.MISSING:
+            generation = self.cache.generation
+            value = query()
+            # A missing row is not cached: inserts only invalidate the lists
+            if value is not None:
+                self.cache.put(key, value, generation)
+        return value
+
+    def _check_external_writes(self):
+        # data_version changes only for commits made by other connections;
+        # this controller's own writes invalidate precisely instead. The
+        # pragma runs on the writer, so skip it while a write (e.g. a
+        # telemetry flush) holds the lock rather than queue a cache hit
+        now = time.monotonic()
+        if now < self._next_version_check:
+            return
+        if not self._write_lock.acquire(blocking=False):
+            return
+        try:
+            version = self.connection.execute("PRAGMA data_version").fetchone()[0]
+            if version != self._data_version:
+                if self._data_version is not None:
+                    self.cache.clear()
+                self._data_version = version
+            self._next_version_check = now + self.version_check_s
+        finally:
+            self._write_lock.release()
+
+    def cache_stats(self):
+        return {"hits": self.cache.hits, "misses": self.cache.misses, "size": len(self.cache)}
 
     def initialize_db(self):
-        with open("db/schema.sql", "r") as schema_file:
+        if self._initialized:
+            return
+        with open(SCHEMA_PATH, "r") as schema_file:
             schema = schema_file.read()
+        with self._write_lock:
+            # Columns first: the schema's indexes may refer to new ones
+            self._migrate()
             self.connection.executescript(schema)
-        self.connection.commit()
+            self.connection.commit()
+        self._initialized = True
+
+    def _migrate(self):
+        """Bring databases created by older versions up to the current schema."""
+        columns = [row[1] for row in self.connection.execute("PRAGMA table_info(works)")]
+        if columns and "priority" not in columns:
+            self.connection.execute(
+                "ALTER TABLE works ADD COLUMN priority INTEGER NOT NULL DEFAULT 0")
 
     # Recipe Methods
     def add_recipe(self, name, intensity, pulse_duration, frequency, spot_size):
-        cursor = self.connection.cursor()
-        cursor.execute(
-            """
-            INSERT INTO recipes (name, intensity, pulse_duration, frequency, spot_size)
-            VALUES (?, ?, ?, ?, ?)
-            """,
-            (name, intensity, pulse_duration, frequency, spot_size)
-        )
-        self.connection.commit()
-        return cursor.lastrowid
+        with self._writing() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO recipes (name, intensity, pulse_duration, frequency, spot_size)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (name, intensity, pulse_duration, frequency, spot_size)
+            )
+            recipe_id = cursor.lastrowid
+        self.cache.invalidate(kind="recipes")
+        return recipe_id
 
     def get_recipes(self):
-        cursor = self.connection.cursor()
-        cursor.execute("SELECT * FROM recipes ORDER BY name")
-        return cursor.fetchall()
+        return list(self._cached(("recipes",), self._query_recipes))
+
+    def _query_recipes(self):
+        with self._reading() as cursor:
+            cursor.execute("SELECT * FROM recipes ORDER BY name")
+            return cursor.fetchall()
+
+    def search_recipes(self, prefix="", ranges=None, after=None, limit=100):
+        """
+        Recipes whose name starts with ``prefix`` (case-insensitive) and whose
+        parameters lie in ``ranges``, ``{column: (low, high)}`` with either
+        bound None, ordered by name. ``after`` is the ``(name, id)`` of the
+        last row of the previous page.
+        """
+        where, params = self._recipe_filter(prefix, ranges)
+        if after is not None:
+            where.append("(name COLLATE NOCASE, id) > (?, ?)")
+            params.extend(after)
+        sql = ("SELECT * FROM recipes"
+               + (" WHERE " + " AND ".join(where) if where else "")
+               + " ORDER BY name COLLATE NOCASE, id LIMIT ?")
+        params.append(limit)
+
+        def query():
+            with self._reading() as cursor:
+                cursor.execute(sql, params)
+                return cursor.fetchall()
+
+        return list(self._cached(("recipes", "search", sql, tuple(params)), query))
+
+    def count_recipes(self, prefix="", ranges=None):
+        """Number of recipes ``search_recipes`` would page through."""
+        where, params = self._recipe_filter(prefix, ranges)
+        sql = "SELECT COUNT(*) FROM recipes" + (" WHERE " + " AND ".join(where) if where else "")
+
+        def query():
+            with self._reading() as cursor:
+                cursor.execute(sql, params)
+                return cursor.fetchone()[0]
+
+        return self._cached(("recipes", "count", sql, tuple(params)), query)
+
+    def _recipe_filter(self, prefix, ranges):
+        # Name prefix as a range over the NOCASE index rather than LIKE, so
+        # it uses idx_recipes_name whatever case_sensitive_like is set to
+        where, params = [], []
+        if prefix:
+            where.append("name >= ? COLLATE NOCASE AND name < ? COLLATE NOCASE")
+            params.extend((prefix, prefix + "\U0010ffff"))
+        for column, (low, high) in sorted((ranges or {}).items()):
+            if column not in RECIPE_FILTER_COLUMNS:
+                raise ValueError(f"Cannot filter recipes by {column!r}")
+            if low is not None:
+                where.append(f"{column} >= ?")
+                params.append(low)
+            if high is not None:
+                where.append(f"{column} <= ?")
+                params.append(high)
+        return where, params
 
     def delete_recipe(self, recipe_id):
-        cursor = self.connection.cursor()
-        # First check if the recipe is used in any works
-        cursor.execute("SELECT COUNT(*) FROM works WHERE recipe_id = ?", (recipe_id,))
-        if cursor.fetchone()[0] > 0:
-            raise Exception("Cannot delete recipe: it is used in one or more works")
-        cursor.execute("DELETE FROM recipes WHERE id = ?", (recipe_id,))
-        self.connection.commit()
+        with self._writing() as cursor:
+            # First check if the recipe is used in any works
+            cursor.execute("SELECT COUNT(*) FROM works WHERE recipe_id = ?", (recipe_id,))
+            if cursor.fetchone()[0] > 0:
+                raise Exception("Cannot delete recipe: it is used in one or more works")
+            cursor.execute("DELETE FROM recipes WHERE id = ?", (recipe_id,))
+        self.cache.invalidate(("recipe", recipe_id), kind="recipes")
 
     def get_recipe_by_id(self, recipe_id):
         """Get a recipe by its ID."""
         try:
-            print(f"Fetching recipe with ID: {recipe_id}")
-            cursor = self.connection.cursor()
+            return self._cached(("recipe", recipe_id),
+                                lambda: self._query_recipe(recipe_id))
+        except Exception as e:
+            log.exception(f"Error fetching recipe: {e}")
+            return None
+
+    def _query_recipe(self, recipe_id):
+        with self._reading() as cursor:
             cursor.execute("""
-                SELECT id, name, intensity, pulse_duration, frequency, spot_size 
-                FROM recipes 
+                SELECT id, name, intensity, pulse_duration, frequency, spot_size
+                FROM recipes
                 WHERE id = ?
             """, (recipe_id,))
             recipe = cursor.fetchone()
-            print(f"Found recipe: {recipe}")
-            if recipe:
-                return recipe
-            print(f"No recipe found with ID: {recipe_id}")
-            return None
-        except Exception as e:
-            print(f"Error fetching recipe: {str(e)}")
-            return None
+        if not recipe:
+            log.debug(f"No recipe found with ID: {recipe_id}")
+        return recipe
 
     # Work Methods
-    def add_work(self, name, recipe_id, duration, status):
-        cursor = self.connection.cursor()
+    def add_work(self, name, recipe_id, duration, status, priority=0):
         # Verify recipe exists
         if not self.get_recipe_by_id(recipe_id):
             raise Exception("Recipe not found")
-        cursor.execute(
-            """
-            INSERT INTO works (name, recipe_id, duration, status)
-            VALUES (?, ?, ?, ?)
-            """,
-            (name, recipe_id, duration, status)
-        )
-        self.connection.commit()
-        return cursor.lastrowid
+        with self._writing() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO works (name, recipe_id, duration, status, priority)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (name, recipe_id, duration, status, priority)
+            )
+            work_id = cursor.lastrowid
+        self.cache.invalidate(kind="works")
+        return work_id
 
     def get_work_by_id(self, work_id):
         """Get a work by its ID."""
-        cursor = self.connection.cursor()
-        cursor.execute("""
-            SELECT w.*, r.name as recipe_name 
-            FROM works w 
-            LEFT JOIN recipes r ON w.recipe_id = r.id 
-            WHERE w.id = ?
-        """, (work_id,))
-        return cursor.fetchone()
+        return self._cached(("work", work_id), lambda: self._query_work(work_id))
 
-    def get_works(self, status=None):
-        cursor = self.connection.cursor()
-        if status:
-            cursor.execute("""
-                SELECT w.*, r.name as recipe_name 
-                FROM works w 
-                LEFT JOIN recipes r ON w.recipe_id = r.id 
-                WHERE w.status = ?
-                ORDER BY w.id DESC
-            """, (status,))
-        else:
+    def _query_work(self, work_id):
+        with self._reading() as cursor:
             cursor.execute("""
-                SELECT w.*, r.name as recipe_name 
-                FROM works w 
-                LEFT JOIN recipes r ON w.recipe_id = r.id 
-                ORDER BY w.id DESC
-            """)
-        return cursor.fetchall()
+                SELECT w.*, r.name as recipe_name
+                FROM works w
+                LEFT JOIN recipes r ON w.recipe_id = r.id
+                WHERE w.id = ?
+            """, (work_id,))
+            return cursor.fetchone()
+
+    def get_works(self, status=None):
+        return list(self._cached(("works", status), lambda: self._query_works(status)))
+
+    def _query_works(self, status):
+        with self._reading() as cursor:
+            if status:
+                cursor.execute("""
+                    SELECT w.*, r.name as recipe_name
+                    FROM works w
+                    LEFT JOIN recipes r ON w.recipe_id = r.id
+                    WHERE w.status = ?
+                    ORDER BY w.id DESC
+                """, (status,))
+            else:
+                cursor.execute("""
+                    SELECT w.*, r.name as recipe_name
+                    FROM works w
+                    LEFT JOIN recipes r ON w.recipe_id = r.id
+                    ORDER BY w.id DESC
+                """)
+            return cursor.fetchall()
+
+    def get_works_page(self, before_id=None, limit=100):
+        """
+        Up to ``limit`` works with an id below ``before_id``, newest first.
+
+        Keyset paging on the primary key: each page is an index range scan,
+        however deep into the history it starts.
+        """
+        return list(self._cached(("works", "page", before_id, limit),
+                                 lambda: self._query_works_page(before_id, limit)))
+
+    def _query_works_page(self, before_id, limit):
+        with self._reading() as cursor:
+            if before_id is None:
+                cursor.execute("""
+                    SELECT w.*, r.name as recipe_name
+                    FROM works w
+                    LEFT JOIN recipes r ON w.recipe_id = r.id
+                    ORDER BY w.id DESC
+                    LIMIT ?
+                """, (limit,))
+            else:
+                cursor.execute("""
+                    SELECT w.*, r.name as recipe_name
+                    FROM works w
+                    LEFT JOIN recipes r ON w.recipe_id = r.id
+                    WHERE w.id < ?
+                    ORDER BY w.id DESC
+                    LIMIT ?
+                """, (before_id, limit))
+            return cursor.fetchall()
 
     def get_scheduled_works(self):
         """Fetch works with a 'Scheduled' status."""
         return self.get_works(status='Scheduled')
 
+    def claim_next_work(self, exclude=()):
+        """
+        Mark the next Scheduled work In Progress and return it, or None.
+
+        Highest priority first, then oldest. The status check in the UPDATE
+        keeps two processes (GUI and scheduler) from claiming the same work.
+        """
+        with self._writing() as cursor:
+            cursor.execute("""
+                SELECT id FROM works
+                WHERE status = 'Scheduled'
+                ORDER BY priority DESC, id ASC
+            """)
+            claimed = None
+            for (work_id,) in cursor.fetchall():
+                if work_id in exclude:
+                    continue
+                cursor.execute(
+                    "UPDATE works SET status = 'In Progress' WHERE id = ? AND status = 'Scheduled'",
+                    (work_id,))
+                if cursor.rowcount:
+                    claimed = work_id
+                    break
+        if claimed is None:
+            return None
+        self._work_changed(claimed)
+        return self.get_work_by_id(claimed)
+
     def delete_work(self, work_id):
-        cursor = self.connection.cursor()
-        cursor.execute("DELETE FROM works WHERE id = ?", (work_id,))
-        self.connection.commit()
+        with self._writing() as cursor:
+            cursor.execute("DELETE FROM works WHERE id = ?", (work_id,))
+        self._work_changed(work_id)
 
     def update_work_status(self, work_id, new_status):
-        cursor = self.connection.cursor()
-        cursor.execute("UPDATE works SET status = ? WHERE id = ?", (new_status, work_id))
-        self.connection.commit()
+        with self._writing() as cursor:
+            cursor.execute("UPDATE works SET status = ? WHERE id = ?", (new_status, work_id))
+        self._work_changed(work_id)
+
+    def _work_changed(self, work_id):
+        self.cache.invalidate(("work", work_id), kind="works")
+
+    # Telemetry Methods
+    def add_run_events(self, rows):
+        """
+        Insert many ``(work_id, rig, point_index, event, timestamp, value,
+        message)`` rows in a single transaction.
+        """
+        with self._writing() as cursor:
+            cursor.executemany(
+                """
+                INSERT INTO run_events (work_id, rig, point_index, event, timestamp, value, message)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                rows
+            )
+
+    def get_run_events(self, work_id):
+        """Telemetry of one work, oldest first."""
+        with self._reading() as cursor:
+            cursor.execute("""
+                SELECT id, work_id, rig, point_index, event, timestamp, value, message
+                FROM run_events
+                WHERE work_id = ?
+                ORDER BY timestamp, id
+            """, (work_id,))
+            return cursor.fetchall()
 
     def close(self):
-        if self.connection:
-            self.connection.close()
+        with self._write_lock:
+            for reader in list(self._readers):
+                reader.close()
+            self._readers.clear()
+            if self.connection:
+                self.connection.close()
+                self.connection = None
+        self._local = threading.local()
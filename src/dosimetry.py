@@ -0,0 +1,105 @@
+# src/dosimetry.py
+
+"""
+Temporal dosimetry: the light a recipe actually delivers to each well.
+
+The numbers follow the integer math between the database and the laser:
+
+  host      ArduinoController.prepare_recipe sends int(round()) of the
+            intensity, work duration, frequency and pulse duration, and
+            refuses a pulse longer than the period;
+  firmware  laser_control.ino takes periodMs = 1000 / f (integer division),
+            clamps onTimeMs to it, and runs the train in segments of at
+            most 60 s with segmentMs / periodMs whole periods each, so a
+            partial last period is never pulsed.
+
+Energy assumes ``intensity`` is the irradiance in mW/mm² (as the laser
+parameter plots label it) and ``spot_size`` the spot radius in mm (as the
+spot plots draw it). Everything is numpy and broadcasts, so the whole
+recipe library is evaluated in one call.
+"""
+
+from dataclasses import dataclass, fields
+import numpy as np
+
+MAX_SEGMENT_MS = 60000   # laser_control.ino MAX_RUN_MS
+
+
+@dataclass(frozen=True)
+class Dose:
+    """Per-well dose of one or many recipes; every field is an array."""
+    valid:          np.ndarray   # False where prepare_recipe would refuse it
+    period_ms:      np.ndarray
+    on_ms:          np.ndarray   # per pulse, after the firmware's clamp
+    duty_cycle:     np.ndarray   # 0-1
+    pulses:         np.ndarray
+    on_time_s:      np.ndarray
+    train_s:        np.ndarray   # time spent pulsing (whole periods only)
+    fluence_mj_mm2: np.ndarray
+    energy_mj:      np.ndarray
+
+    def __getitem__(self, index):
+        return Dose(**{f.name: getattr(self, f.name)[index] for f in fields(self)})
+
+
+def compute_dose(intensity, pulse_duration_ms, frequency_hz, spot_size_mm, duration_s):
+    """Dose per well for recipe parameters and a work duration (arrays or scalars)."""
+    # np.rint rounds half to even, like Python's round()
+    intensity = np.rint(np.asarray(intensity, dtype=float))
+    pulse = np.rint(np.asarray(pulse_duration_ms, dtype=float))
+    freq = np.rint(np.asarray(frequency_hz, dtype=float))
+    seconds = np.rint(np.asarray(duration_s, dtype=float))
+    radius = np.asarray(spot_size_mm, dtype=float)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        valid = ((0 <= intensity) & (intensity <= 255) & (seconds > 0)
+                 & (1 <= freq) & (freq <= 1000)
+                 & (1 <= pulse) & (pulse <= 60000) & (pulse <= 1000 / freq))
+
+    period = 1000 // np.clip(freq, 1, 1000).astype(np.int64)
+    on = np.minimum(np.clip(pulse, 0, None).astype(np.int64), period)
+    requested_ms = np.clip(seconds, 0, None).astype(np.int64) * 1000
+    pulses = ((requested_ms // MAX_SEGMENT_MS) * (MAX_SEGMENT_MS // period)
+              + (requested_ms % MAX_SEGMENT_MS) // period)
+    pulses = np.where(valid, pulses, 0)
+
+    on_time_s = pulses * on / 1000.0
+    fluence = intensity * on_time_s                      # mW/mm² × s = mJ/mm²
+    return Dose(
+        valid=valid,
+        period_ms=period,
+        on_ms=on,
+        duty_cycle=np.where(valid, on / period, 0.0),
+        pulses=pulses,
+        on_time_s=on_time_s,
+        train_s=pulses * period / 1000.0,
+        fluence_mj_mm2=fluence,
+        energy_mj=fluence * np.pi * radius ** 2,
+    )
+
+
+def recipe_doses(recipes, duration_s):
+    """
+    Dose of every ``recipes`` row (as returned by DataController.get_recipes)
+    for a work of ``duration_s`` seconds, in one batch; index it like the rows.
+    """
+    columns = np.array([recipe[2:6] for recipe in recipes], dtype=float).reshape(-1, 4)
+    intensity, pulse_duration, frequency, spot_size = columns.T
+    return compute_dose(intensity, pulse_duration, frequency, spot_size, duration_s)
+
+
+def work_dose(work, recipe):
+    """Dose per well of one ``works`` row run with its ``recipes`` row."""
+    return compute_dose(recipe[2], recipe[3], recipe[4], recipe[5], work[3])
+
+
+def describe(dose, n_wells=None):
+    """One-line summary of a single recipe's dose."""
+    if not dose.valid:
+        return "Recipe would be rejected by the laser controller (check frequency and pulse duration)"
+    text = (f"Duty cycle {dose.duty_cycle * 100:.1f} %, {int(dose.pulses)} pulses, "
+            f"{float(dose.on_time_s):.2f} s on, {float(dose.fluence_mj_mm2):.1f} mJ/mm², "
+            f"{float(dose.energy_mj):.1f} mJ per well")
+    if n_wells:
+        text += f" ({float(dose.energy_mj) * n_wells:.1f} mJ for {n_wells} wells)"
+    return text
@@ -2,14 +2,37 @@
 
 import serial
 import time
+from collections import deque
 from serial import SerialException
+from src.kinematics import MotionLimits
+from src.log_bus import get_logger
+
+log = get_logger("printer")
 
 class GCodePrinterController:
-    def __init__(self, port, baud_rate=115200, speed=700, acceleration=150):
+    def __init__(self, port, baud_rate=115200, speed=700, acceleration=150,
+                 streaming=True, rx_buffer_size=128, max_outstanding=4,
+                 serial_factory=None, reset_delay=2):
         self.port = port
         self.baud_rate = baud_rate
         self.speed = speed
         self.acceleration = acceleration
+        # Machine limits written by init_printer (M203 mm/s, M201 mm/s²)
+        self.max_feedrate = {"X": 100, "Y": 100, "Z": 30}
+        self.max_acceleration = {"X": 150, "Y": 150, "Z": 100}
+        self.position = None             # last commanded (x, y); None until homed
+        # Flow control: keep at most ``max_outstanding`` lines and
+        # ``rx_buffer_size`` bytes un-acknowledged in the firmware's serial
+        # receive buffer (Marlin defaults: BUFSIZE 4, RX_BUFFER_SIZE 128).
+        self.streaming = streaming
+        self.rx_buffer_size = rx_buffer_size
+        self.max_outstanding = max_outstanding
+        self._pending = deque()          # byte length of each un-acked line
+        self._pending_bytes = 0
+        self.last_position = None        # last M114 report
+        # serial.Serial by default; src.simulators.MarlinSimulator for tests
+        self.serial_factory = serial_factory
+        self.reset_delay = reset_delay
         self.ser = None
         self.connect()
 
@@ -18,36 +41,119 @@ class GCodePrinterController:
         try:
             if self.ser and self.ser.is_open:
                 self.ser.close()
-            self.ser = serial.Serial(self.port, self.baud_rate, timeout=1)
-            time.sleep(2)  # Wait for serial connection
+            factory = self.serial_factory or serial.Serial
+            self.ser = factory(self.port, self.baud_rate, timeout=1)
+            time.sleep(self.reset_delay)  # Wait for serial connection
             # Clear any pending data
             self.ser.reset_input_buffer()
             self.ser.reset_output_buffer()
+            self._pending.clear()
+            self._pending_bytes = 0
             return True
         except SerialException as e:
-            print(f"Error connecting to G-code printer: {e}")
+            log.error(f"Error connecting to G-code printer: {e}")
             self.ser = None
             return False
 
     def send_gcode(self, command):
-        """Send a G-code command to the printer."""
+        """Send a G-code command to the printer.
+
+        In streaming mode the line is queued as soon as the firmware has room
+        for it; otherwise falls back to a fixed delay after each write.
+        """
+        if not self.ser or not self.ser.is_open:
+            raise Exception("G-code printer not connected")
+
+        try:
+            if self.streaming:
+                self._stream_line(command)
+            else:
+                command += '\n'
+                self.ser.write(command.encode('ascii'))
+                time.sleep(0.1)
+        except SerialException as e:
+            log.error(f"Serial error in send_gcode: {e}")
+            self.reconnect()
+            raise Exception(f"Serial communication error: {e}")
+
+    def send_program(self, lines, timeout=30):
+        """Stream a list of G-code lines and wait until every one is acknowledged.
+
+        Lines are written as fast as the firmware's receive buffer allows;
+        blank lines and ``;`` comments are skipped. Returns the number of
+        lines sent.
+        """
         if not self.ser or not self.ser.is_open:
             raise Exception("G-code printer not connected")
 
+        sent = 0
         try:
-            command += '\n'
-            self.ser.write(command.encode('ascii'))
-            time.sleep(0.1)
+            for line in lines:
+                line = line.split(';', 1)[0].strip()
+                if not line:
+                    continue
+                self._stream_line(line, timeout)
+                sent += 1
+            self.drain(timeout)
+            return sent
         except SerialException as e:
-            print(f"Serial error in send_gcode: {e}")
+            log.error(f"Serial error in send_program: {e}")
             self.reconnect()
             raise Exception(f"Serial communication error: {e}")
 
+    def drain(self, timeout=30):
+        """Block until every line already sent has been acknowledged."""
+        deadline = time.time() + timeout
+        while self._pending:
+            self._read_ack(deadline)
+
+    def _stream_line(self, command, timeout=30):
+        """Write one line once the firmware has room for it in its buffer."""
+        data = (command.strip() + '\n').encode('ascii')
+        deadline = time.time() + timeout
+        while self._pending and (
+                len(self._pending) >= self.max_outstanding or
+                self._pending_bytes + len(data) > self.rx_buffer_size):
+            self._read_ack(deadline)
+        self.ser.write(data)
+        self._pending.append(len(data))
+        self._pending_bytes += len(data)
+
+    def _read_ack(self, deadline):
+        """Read replies until one ``ok`` frees the oldest outstanding line."""
+        while time.time() < deadline:
+            response = self.ser.readline().decode('ascii', errors='replace').strip()
+            if not response:
+                continue
+            if response.startswith("ok"):
+                if self._pending:
+                    self._pending_bytes -= self._pending.popleft()
+                return response
+            if response.startswith("X:"):
+                self.last_position = response
+            elif response.startswith(("Error", "!!")):
+                if response.startswith("!!") or "halted" in response or "kill" in response:
+                    # Halted: nothing in flight will be acknowledged
+                    self._pending.clear()
+                    self._pending_bytes = 0
+                # Otherwise Marlin still answers the line (Resend:/ok), and
+                # that ok releases it
+                raise Exception(f"Printer error: {response}")
+            log.debug(f"Printer response: {response}")
+        raise Exception("Timed out waiting for printer acknowledgement")
+
     def wait_for_move_completion(self, timeout=30):
         """Wait for the printer to finish the move with timeout."""
         if not self.ser or not self.ser.is_open:
             raise Exception("G-code printer not connected")
 
+        if self.streaming:
+            # M400 is only acknowledged once the planner is empty; M114 then
+            # reports the position the move ended at.
+            self.send_program(["M400", "M114"], timeout=timeout)
+            log.debug(f"Current position: {self.last_position}")
+            return True
+
         try:
             # Clear any pending data
             while self.ser.in_waiting > 0:
@@ -55,61 +161,153 @@ class GCodePrinterController:
 
             # Send M400 to wait for moves to complete
             self.send_gcode("M400")
-            
+
             # Wait for "ok" response
             start_time = time.time()
             while (time.time() - start_time) < timeout:
                 if self.ser.in_waiting > 0:
                     response = self.ser.readline().decode('ascii').strip()
-                    print(f"Printer response: {response}")
+                    log.debug(f"Printer response: {response}")
                     if response == "ok":
                         # Get current position
                         self.send_gcode("M114")
                         position = self.ser.readline().decode('ascii').strip()
-                        print(f"Current position: {position}")
+                        log.debug(f"Current position: {position}")
+                        if position.startswith("X:"):
+                            self.last_position = position
                         return True
                 time.sleep(0.1)
-            
+
             raise Exception("Move completion timeout")
         except SerialException as e:
-            print(f"Serial error in wait_for_move_completion: {e}")
+            log.error(f"Serial error in wait_for_move_completion: {e}")
             self.reconnect()
             raise Exception(f"Serial communication error: {e}")
 
+    def reported_position(self):
+        """(x, y) from the last M114 report, or None if there is none."""
+        if not self.last_position:
+            return None
+        # "X:10.00 Y:20.00 Z:0.00 E:0.00 Count X:... Y:..."; the first pair
+        # is the planner position, which is where the move ended after M400.
+        axes = {}
+        for token in self.last_position.split():
+            if token == "Count":
+                break
+            key, sep, value = token.partition(":")
+            if sep:
+                try:
+                    axes[key] = float(value)
+                except ValueError:
+                    pass
+        if "X" not in axes or "Y" not in axes:
+            return None
+        return (axes["X"], axes["Y"])
+
     def init_printer(self):
         """Initialize the printer with basic settings."""
         if not self.ser or not self.ser.is_open:
             raise Exception("G-code printer not connected")
 
+        acc, feed = self.max_acceleration, self.max_feedrate
+        program = [
+            f"M201 X{acc['X']} Y{acc['Y']} Z{acc['Z']}",     # Set max acceleration
+            f"M203 X{feed['X']} Y{feed['Y']} Z{feed['Z']}",  # Set max feedrate
+            "G28",                  # Home all axes
+            "G53",                  # Move machine coordinates
+            "G21",                  # Set units to mm
+            "M104 S18",             # Set temperature
+            "G90",                  # Set absolute positioning
+            f"M204 P{self.acceleration}",
+        ]
         try:
-            self.send_gcode("M201 X150 Y150 Z100")  # Set max acceleration
-            self.send_gcode("M203 X100 Y100 Z30")   # Set max feedrate
-            self.send_gcode("G28")                  # Home all axes
-            self.send_gcode("G53")                  # Move machine coordinates
-            self.send_gcode("G21")                  # Set units to mm
-            self.send_gcode("M104 S18")             # Set temperature
-            self.send_gcode("G90")                  # Set absolute positioning
-            self.send_gcode(f"M204 P{self.acceleration}")
+            if self.streaming:
+                # G28 is only acknowledged once homing finishes
+                self.send_program(program, timeout=120)
+            else:
+                for command in program:
+                    self.send_gcode(command)
+            self.position = (0.0, 0.0)
             return True
         except Exception as e:
-            print(f"Error initializing printer: {e}")
+            log.error(f"Error initializing printer: {e}")
             raise
 
-    def move_to(self, x, y):
-        """Move to specified coordinates."""
+    def move_to(self, x, y, wait=True):
+        """Move to specified coordinates.
+
+        With ``wait=False`` the move is only queued; call
+        ``wait_for_move_completion`` before relying on the position.
+        """
         if not self.ser or not self.ser.is_open:
             raise Exception("G-code printer not connected")
 
         try:
             self.send_gcode(f"G1 X{x} Y{y} F{self.speed}")
-            self.wait_for_move_completion()
+            self.position = (x, y)
+            if wait:
+                self.wait_for_move_completion()
         except Exception as e:
-            print(f"Error moving to position ({x}, {y}): {e}")
+            log.error(f"Error moving to position ({x}, {y}): {e}")
             raise
 
+    def motion_limits(self):
+        """Feedrate and acceleration limits this controller programs."""
+        return MotionLimits(feedrate=self.speed,
+                            acceleration=self.acceleration,
+                            max_feedrate=dict(self.max_feedrate),
+                            max_acceleration=dict(self.max_acceleration))
+
+    def estimate_move_time(self, x, y, start=None):
+        """Predicted seconds for ``move_to(x, y)`` from ``start`` (default: current position)."""
+        start = start or self.position or (0.0, 0.0)
+        return self.motion_limits().move_time(start, (x, y))
+
+    def move_path(self, points, dwell_ms=0, sync_at=None, on_sync=None, timeout=30):
+        """Stream a list of (x, y) moves in one burst.
+
+        ``dwell_ms`` adds a G4 dwell after each point (a number, or one value
+        per point). Motion is only synchronised (M400) after the indices in
+        ``sync_at`` – by default just the last point – where
+        ``on_sync(index, point)`` is called with the gantry at rest.
+        """
+        if not self.ser or not self.ser.is_open:
+            raise Exception("G-code printer not connected")
+
+        points = list(points)
+        if not points:
+            return 0
+        dwells = dwell_ms if isinstance(dwell_ms, (list, tuple)) else [dwell_ms] * len(points)
+        if len(dwells) != len(points):
+            raise ValueError(f"dwell_ms has {len(dwells)} value(s) for {len(points)} point(s)")
+        sync_at = {len(points) - 1} if sync_at is None else set(sync_at)
+
+        try:
+            for i, (x, y) in enumerate(points):
+                self._stream_line(f"G1 X{x} Y{y} F{self.speed}", timeout)
+                self.position = (x, y)
+                if dwells[i]:
+                    self._stream_line(f"G4 P{int(round(dwells[i]))}", timeout)
+                if i in sync_at:
+                    self._stream_line("M400", timeout)
+                    self.drain(timeout)
+                    if on_sync:
+                        on_sync(i, (x, y))
+            self.drain(timeout)
+            return len(points)
+        except SerialException as e:
+            log.error(f"Serial error in move_path: {e}")
+            self.reconnect()
+            raise Exception(f"Serial communication error: {e}")
+
+    def emergency_stop(self):
+        """Write M112 immediately, bypassing flow control; safe from any thread."""
+        if self.ser and self.ser.is_open:
+            self.ser.write(b"M112\n")
+
     def reconnect(self):
         """Attempt to reconnect to the G-code printer."""
-        print("Attempting to reconnect to G-code printer...")
+        log.warning("Attempting to reconnect to G-code printer...")
         if self.ser and self.ser.is_open:
             self.ser.close()
         time.sleep(1)  # Wait before reconnecting
@@ -121,6 +319,6 @@ class GCodePrinterController:
             try:
                 self.ser.close()
             except SerialException as e:
-                print(f"Error closing G-code printer connection: {e}")
+                log.error(f"Error closing G-code printer connection: {e}")
             finally:
                 self.ser = None
@@ -0,0 +1,61 @@
+# src/kinematics.py
+
+"""
+Move-time estimates for the CNC gantry.
+
+Moves are modelled the way Marlin plans a single, rest-to-rest block: a
+trapezoidal velocity profile whose cruise speed is the commanded feedrate
+and whose acceleration is the M204 value, each clipped so that no axis
+exceeds its own M203 feedrate or M201 acceleration limit.
+"""
+
+import math
+from dataclasses import dataclass, field
+
+AXES = ("X", "Y", "Z")
+
+
+def trapezoid_time(distance, v_max, accel):
+    """Rest-to-rest time (s) for ``distance`` mm, triangular if v_max is never reached."""
+    if distance <= 0:
+        return 0.0
+    if distance >= v_max * v_max / accel:
+        return distance / v_max + v_max / accel
+    return 2.0 * math.sqrt(distance / accel)
+
+
+@dataclass
+class MotionLimits:
+    feedrate: float = 700.0          # mm/min, G1 F
+    acceleration: float = 150.0      # mm/s², M204 P
+    max_feedrate: dict = field(default_factory=lambda: {"X": 100.0, "Y": 100.0, "Z": 30.0})      # mm/s, M203
+    max_acceleration: dict = field(default_factory=lambda: {"X": 150.0, "Y": 150.0, "Z": 100.0})  # mm/s², M201
+
+    def move_profile(self, start, end, feedrate=None):
+        """(distance, cruise speed, acceleration) of the block from ``start`` to ``end``."""
+        deltas = [b - a for a, b in zip(start, end)]
+        distance = math.sqrt(sum(d * d for d in deltas))
+        v_max = (feedrate or self.feedrate) / 60.0
+        accel = self.acceleration
+        if distance:
+            for axis, d in zip(AXES, deltas):
+                if d:
+                    unit = abs(d) / distance
+                    v_max = min(v_max, self.max_feedrate.get(axis, math.inf) / unit)
+                    accel = min(accel, self.max_acceleration.get(axis, math.inf) / unit)
+        return distance, v_max, accel
+
+    def move_time(self, start, end, feedrate=None):
+        """Seconds for one G1 between two points (any number of axes, X first)."""
+        return trapezoid_time(*self.move_profile(start, end, feedrate))
+
+    def path_time(self, points, start=None, dwell_s=0.0, feedrate=None):
+        """Seconds to visit ``points`` in order, stopping (and dwelling) at each one."""
+        points = list(points)
+        if start is not None:
+            points.insert(0, start)
+            n_stops = len(points) - 1
+        else:
+            n_stops = len(points)
+        moves = sum(self.move_time(a, b, feedrate) for a, b in zip(points, points[1:]))
+        return moves + n_stops * dwell_s
@@ -0,0 +1,88 @@
+# src/log_bus.py
+
+"""
+Thread-safe, bounded log pipeline.
+
+Everything logs through the ``cnc_optogenie`` logger tree (``get_logger``)
+from any thread. ``LogBus`` is the logging handler behind the GUI's log
+window: it keeps the last ``capacity`` formatted records in a ring buffer,
+numbered in order, and readers ask for the records after the last number
+they saw. The window polls it on a timer and appends each batch at once,
+so a burst of serial debug output neither blocks the logging thread on the
+UI nor grows memory without bound.
+"""
+
+import logging
+import sys
+from collections import deque
+from itertools import islice
+
+LOGGER_NAME = "cnc_optogenie"
+FORMAT = "%(asctime)s %(levelname)-7s %(message)s"
+DATE_FORMAT = "%H:%M:%S"
+
+
+def get_logger(name=None):
+    """``cnc_optogenie`` or its child ``cnc_optogenie.<name>``."""
+    return logging.getLogger(f"{LOGGER_NAME}.{name}" if name else LOGGER_NAME)
+
+
+class LogBus(logging.Handler):
+    _shared = None
+
+    def __init__(self, capacity=5000, level=logging.DEBUG):
+        super().__init__(level)
+        self.capacity = capacity
+        self._records = deque(maxlen=capacity)   # (seq, levelno, text)
+        self._seq = 0
+        self.setFormatter(logging.Formatter(FORMAT, DATE_FORMAT))
+
+    @classmethod
+    def shared(cls, console_level=logging.INFO):
+        """
+        The process-wide bus, attached to the ``cnc_optogenie`` logger on
+        first use together with a console handler at ``console_level``.
+        """
+        if cls._shared is None:
+            bus = cls()
+            console = logging.StreamHandler(sys.stdout)
+            console.setLevel(console_level)
+            console.setFormatter(logging.Formatter("%(message)s"))
+            logger = get_logger()
+            logger.setLevel(logging.DEBUG)
+            logger.addHandler(bus)
+            logger.addHandler(console)
+            cls._shared = bus
+        return cls._shared
+
+    def emit(self, record):
+        # Handler.handle() already holds self.lock
+        try:
+            text = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+        self._seq += 1
+        self._records.append((self._seq, record.levelno, text))
+
+    @property
+    def last_seq(self):
+        return self._seq
+
+    def since(self, seq=0, level=logging.NOTSET):
+        """
+        Records after number ``seq`` at ``level`` or above.
+
+        Returns ``(last_seq, lines, dropped)``; ``dropped`` counts records
+        after ``seq`` that the ring buffer has already discarded.
+        """
+        with self.lock:
+            first = self._records[0][0] if self._records else self._seq + 1
+            start = max(seq + 1 - first, 0)
+            lines = [text for _, levelno, text in islice(self._records, start, None)
+                     if levelno >= level]
+            return self._seq, lines, max(first - seq - 1, 0)
+
+    def clear(self):
+        with self.lock:
+            self._records.clear()
@@ -1,49 +1,57 @@
 # src/main_controller.py
 
+import logging
 from src.data_controller import DataController
 from src.gcode_printer_controller import GCodePrinterController
 from src.arduino_controller import ArduinoController
-import time
-from src.coords import CoordSystem
+from src.coords import WELL_CENTERS_RAW, CoordSystem
+from src.path_planner import plan_route
+from src.rig_registry import Rig, RigRegistry, connect_rig
+from src.settle import SettlePolicy
+from src.telemetry import TelemetryWriter
+from src.log_bus import LogBus, get_logger
+
+MAIN_RIG = "Main"
 
 class MainController:
     def __init__(self, ui):
         self.ui = ui
+        # Logging from any thread is safe; the UI's LogView drains the bus
+        self.log_bus = LogBus.shared()
+        self.log = get_logger("main")
         self.gcode_port = None
         self.arduino_port = None
         self.printer_controller = None
         self.arduino_controller = None
+        self.run_engine = None
+        # How this rig decides a point has settled (tolerance, dwell)
+        self.settle_policy = SettlePolicy()
+        # Every rig driven by this process; the ports chosen in the top bar
+        # form the MAIN_RIG once both are connected
+        self.rigs = RigRegistry(log=self.log_message)
         
-        self.data_controller = DataController()
-        self.data_controller.initialize_db()
+        self.data_controller = DataController.shared()
+        # Per-step run events, written to run_events in the background
+        self.telemetry = TelemetryWriter(self.data_controller)
         
         self.coords = CoordSystem(mag_factor=4)      # <── NEW
 
         # Use raw coordinates without mag_factor multiplication
-        self.slide_centers_raw = [
-            (84.93, 36.40),
-            (27.03, 36.40),
-            (51.46, 91.20),
-        ]
+        self.slide_centers_raw = list(WELL_CENTERS_RAW)
         # Store custom stimulation points (initially same as slide centers)
         self.custom_stimulation_points = self.slide_centers_raw.copy()
 
     def get_display_coordinates(self, x, y):
         """Convert raw coordinates to display coordinates."""
-        return (x * self.mag_factor, y * self.mag_factor)
+        return self.coords.raw_to_disp(x, y)
 
     def get_cnc_coordinates(self, x, y):
         """Convert raw coordinates to CNC machine coordinates."""
-        # First convert to display coordinates
-        display_x, display_y = self.get_display_coordinates(x, y)
-        # Then transform to CNC coordinates (swap and divide by mag_factor)
-        x_cnc = display_y / self.mag_factor
-        y_cnc = display_x / self.mag_factor
-        return x_cnc, y_cnc
+        return self.coords.raw_to_cnc(x, y)
 
     def get_raw_coordinates(self, display_x, display_y):
         """Convert display coordinates back to raw coordinates."""
-        return (display_y / self.mag_factor, display_x / self.mag_factor)
+        return self.coords.disp_to_raw(display_x, display_y)
 
     def update_stimulation_point(self, well_index, x, y):
         """Update a stimulation point and synchronize with PlateGrid."""
@@ -52,15 +60,16 @@ class MainController:
             self.ui.plate_grid.update_stimulation_point(well_index, x, y)
 
     def get_stimulation_points(self):
-        """Get all stimulation points in display coordinates."""
-        return [self.get_display_coordinates(x, y) for x, y in self.custom_stimulation_points]
+        """Get all stimulation points in display coordinates (N×2 array)."""
+        return self.coords.raw_to_disp_many(self.custom_stimulation_points)
 
     def get_slide_centers(self):
-        """Get all slide centers in display coordinates."""
-        return [self.get_display_coordinates(x, y) for x, y in self.slide_centers]
+        """Get all slide centers in display coordinates (N×2 array)."""
+        return self.coords.raw_to_disp_many(self.slide_centers_raw)
 
     def set_gcode_port(self, port):
         """Set the G-code printer port and initialize controller."""
+        self._check_main_rig_idle()
         try:
             if self.printer_controller:
                 self.printer_controller.close()
@@ -70,12 +79,15 @@ class MainController:
                 raise Exception("Failed to connect to G-code printer")
             self.log_message("G-code printer connected successfully")
         except Exception as e:
-            self.log_message(f"Error setting G-code port: {e}")
+            self.log_message(f"Error setting G-code port: {e}", logging.ERROR)
             self.printer_controller = None
             raise
+        finally:
+            self._register_main_rig()
 
     def set_arduino_port(self, port):
         """Set the Arduino port and initialize controller."""
+        self._check_main_rig_idle()
         try:
             if self.arduino_controller:
                 self.arduino_controller.close()
@@ -85,9 +97,63 @@ class MainController:
                 raise Exception("Failed to connect to Arduino")
             self.log_message("Arduino connected successfully")
         except Exception as e:
-            self.log_message(f"Error setting Arduino port: {e}")
+            self.log_message(f"Error setting Arduino port: {e}", logging.ERROR)
             self.arduino_controller = None
             raise
+        finally:
+            self._register_main_rig()
+
+    def _check_main_rig_idle(self):
+        """Refuse a port change while the main rig runs a work: its outcome would be lost."""
+        main = self.rigs.get(MAIN_RIG)
+        if main and not main.is_idle():
+            running = f"Work {main.work_id} is" if main.work_id else "A work is"
+            message = f"{running} running on the main rig; stop it before changing ports"
+            self.log_message(message, logging.ERROR)
+            raise Exception(message)
+
+    def _register_main_rig(self):
+        """Keep MAIN_RIG in the registry in step with the top-bar ports."""
+        if MAIN_RIG in self.rigs:
+            self.rigs.remove(MAIN_RIG, close=False)   # devices are owned here
+        if self.printer_controller and self.arduino_controller:
+            self.rigs.add(Rig(MAIN_RIG, self.printer_controller, self.arduino_controller,
+                              coords=self.coords, points_raw=self.custom_stimulation_points,
+                              settle=self.settle_policy, telemetry=self.telemetry))
+
+    def add_rig(self, name, gcode_port, arduino_port):
+        """Connect another CNC + laser rig and register it for scheduled works."""
+        if name in self.rigs:
+            raise Exception(f"A rig named {name!r} already exists")
+        try:
+            rig = connect_rig(name, gcode_port, arduino_port, settle=SettlePolicy(),
+                              telemetry=self.telemetry)
+        except Exception as e:
+            self.log_message(f"Error adding rig {name}: {e}", logging.ERROR)
+            raise
+        self.rigs.add(rig)
+        self.log_message(f"Rig {name} connected ({gcode_port}, {arduino_port})")
+        return rig
+
+    def remove_rig(self, name):
+        if name == MAIN_RIG:
+            raise Exception("The main rig follows the top-bar ports")
+        self.rigs.remove(name)
+        self.log_message(f"Rig {name} removed")
+
+    def dispatch_scheduled(self):
+        """
+        Start Scheduled works on idle rigs and record finished ones.
+        Returns ``(finished, started)``; call it periodically.
+        """
+        main = self.rigs.get(MAIN_RIG)
+        if main and hasattr(self.ui, 'plate_grid') and main.is_idle():
+            # The main rig runs the points and calibration shown in the plate grid
+            main.coords = self.ui.plate_grid.coords
+            main.points_raw = list(self.ui.plate_grid.custom_stimulation_points)
+        finished = self.rigs.collect(self.data_controller)
+        started = self.rigs.dispatch(self.data_controller)
+        return finished, started
 
     def test_cnc_connection(self):
         """Test the connection to the CNC by sending a test command."""
@@ -106,7 +172,7 @@ class MainController:
             self.log_message("CNC test successful.")
             return True
         except Exception as e:
-            self.log_message(f"Error testing CNC connection: {e}")
+            self.log_message(f"Error testing CNC connection: {e}", logging.ERROR)
             return False
 
     def test_arduino_connection(self):
@@ -124,9 +190,17 @@ class MainController:
                 self.log_message("No response from Arduino. Check connection.")
                 return False
         except Exception as e:
-            self.log_message(f"Error testing Arduino connection: {e}")
+            self.log_message(f"Error testing Arduino connection: {e}", logging.ERROR)
             return False
 
+    def create_run_engine(self):
+        """Fresh RunEngine for the main rig; refuses while a run is active on it."""
+        main = self.rigs.get(MAIN_RIG)
+        if not main:
+            raise Exception("Both the G-code printer and the Arduino must be connected")
+        self.run_engine = main.new_engine()
+        return self.run_engine
+
     def execute_sequence(self):
         """Execute the sequence of movements and laser activations."""
         if not self.printer_controller or not self.arduino_controller:
@@ -152,27 +226,33 @@ class MainController:
                 pulse_duration = 100
                 frequency = 0.5
 
-            # First, move to the initial position (well 1)
-            first_center = self.slide_centers[0]
-            x, y = first_center
-            message = f"Moving to initial position (well 1): ({x}, {y})"
+            # Order the wells for the least travel, starting from home
+            plan = plan_route(self.custom_stimulation_points, self.coords,
+                              start_cnc=(0.0, 0.0),
+                              cost=self.printer_controller.motion_limits().move_time)
+            self.log_message(f"Planned route {[i + 1 for i in plan.order]}: "
+                             f"{plan.travel_time:.1f} s travel, {plan.saving:.1f} s saved")
+
+            # First, move to the initial position
+            x, y = plan.points[0]
+            message = f"Moving to initial position (well {plan.order[0]+1}): ({x}, {y})"
             self.log_message(message)
 
             # Move CNC to initial position and wait for completion
             self.printer_controller.move_to(x, y)
             self.log_message("Waiting for movement to complete...")
             self.printer_controller.wait_for_move_completion()
-            self.log_message("Movement to well 1 completed")
+            self.log_message(f"Movement to well {plan.order[0]+1} completed")
             
-            # Wait a moment to ensure stability
+            # Wait until the position is confirmed, plus the rig's dwell
             self.log_message("Waiting for stability...")
-            time.sleep(2)
-            self.log_message("Starting recipe execution at well 1")
+            settled = self.settle_policy.settle(self.printer_controller, (x, y))
+            self.log_message(f"Settled in {settled:.2f} s")
+            self.log_message(f"Starting recipe execution at well {plan.order[0]+1}")
 
             # Move through each position
-            for i, center in enumerate(self.slide_centers):
-                if i > 0:  # Skip first position as we're already there
-                    x, y = center
+            for step, (i, (x, y)) in enumerate(zip(plan.order, plan.points)):
+                if step > 0:  # Skip first position as we're already there
                     message = f"Moving to position {i+1}: ({x}, {y})"
                     self.log_message(message)
 
@@ -181,69 +261,69 @@ class MainController:
                     self.log_message(f"Waiting for movement to position {i+1} to complete...")
                     self.printer_controller.wait_for_move_completion()
                     self.log_message(f"Movement to position {i+1} completed")
+                    settled = self.settle_policy.settle(self.printer_controller, (x, y))
+                    self.log_message(f"Settled in {settled:.2f} s")
 
                 # Activate laser with current settings
                 message = f"Activating laser at position {i+1}..."
                 self.log_message(message)
 
                 try:
-                    # Send recipe command to Arduino
+                    # Send recipe command to Arduino; returns once it reports DONE
                     self.arduino_controller.send_recipe_command(
                         intensity=intensity,
                         pulse_duration=pulse_duration,
                         frequency=frequency,
                         on_time=pulse_duration
                     )
-                    
-                    # Wait for recipe completion
-                    response = self.arduino_controller.await_response("DONE", timeout=65)  # 60s max + 5s buffer
-                    if not response:
-                        raise Exception("Recipe execution did not complete (DONE not received)")
-                    
+
                     message = f"Laser activation completed at position {i+1}"
                     self.log_message(message)
                     
                 except Exception as e:
                     message = f"Error at position {i+1}: {str(e)}"
-                    self.log_message(message)
+                    self.log_message(message, logging.ERROR)
                     raise
 
-                # Wait a bit before moving to next position
-                time.sleep(1)
-
             message = "Sequence completed successfully"
             self.log_message(message)
             return True
 
         except Exception as e:
             message = f"Error in sequence execution: {str(e)}"
-            self.log_message(message)
+            self.log_message(message, logging.ERROR)
             return False
 
     def emergency_stop(self):
         """Handle emergency stop by stopping all operations."""
-        self.log_message("Emergency stop triggered!")
+        self.log_message("Emergency stop triggered!", logging.WARNING)
         try:
+            self.rigs.abort_all()
+            for rig in self.rigs:
+                if rig.printer is not self.printer_controller:
+                    rig.printer.emergency_stop()
             if self.printer_controller:
-                self.printer_controller.send_gcode("M112")  # Emergency stop command
+                self.printer_controller.emergency_stop()  # M112, bypassing the queue
             if self.arduino_controller:
                 self.arduino_controller.ser.write(b'STOP\n')  # Stop command for Arduino
         except Exception as e:
-            self.log_message(f"Error during emergency stop: {e}")
+            self.log_message(f"Error during emergency stop: {e}", logging.ERROR)
 
     def close_connections(self):
         """Close all connections and cleanup resources."""
         try:
+            for rig in self.rigs:
+                if rig.name != MAIN_RIG:
+                    self.rigs.remove(rig.name)
             if self.printer_controller:
                 self.printer_controller.close()
             if self.arduino_controller:
                 self.arduino_controller.close()
+            self.telemetry.close()
             self.log_message("All connections closed successfully.")
         except Exception as e:
-            self.log_message(f"Error closing connections: {e}")
+            self.log_message(f"Error closing connections: {e}", logging.ERROR)
 
-    def log_message(self, message):
-        """Log a message to the UI."""
-        if hasattr(self.ui, 'log_message'):
-            self.ui.log_message(message)
-        print(message)  # Also print to console
+    def log_message(self, message, level=logging.INFO):
+        """Log a message to the log bus (UI log window and console)."""
+        self.log.log(level, message)
@@ -0,0 +1,144 @@
+# src/path_planner.py
+
+"""
+Travel-time ordering of stimulation points.
+
+Points are ordered in the CNC frame with a nearest-neighbour tour that is
+then improved by 2-opt and Or-opt (segment relocation) until neither helps.
+The tour is an open path: it starts at the gantry's current position (or
+anywhere, if unknown) and does not return.
+"""
+
+from dataclasses import dataclass, field
+
+from src.kinematics import MotionLimits
+
+
+@dataclass
+class RoutePlan:
+    order: list[int]                  # indices into the input, in visiting order
+    points: list[tuple[float, float]] = field(default_factory=list)  # CNC, visiting order
+    travel_time: float = 0.0          # predicted seconds for the planned order
+    baseline_time: float = 0.0        # predicted seconds for the given order
+
+    @property
+    def saving(self) -> float:
+        """Predicted seconds saved compared with visiting in list order."""
+        return self.baseline_time - self.travel_time
+
+
+def _path_cost(path, matrix):
+    return sum(matrix[a][b] for a, b in zip(path, path[1:]))
+
+
+def _nearest_neighbour(matrix, start, nodes):
+    path, remaining = [start], set(nodes)
+    while remaining:
+        last = path[-1]
+        nxt = min(remaining, key=lambda n: (matrix[last][n], n))
+        path.append(nxt)
+        remaining.remove(nxt)
+    return path
+
+
+def _two_opt(path, matrix, max_passes=50):
+    """Improve an open path with a fixed first node by segment reversals."""
+    n = len(path)
+    for _ in range(max_passes):
+        improved = False
+        for i in range(1, n - 1):
+            a, b = path[i - 1], path[i]
+            for j in range(i + 1, n):
+                c = path[j]
+                d = path[j + 1] if j + 1 < n else None
+                before = matrix[a][b] + (matrix[c][d] if d is not None else 0.0)
+                after = matrix[a][c] + (matrix[b][d] if d is not None else 0.0)
+                if after < before - 1e-12:
+                    path[i:j + 1] = reversed(path[i:j + 1])
+                    b = path[i]
+                    improved = True
+        if not improved:
+            break
+    return path
+
+
+def _or_opt(path, matrix, max_segment=3):
+    """Move short segments (optionally reversed) to a cheaper place in the path."""
+    n = len(path)
+
+    def c(a, b):
+        return matrix[a][b] if a is not None and b is not None else 0.0
+
+    improved = False
+    for k in range(1, max_segment + 1):
+        i = 1
+        while i + k <= n:
+            prev, first, last = path[i - 1], path[i], path[i + k - 1]
+            nxt = path[i + k] if i + k < n else None
+            removal_gain = c(prev, first) + c(last, nxt) - c(prev, nxt)
+            best = (1e-12, None, False)
+            for j in range(n):
+                if i - 1 <= j <= i + k - 1:
+                    continue
+                a, b = path[j], path[j + 1] if j + 1 < n else None
+                for rev, (head, tail) in ((False, (first, last)), (True, (last, first))):
+                    gain = removal_gain - (c(a, head) + c(tail, b) - c(a, b))
+                    if gain > best[0]:
+                        best = (gain, j, rev)
+            _, j, rev = best
+            if j is None:
+                i += 1
+                continue
+            segment = path[i:i + k]
+            if rev:
+                segment.reverse()
+            del path[i:i + k]
+            at = j + 1 if j < i else j + 1 - k
+            path[at:at] = segment
+            improved = True
+    return improved
+
+
+def order_points(points_cnc, start=None, cost=None) -> RoutePlan:
+    """
+    Order CNC-frame points to minimise total travel time.
+
+    ``start`` is the gantry position the tour begins from; with None the
+    tour may begin at any point. ``cost(a, b)`` returns the travel time
+    between two points and defaults to the trapezoidal move time for the
+    default ``MotionLimits``.
+    """
+    points = [tuple(p) for p in points_cnc]
+    n = len(points)
+    cost = cost or MotionLimits().move_time
+    if n == 0:
+        return RoutePlan(order=[])
+
+    # node 0 is the start; a virtual start costs nothing to leave
+    nodes = [start] + points
+    matrix = [[0.0] * (n + 1) for _ in range(n + 1)]
+    for i in range(n + 1):
+        for j in range(i + 1, n + 1):
+            if nodes[i] is None:
+                continue
+            matrix[i][j] = matrix[j][i] = cost(nodes[i], nodes[j])
+
+    baseline = _path_cost(list(range(n + 1)), matrix)
+    path = _two_opt(_nearest_neighbour(matrix, 0, range(1, n + 1)), matrix)
+    while _or_opt(path, matrix):
+        _two_opt(path, matrix)
+    travel = _path_cost(path, matrix)
+    if travel > baseline:                 # never worse than the given order
+        path, travel = list(range(n + 1)), baseline
+
+    order = [k - 1 for k in path[1:]]
+    return RoutePlan(order=order,
+                     points=[points[k] for k in order],
+                     travel_time=travel,
+                     baseline_time=baseline)
+
+
+def plan_route(points_raw, coords, start_cnc=None, cost=None) -> RoutePlan:
+    """``order_points`` for RAW-frame points, converted with ``coords.raw_to_cnc_many``."""
+    points_cnc = [tuple(p) for p in coords.raw_to_cnc_many(points_raw).tolist()]
+    return order_points(points_cnc, start=start_cnc, cost=cost)
@@ -0,0 +1,215 @@
+# src/rig_registry.py
+
+"""
+Several CNC + laser rigs driven from one process.
+
+Each Rig owns its device controllers, plate geometry and settle policy, and
+runs one work at a time on its own RunEngine thread. The RigRegistry hands
+Scheduled works to idle rigs and writes back their outcome.
+
+Run engines finish on their worker threads; outcomes are queued and only
+applied to the database by ``dispatch()``, on the caller's thread.
+"""
+
+import threading
+import time
+from collections import deque
+
+from src.arduino_controller import ArduinoController
+from src.coords import WELL_CENTERS_RAW, CoordSystem
+from src.gcode_printer_controller import GCodePrinterController
+from src.log_bus import get_logger
+from src.run_engine import RunEngine, RunState, plan_job
+from src.settle import SettlePolicy
+
+log = get_logger("rigs")
+
+
+class Rig:
+    def __init__(self, name, printer, arduino, coords=None, points_raw=None,
+                 settle=None, clock=time, telemetry=None):
+        self.name = name
+        self.printer = printer
+        self.arduino = arduino
+        self.coords = coords or CoordSystem(mag_factor=4)
+        self.points_raw = list(points_raw or WELL_CENTERS_RAW)
+        self.settle = settle or SettlePolicy()
+        self.clock = clock
+        self.telemetry = telemetry       # telemetry.TelemetryWriter shared by all rigs
+        self.engine = None               # engine of the current / last run
+        self.work_id = None              # work currently running, if any
+        self.last_event = None
+
+    def is_idle(self):
+        return self.engine is None or not self.engine.is_running()
+
+    def new_engine(self):
+        """Fresh RunEngine for this rig's devices; refuses while a run is active."""
+        if not self.is_idle():
+            raise RuntimeError(f"Rig {self.name} is already running work {self.work_id}")
+        self.engine = RunEngine(self.printer, self.arduino, settle=self.settle, clock=self.clock,
+                                telemetry=self.telemetry, name=self.name)
+        return self.engine
+
+    def close(self):
+        if self.engine:
+            self.engine.abort()
+            self.engine.wait(5)
+        for device in (self.printer, self.arduino):
+            if device:
+                device.close()
+
+    def __repr__(self):
+        state = self.engine.state.value if self.engine else RunState.IDLE.value
+        return f"Rig({self.name!r}, {state})"
+
+
+def connect_rig(name, gcode_port, arduino_port, settle=None, telemetry=None):
+    """Open both serial devices of a rig; closes whatever opened on failure."""
+    printer = arduino = None
+    try:
+        printer = GCodePrinterController(port=gcode_port)
+        if not printer.ser:
+            raise Exception(f"Failed to connect to G-code printer on {gcode_port}")
+        arduino = ArduinoController(port=arduino_port)
+        if not arduino.ser:
+            raise Exception(f"Failed to connect to Arduino on {arduino_port}")
+    except Exception:
+        for device in (printer, arduino):
+            if device:
+                device.close()
+        raise
+    return Rig(name, printer, arduino, settle=settle, telemetry=telemetry)
+
+
+class RigRegistry:
+    def __init__(self, log=log.info, on_finished=None):
+        self.log = log
+        # Called from the engine thread when a run ends, e.g. to wake a scheduler
+        self.on_finished = on_finished
+        self._rigs = {}
+        self._lock = threading.Lock()
+        self._finished = deque()         # (rig, work_id, RunEvent) from engine threads
+        self.skipped = set()             # works that failed/aborted this session
+
+    # ───────────────────────── membership ──────────────────────
+    def add(self, rig):
+        with self._lock:
+            if rig.name in self._rigs:
+                raise ValueError(f"Rig {rig.name!r} already registered")
+            self._rigs[rig.name] = rig
+        return rig
+
+    def remove(self, name, close=True):
+        with self._lock:
+            rig = self._rigs.pop(name)
+        if close:
+            rig.close()
+        return rig
+
+    def get(self, name):
+        return self._rigs.get(name)
+
+    def __contains__(self, name):
+        return name in self._rigs
+
+    def __iter__(self):
+        return iter(list(self._rigs.values()))
+
+    def __len__(self):
+        return len(self._rigs)
+
+    def idle_rigs(self):
+        return [rig for rig in self if rig.is_idle()]
+
+    # ───────────────────────── running ─────────────────────────
+    def start(self, rig, work, recipe):
+        """Run one ``works`` row on ``rig``; returns the started engine."""
+        engine = rig.new_engine()
+        job, plan = plan_job(work, recipe, rig.points_raw, rig.coords, rig.printer,
+                             home=rig.printer.position is None)
+        engine.add_listener(lambda event: self._on_event(rig, event))
+        rig.work_id = work[0]
+        self.log(f"[{rig.name}] Work {work[0]} ({work[1]}): route {job.labels}, "
+                 f"{plan.travel_time:.1f} s travel")
+        engine.start(job)
+        return engine
+
+    def _on_event(self, rig, event):
+        # Engine thread: record only, the database is touched in dispatch()
+        rig.last_event = event
+        if event.state.finished:
+            self._finished.append((rig, event.work_id, event))
+            if self.on_finished:
+                self.on_finished()
+
+    def collect(self, data_controller):
+        """Write back the outcome of every run that finished since the last call."""
+        done = []
+        while self._finished:
+            rig, work_id, event = self._finished.popleft()
+            rig.work_id = None
+            if event.state == RunState.DONE:
+                data_controller.update_work_status(work_id, "Finished")
+                self.log(f"[{rig.name}] Work {work_id} completed successfully")
+            else:
+                # Back in the queue for the operator, but not retried by us
+                data_controller.update_work_status(work_id, "Scheduled")
+                self.skipped.add(work_id)
+                self.log(f"[{rig.name}] Work {work_id} {event.state.value.lower()}: "
+                         f"{event.message}")
+            done.append((rig.name, work_id, event.state))
+        return done
+
+    def dispatch(self, data_controller):
+        """
+        Collect finished runs, then start Scheduled works on idle rigs, one
+        per rig, highest priority first and oldest first within a priority.
+        Returns ``[(rig name, work id), ...]`` started.
+        """
+        self.collect(data_controller)
+        started = []
+        for rig in self.idle_rigs():
+            while True:
+                work = data_controller.claim_next_work(exclude=self.skipped)
+                if work is None:
+                    return started
+                if self._try_start(rig, work, data_controller):
+                    started.append((rig.name, work[0]))
+                    break
+        return started
+
+    def _try_start(self, rig, work, data_controller):
+        """Start a claimed (In Progress) work; puts it back on failure."""
+        recipe = data_controller.get_recipe_by_id(work[2])
+        if not recipe:
+            data_controller.update_work_status(work[0], "Scheduled")
+            self.skipped.add(work[0])
+            self.log(f"Work {work[0]}: recipe {work[2]} not found, skipped")
+            return False
+        try:
+            self.start(rig, work, recipe)
+            return True
+        except Exception as e:
+            rig.work_id = None
+            data_controller.update_work_status(work[0], "Scheduled")
+            self.skipped.add(work[0])
+            self.log(f"[{rig.name}] Could not start work {work[0]}: {e}")
+            return False
+
+    def is_busy(self):
+        return any(not rig.is_idle() for rig in self)
+
+    def abort_all(self):
+        for rig in self:
+            if rig.engine:
+                rig.engine.abort()
+
+    def wait_all(self, timeout=None):
+        for rig in self:
+            if rig.engine:
+                rig.engine.wait(timeout)
+
+    def close(self):
+        for name in list(self._rigs):
+            self.remove(name)
@@ -0,0 +1,290 @@
+# src/run_engine.py
+
+"""
+Work execution off the GUI thread.
+
+A RunEngine drives one CNC + laser rig through a RunJob on a worker thread
+and moves through explicit states::
+
+    IDLE → HOMING → (MOVING → SETTLING → STIMULATING)* → DONE
+                                                        ↘ ABORTED / FAILED
+
+The recipe is validated once before anything moves, and each point's
+``R,...`` command is staged (encoded and its replies subscribed) while the
+gantry is still travelling, so the laser fires as soon as settling ends.
+
+Every transition is published as a RunEvent to the registered listeners.
+Listeners are called from the worker thread; the UI wraps them in a Qt
+signal so that slots run on the GUI thread.
+"""
+
+import threading
+import time
+from concurrent.futures import TimeoutError as FutureTimeout
+from dataclasses import dataclass, field
+from enum import Enum
+
+from src import telemetry as tm
+from src.log_bus import get_logger
+from src.path_planner import plan_route
+from src.settle import SettlePolicy
+
+log = get_logger("engine")
+
+
+class RunState(Enum):
+    IDLE = "Idle"
+    HOMING = "Homing"
+    MOVING = "Moving"
+    SETTLING = "Settling"
+    STIMULATING = "Stimulating"
+    DONE = "Done"
+    ABORTED = "Aborted"
+    FAILED = "Failed"
+
+    @property
+    def finished(self):
+        return self in (RunState.DONE, RunState.ABORTED, RunState.FAILED)
+
+
+@dataclass
+class RunJob:
+    """One work: a recipe fired for ``duration`` seconds at each CNC point."""
+    work_id:  int | None
+    recipe:   tuple              # (id, name, intensity, pulse_duration, frequency, spot_size)
+    duration: float              # seconds of stimulation per point
+    points:   list               # CNC (x, y), in visiting order
+    labels:   list = field(default_factory=list)   # display index per point
+    home:     bool = False       # run init_printer (G28) first
+
+    def label(self, i):
+        return self.labels[i] if i < len(self.labels) else i
+
+
+def plan_job(work, recipe, points_raw, coords, printer, home=False):
+    """
+    RunJob for a ``works`` row on one rig, visiting ``points_raw`` in the
+    order with the least travel time. Returns ``(job, route_plan)``.
+    """
+    plan = plan_route(points_raw, coords,
+                      start_cnc=(0.0, 0.0) if home else printer.position,
+                      cost=printer.motion_limits().move_time)
+    job = RunJob(work_id=work[0], recipe=recipe, duration=work[3],
+                 points=plan.points, labels=[i + 1 for i in plan.order], home=home)
+    return job, plan
+
+
+@dataclass
+class RunEvent:
+    state:       RunState
+    timestamp:   float
+    work_id:     int | None = None
+    point_index: int | None = None
+    n_points:    int = 0
+    message:     str = ""
+    remaining:   float | None = None     # predicted seconds left
+
+
+class RunAborted(Exception):
+    pass
+
+
+class RunEngine:
+    def __init__(self, printer, arduino, settle=None, clock=time, telemetry=None, name=None):
+        self.printer = printer
+        self.arduino = arduino
+        self.settle = settle or SettlePolicy()
+        # Optional telemetry.TelemetryWriter; ``name`` tags its rows with the rig
+        self.telemetry = telemetry
+        self.name = name
+        # ``time`` in production; a simulators.VirtualClock in tests
+        self.clock = clock
+        self.state = RunState.IDLE
+        self.listeners = []
+        self._abort = threading.Event()
+        self._thread = None
+        self._job = None
+        self._point_index = None         # point of the last transition, for errors
+        self._plan = []                  # predicted seconds per remaining phase
+        self.settle_times = []           # seconds actually spent settling, per point
+        self.prepare_s = 0.0             # validating the recipe, once before the first move
+        self.overlap_saved = []          # encoding + subscribing done during travel, per point
+
+    @property
+    def overlap_saved_total(self):
+        """Host seconds kept out of the gap between settling and firing, over the run."""
+        return self.prepare_s + sum(self.overlap_saved)
+
+    @property
+    def settle_s(self):
+        """Settle time per point used for ETAs."""
+        return self.settle.expected_s
+
+    # ───────────────────────── control ─────────────────────────
+    def add_listener(self, callback):
+        """``callback(RunEvent)``; called from the worker thread."""
+        self.listeners.append(callback)
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, job: RunJob):
+        """Run ``job`` on a worker thread and return immediately."""
+        if self.is_running():
+            raise RuntimeError("A work is already running on this rig")
+        self._thread = threading.Thread(target=self.run, args=(job,),
+                                        name=f"run-engine-{job.work_id}", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def wait(self, timeout=None):
+        if self._thread:
+            self._thread.join(timeout)
+        return not self.is_running()
+
+    def abort(self):
+        """Stop after the current step. A running pulse train cannot be cut short."""
+        self._abort.set()
+
+    # ───────────────────────── execution ───────────────────────
+    def run(self, job: RunJob) -> bool:
+        """Execute ``job`` on the calling thread; True when every point completed."""
+        self._abort.clear()
+        self._job = job
+        self._point_index = None
+        self.settle_times = []
+        self.prepare_s = 0.0
+        self.overlap_saved = []
+        n = len(job.points)
+        self._predict(job)
+        self._record(tm.RUN_START, message=f"{n} point(s)")
+        try:
+            # Validate up front: a bad recipe fails before the gantry moves
+            t0 = time.perf_counter()
+            recipe = self.arduino.prepare_recipe(job.recipe[2], job.duration,
+                                                 job.recipe[4], job.recipe[3])
+            self.prepare_s = time.perf_counter() - t0
+
+            if job.home:
+                self._enter(RunState.HOMING, message="Homing printer")
+                self.printer.init_printer()
+                self._check_abort()
+
+            for i, (x, y) in enumerate(job.points):
+                self._enter(RunState.MOVING, i,
+                            f"Moving to point {job.label(i)}: CNC ({x:.2f}, {y:.2f})")
+                self.printer.move_to(x, y, wait=False)
+                self._record(tm.MOVE_ISSUED, i)
+                t0 = time.perf_counter()
+                # Encode the line and subscribe to its replies while the gantry
+                # travels; only writing the line is left after settling
+                staged = self.arduino.stage_recipe(recipe)
+                self.overlap_saved.append(time.perf_counter() - t0)
+                try:
+                    self.printer.wait_for_move_completion()
+                    self._record(tm.MOVE_DONE, i)
+                    self._check_abort()
+
+                    self._enter(RunState.SETTLING, i, "Waiting for stability")
+                    self.settle_times.append(
+                        self.settle.settle(self.printer, (x, y), self.clock, self._sleep))
+                    self._record(tm.SETTLE_DONE, i, self.settle_times[-1])
+                    self._check_abort()
+                except BaseException:
+                    self.arduino.discard_recipe(staged)
+                    raise
+
+                self._enter(RunState.STIMULATING, i,
+                            f"Stimulating point {job.label(i)} "
+                            f"(settled in {self.settle_times[-1]:.2f} s; command encoded "
+                            f"and replies subscribed during the move, "
+                            f"{self.overlap_saved[-1] * 1000:.2f} ms)")
+                self._stimulate(staged, i)
+                self._check_abort()
+
+            self._enter(RunState.DONE,
+                        message=f"Completed {n} point(s); {self.overlap_saved_total * 1000:.2f} ms "
+                                f"of host work kept off the critical path "
+                                f"(validation {self.prepare_s * 1000:.2f} ms, once)")
+            self._record(tm.RUN_END, message=RunState.DONE.value)
+            return True
+        except RunAborted:
+            self._enter(RunState.ABORTED, message="Run aborted")
+            self._record(tm.ABORTED, self._point_index)
+            return False
+        except Exception as e:
+            self._enter(RunState.FAILED, message=str(e))
+            self._record(tm.ERROR, self._point_index, message=str(e))
+            return False
+
+    def _stimulate(self, staged, point_index):
+        done = self.arduino.fire_recipe(staged)
+        self._record(tm.ACK, point_index)
+        deadline = time.time() + staged.recipe.done_timeout
+        while True:
+            try:
+                done.result(timeout=0.2)
+                self._record(tm.DONE, point_index)
+                return
+            except FutureTimeout:
+                if self._abort.is_set():
+                    self.arduino.unsubscribe(done)
+                    raise RunAborted()
+                if time.time() > deadline:
+                    self.arduino.unsubscribe(done)
+                    raise RuntimeError("DONE not received in time")
+
+    def _sleep(self, seconds):
+        if self.clock is time:
+            self._abort.wait(seconds)        # wakes early on abort
+        else:
+            self.clock.sleep(seconds)
+
+    def _record(self, event, point_index=None, value=None, message=""):
+        if self.telemetry:
+            work_id = self._job.work_id if self._job else None
+            self.telemetry.record(work_id, event, point_index, value, message,
+                                  rig=self.name, timestamp=self.clock.time())
+
+    def _check_abort(self):
+        if self._abort.is_set():
+            raise RunAborted()
+
+    # ───────────────────────── reporting ───────────────────────
+    def _predict(self, job):
+        """Predicted duration of every phase still to run, in order."""
+        limits = self.printer.motion_limits()
+        start = self.printer.position or (0.0, 0.0)
+        self._plan = []
+        if job.home:
+            self._plan.append((RunState.HOMING, None, 0.0))
+            start = (0.0, 0.0)
+        for i, point in enumerate(job.points):
+            self._plan.append((RunState.MOVING, i, limits.move_time(start, point)))
+            self._plan.append((RunState.SETTLING, i, self.settle_s))
+            self._plan.append((RunState.STIMULATING, i, job.duration))
+            start = point
+
+    def _remaining(self, state, point_index):
+        for k, (s, i, _) in enumerate(self._plan):
+            if s == state and i == point_index:
+                return sum(t for _, _, t in self._plan[k:])
+        return 0.0
+
+    def _enter(self, state, point_index=None, message=""):
+        self.state = state
+        if point_index is not None:
+            self._point_index = point_index
+        job = self._job
+        event = RunEvent(state=state,
+                         timestamp=self.clock.time(),
+                         work_id=job.work_id if job else None,
+                         point_index=point_index,
+                         n_points=len(job.points) if job else 0,
+                         message=message,
+                         remaining=self._remaining(state, point_index))
+        for callback in list(self.listeners):
+            try:
+                callback(event)
+            except Exception as e:
+                log.exception(f"Run listener error: {e}")
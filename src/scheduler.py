@@ -0,0 +1,117 @@
+# src/scheduler.py
+
+"""
+Headless scheduler: runs Scheduled works without the GUI.
+
+    python -m src.scheduler --rig A=/dev/ttyUSB0,/dev/ttyACM0 [--rig B=...]
+
+Works are claimed highest priority first, oldest first within a priority,
+and handed to idle rigs through a RigRegistry. The loop sleeps for
+``poll_s`` between passes and wakes early whenever a run finishes or
+``notify()`` is called. Nothing here imports Qt.
+"""
+
+import argparse
+import threading
+
+from src.data_controller import DataController
+from src.log_bus import LogBus, get_logger
+from src.rig_registry import RigRegistry, connect_rig
+from src.telemetry import TelemetryWriter
+
+log = get_logger("scheduler")
+
+
+class Scheduler:
+    def __init__(self, data_controller, rigs, poll_s=5.0, log=log.info):
+        self.data_controller = data_controller
+        self.rigs = rigs
+        self.poll_s = poll_s
+        self.log = log
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        rigs.on_finished = self.notify
+
+    def notify(self):
+        """Wake the loop now, e.g. after a run ends or a work was added."""
+        self._wake.set()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def run_once(self):
+        """One pass: record finished runs, start works on idle rigs."""
+        finished = self.rigs.collect(self.data_controller)
+        started = self.rigs.dispatch(self.data_controller)
+        return finished, started
+
+    def has_pending(self):
+        scheduled = [w for w in self.data_controller.get_scheduled_works()
+                     if w[0] not in self.rigs.skipped]
+        return bool(scheduled) or self.rigs.is_busy()
+
+    def run_forever(self, until_empty=False):
+        """
+        Drain the queue until ``stop()``. With ``until_empty`` the loop also
+        ends once nothing is Scheduled and no rig is busy.
+        """
+        self.log(f"Scheduler started with {len(self.rigs)} rig(s)")
+        try:
+            while not self._stop.is_set():
+                self._wake.clear()
+                self.run_once()
+                if until_empty and not self.has_pending():
+                    break
+                self._wake.wait(self.poll_s)
+        finally:
+            # Never leave a work marked In Progress behind
+            self.rigs.abort_all()
+            self.rigs.wait_all(10)
+            self.rigs.collect(self.data_controller)
+            self.log("Scheduler stopped")
+
+
+def parse_rig(spec):
+    """``NAME=GCODE_PORT,ARDUINO_PORT`` → (name, gcode_port, arduino_port)."""
+    try:
+        name, ports = spec.split("=", 1)
+        gcode_port, arduino_port = ports.split(",")
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"Expected NAME=GCODE_PORT,ARDUINO_PORT, got {spec!r}")
+    return name.strip(), gcode_port.strip(), arduino_port.strip()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run Scheduled works without the GUI")
+    parser.add_argument("--rig", type=parse_rig, action="append", required=True,
+                        metavar="NAME=GCODE_PORT,ARDUINO_PORT",
+                        help="rig to drive; repeat for several rigs")
+    parser.add_argument("--db", default="db/cnc_optogenie.db")
+    parser.add_argument("--poll", type=float, default=5.0,
+                        help="seconds between database polls (default 5)")
+    parser.add_argument("--until-empty", action="store_true",
+                        help="exit once no work is left Scheduled")
+    args = parser.parse_args(argv)
+
+    LogBus.shared()   # console output for the module loggers
+    data_controller = DataController.shared(args.db)
+    telemetry = TelemetryWriter(data_controller)
+    rigs = RigRegistry(log=log.info)
+    try:
+        for name, gcode_port, arduino_port in args.rig:
+            rigs.add(connect_rig(name, gcode_port, arduino_port, telemetry=telemetry))
+        scheduler = Scheduler(data_controller, rigs, poll_s=args.poll, log=log.info)
+        try:
+            scheduler.run_forever(until_empty=args.until_empty)
+        except KeyboardInterrupt:
+            log.info("Interrupted")
+    finally:
+        rigs.close()
+        telemetry.close()
+        data_controller.close()
+
+
+if __name__ == "__main__":
+    main()
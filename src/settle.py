@@ -0,0 +1,55 @@
+# src/settle.py
+
+"""
+Settle detection after a move.
+
+Instead of a fixed "wait for stability" sleep, a point counts as settled once
+the firmware confirms the move is finished: M400 is acknowledged (planner
+empty) and M114 reports a position within ``tolerance_mm`` of the target.
+A short per-rig ``dwell_s`` then lets the gantry's mechanical ringing die
+out before the laser fires.
+"""
+
+import time
+from dataclasses import dataclass
+
+
+@dataclass
+class SettlePolicy:
+    tolerance_mm: float = 0.05     # max |reported − target| per axis
+    dwell_s:      float = 0.25     # extra wait once motion is confirmed done
+    timeout_s:    float = 10.0     # give up if the position never converges
+    poll_s:       float = 0.05     # pause between M400/M114 retries
+
+    @property
+    def expected_s(self) -> float:
+        """Settle time to plan with when motion is already complete."""
+        return self.dwell_s
+
+    def within_tolerance(self, reported, target) -> bool:
+        if reported is None:
+            return False
+        return all(abs(r - t) <= self.tolerance_mm for r, t in zip(reported, target))
+
+    def settle(self, printer, target, clock=time, sleep=None) -> float:
+        """
+        Block until ``printer`` has settled at ``target`` (CNC x, y).
+
+        Uses the last M114 report when ``move_to`` already waited for the
+        move; otherwise re-issues M400 + M114 until the position converges.
+        ``sleep`` defaults to ``clock.sleep``. Returns the seconds spent.
+        """
+        sleep = sleep or clock.sleep
+        start = clock.time()
+        while not self.within_tolerance(printer.reported_position(), target):
+            if clock.time() - start > self.timeout_s:
+                raise RuntimeError(
+                    f"Printer did not settle at ({target[0]:.2f}, {target[1]:.2f}); "
+                    f"last report: {printer.last_position}")
+            printer.wait_for_move_completion(timeout=self.timeout_s)
+            if self.within_tolerance(printer.reported_position(), target):
+                break
+            sleep(self.poll_s)
+        if self.dwell_s > 0:
+            sleep(self.dwell_s)
+        return clock.time() - start
@@ -0,0 +1,344 @@
+# src/simulators.py
+
+"""
+Hardware-free stand-ins for the two serial devices.
+
+Both simulators look like a ``serial.Serial`` to the controllers and can be
+plugged in through their ``serial_factory`` argument::
+
+    clock   = VirtualClock()
+    printer = GCodePrinterController("sim", reset_delay=0,
+                                     serial_factory=partial(MarlinSimulator, clock=clock))
+    arduino = ArduinoController("sim", reset_delay=0,
+                                serial_factory=partial(LaserArduinoSimulator, clock=clock))
+
+Time only moves on the shared VirtualClock. Whenever the host blocks in
+``readline()`` while the device still has a reply scheduled, the clock jumps
+straight to that reply, so a 60 s pulse train completes instantly.
+"""
+
+import abc
+import heapq
+import itertools
+import re
+import threading
+import time
+
+from src.kinematics import AXES, MotionLimits
+
+
+class VirtualClock:
+    """Monotonic clock that advances only when told to."""
+
+    def __init__(self, start=0.0):
+        self._now = float(start)
+        self._lock = threading.Lock()
+
+    def time(self):
+        with self._lock:
+            return self._now
+
+    def advance(self, seconds):
+        with self._lock:
+            self._now += max(0.0, seconds)
+            return self._now
+
+    def advance_to(self, t):
+        with self._lock:
+            self._now = max(self._now, t)
+            return self._now
+
+    def sleep(self, seconds):
+        """Drop-in for ``time.sleep`` that costs no wall-clock time."""
+        self.advance(seconds)
+
+
+class SimulatedSerial(abc.ABC):
+    """Serial-port plumbing shared by the device simulators.
+
+    Subclasses implement ``handle_line(line, t)`` and schedule replies with
+    ``emit(line, at)``.
+    """
+
+    def __init__(self, port=None, baudrate=115200, timeout=1, clock=None):
+        self.port = port
+        self.baudrate = baudrate
+        self.timeout = timeout
+        self.clock = clock or VirtualClock()
+        self.is_open = True
+        self.received = []               # every line the host sent
+        self._rx = bytearray()           # bytes readable by the host
+        self._tx = bytearray()           # partial line written by the host
+        self._outbox = []                # heap of (due, seq, bytes)
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+
+    # ----- device side ------------------------------------------------
+    @abc.abstractmethod
+    def handle_line(self, line, t):
+        """Process one line written by the host at time ``t``."""
+
+    def emit(self, line, at):
+        heapq.heappush(self._outbox, (at, next(self._seq), (line + "\n").encode("ascii")))
+
+    def on_read(self, line):
+        """Hook called for each line handed to the host."""
+
+    # ----- host side --------------------------------------------------
+    def write(self, data):
+        with self._cond:
+            self._tx.extend(data)
+            while b"\n" in self._tx:
+                raw, _, rest = bytes(self._tx).partition(b"\n")
+                self._tx = bytearray(rest)
+                line = raw.decode("ascii", errors="replace").strip()
+                self.received.append(line)
+                self.handle_line(line, self.clock.time())
+            self._cond.notify_all()
+        return len(data)
+
+    def _collect_due(self):
+        now = self.clock.time()
+        while self._outbox and self._outbox[0][0] <= now:
+            self._rx.extend(heapq.heappop(self._outbox)[2])
+
+    @property
+    def in_waiting(self):
+        with self._cond:
+            self._collect_due()
+            return len(self._rx)
+
+    def read(self, size=1):
+        with self._cond:
+            self._collect_due()
+            data, self._rx = bytes(self._rx[:size]), self._rx[size:]
+            return data
+
+    def readline(self):
+        deadline = time.time() + (self.timeout if self.timeout is not None else 1e9)
+        with self._cond:
+            while self.is_open:
+                self._collect_due()
+                if b"\n" in self._rx:
+                    i = self._rx.index(b"\n") + 1
+                    line, self._rx = bytes(self._rx[:i]), self._rx[i:]
+                    self.on_read(line)
+                    return line
+                if self._outbox:
+                    # host is blocked waiting on the device: skip ahead
+                    self.clock.advance_to(self._outbox[0][0])
+                    continue
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                self._cond.wait(min(remaining, 0.05))
+            return b""
+
+    def flush(self):
+        pass
+
+    def reset_input_buffer(self):
+        with self._cond:
+            self._rx.clear()
+
+    def reset_output_buffer(self):
+        pass
+
+    def close(self):
+        with self._cond:
+            self.is_open = False
+            self._cond.notify_all()
+
+
+class MarlinSimulator(SimulatedSerial):
+    """
+    Marlin-like G-code firmware.
+
+    Each line is answered with ``ok`` once it has been processed: G0/G1 as
+    soon as they fit in the planner (``block_buffer_size`` blocks), M400 and
+    G4 only when all queued motion has finished. M114 reports the planned
+    position followed by the live ``Count`` position. Move durations follow
+    a trapezoidal profile bounded by F, M203, M201 and M204.
+    """
+
+    _WORD = re.compile(r"([A-Z])\s*(-?\d*\.?\d+)")
+
+    def __init__(self, port=None, baudrate=115200, timeout=1, clock=None,
+                 block_buffer_size=16, homing_feedrate=50.0):
+        super().__init__(port, baudrate, timeout, clock)
+        self.block_buffer_size = block_buffer_size
+        self.homing_feedrate = homing_feedrate      # mm/s
+        self.position = {"X": 0.0, "Y": 0.0, "Z": 0.0}
+        self.feedrate = 1500.0                      # mm/min, modal F
+        self.max_feedrate = {"X": 300.0, "Y": 300.0, "Z": 5.0}     # mm/s
+        self.max_acceleration = {"X": 3000.0, "Y": 3000.0, "Z": 100.0}
+        self.acceleration = 3000.0                  # mm/s², M204 P
+        self.absolute = True
+        self.halted = False
+        self._ready_at = 0.0                        # command processor free
+        self._blocks = []                           # [(start, end, from, to)]
+        self._unacked = 0
+        self.max_unacked = 0                        # host-side lines in flight
+
+    # ----- motion model -----------------------------------------------
+    def _planner_end(self):
+        return self._blocks[-1][1] if self._blocks else 0.0
+
+    def move_duration(self, start, target, feedrate):
+        limits = MotionLimits(feedrate, self.acceleration,
+                              self.max_feedrate, self.max_acceleration)
+        return limits.move_time([start[a] for a in AXES], [target[a] for a in AXES])
+
+    def live_position(self, t):
+        """Actual toolhead position at time ``t`` (linear within a block)."""
+        for start, end, src, dst in self._blocks:
+            if start <= t < end:
+                f = (t - start) / (end - start)
+                return {a: src[a] + (dst[a] - src[a]) * f for a in src}
+            if t < start:
+                return dict(src)
+        return dict(self.position)
+
+    def _queue_block(self, t, duration, target):
+        # wait for a free planner slot
+        live = [b for b in self._blocks if b[1] > t]
+        if len(live) >= self.block_buffer_size:
+            t = live[-self.block_buffer_size][1]
+        start = max(t, self._planner_end())
+        self._blocks.append((start, start + duration, dict(self.position), dict(target)))
+        self._blocks = [b for b in self._blocks if b[1] > t] or self._blocks[-1:]
+        self.position = dict(target)
+        return t
+
+    # ----- protocol ---------------------------------------------------
+    def handle_line(self, line, t):
+        if self.halted or not line:
+            return
+        self._unacked += 1
+        self.max_unacked = max(self.max_unacked, self._unacked)
+        t = max(t, self._ready_at)
+        words = dict(self._WORD.findall(line.upper()))
+        code = line.split()[0].upper()
+
+        if code in ("G0", "G1"):
+            if "F" in words:
+                self.feedrate = float(words["F"])
+            target = dict(self.position)
+            for axis in target:
+                if axis in words:
+                    value = float(words[axis])
+                    target[axis] = value if self.absolute else target[axis] + value
+            duration = self.move_duration(self.position, target, self.feedrate)
+            t = self._queue_block(t, duration, target)
+        elif code == "G4":
+            dwell = float(words.get("P", 0)) / 1000.0 + float(words.get("S", 0))
+            t = self._queue_block(t, dwell, self.position)
+            t = self._planner_end()
+        elif code == "G28":
+            home = {a: 0.0 for a in self.position}
+            duration = max(abs(v) for v in self.position.values()) / self.homing_feedrate
+            self._queue_block(t, duration + 0.5, home)
+            t = self._planner_end()
+        elif code == "G90":
+            self.absolute = True
+        elif code == "G91":
+            self.absolute = False
+        elif code == "M400":
+            t = max(t, self._planner_end())
+        elif code == "M114":
+            live = self.live_position(t)
+            p = self.position
+            self.emit(f"X:{p['X']:.2f} Y:{p['Y']:.2f} Z:{p['Z']:.2f} E:0.00 "
+                      f"Count X:{live['X']:.2f} Y:{live['Y']:.2f} Z:{live['Z']:.2f}", t)
+        elif code == "M201":
+            for axis in self.max_acceleration:
+                if axis in words:
+                    self.max_acceleration[axis] = float(words[axis])
+        elif code == "M203":
+            for axis in self.max_feedrate:
+                if axis in words:
+                    self.max_feedrate[axis] = float(words[axis])
+        elif code == "M204":
+            if "P" in words or "S" in words:
+                self.acceleration = float(words.get("P", words.get("S")))
+        elif code == "M112":
+            self.halted = True
+            self._blocks.clear()
+            self.emit("Error:Printer halted. kill() called!", t)
+            return
+
+        self._ready_at = t
+        self.emit("ok", t)
+
+    def on_read(self, line):
+        if line.startswith(b"ok"):
+            self._unacked -= 1
+
+
+class LaserArduinoSimulator(SimulatedSerial):
+    """
+    The ``laser_control.ino`` sketch: TEST → OK, ``R,i,sec,hz,ms`` → parameter
+    echo, ACK, PROGRESS every 60 s segment and DONE, ERR on a bad recipe.
+    Lines arriving while a train is running are handled after it ends, like
+    the single-threaded sketch. Integer arithmetic matches the firmware.
+    """
+
+    MAX_RUN_MS = 60000
+
+    def __init__(self, port=None, baudrate=115200, timeout=1, clock=None):
+        super().__init__(port, baudrate, timeout, clock)
+        self._busy_until = 0.0
+        self.trains = []                 # (start, params) of every run
+        self.pulses_fired = 0
+        self.laser_on_ms = 0
+
+    @staticmethod
+    def _to_int(text):
+        """Arduino ``String.toInt()``: leading integer, 0 when none."""
+        m = re.match(r"\s*([-+]?\d+)", text)
+        return int(m.group(1)) if m else 0
+
+    def _parse(self, cmd):
+        fields = cmd[2:].split(",")
+        if len(fields) < 4:
+            return None
+        intensity = self._to_int(fields[0]) & 0xFF
+        pulse_seconds = self._to_int(fields[1]) & 0xFFFF
+        frequency = self._to_int(fields[2]) & 0xFFFF
+        on_time = self._to_int(",".join(fields[3:])) & 0xFFFF
+        if not (pulse_seconds and frequency and on_time):
+            return None
+        period = 1000 // frequency
+        on_time = min(on_time, period)
+        return intensity, pulse_seconds, frequency, on_time, period
+
+    def handle_line(self, line, t):
+        t = max(t, self._busy_until)
+        if line == "TEST":
+            self.emit("OK", t)
+            return
+        if not line or line[0] != "R":
+            return
+
+        params = self._parse(line)
+        if params is None:
+            self.emit("ERR", t)
+            return
+        intensity, pulse_seconds, frequency, on_time, period = params
+        self.emit(f"I={intensity}  T={pulse_seconds}s  f={frequency}Hz  tOn={on_time}ms", t)
+        self.emit("ACK", t)
+        self.trains.append((t, params))
+
+        req_ms = pulse_seconds * 1000
+        remaining = req_ms
+        while remaining > 0:
+            segment = min(remaining, self.MAX_RUN_MS)
+            pulses = segment // period if period else 0
+            t += pulses * period / 1000.0
+            self.pulses_fired += pulses
+            self.laser_on_ms += pulses * on_time
+            remaining -= segment
+            if remaining > 0:
+                self.emit(f"PROGRESS: {(req_ms - remaining) * 100 // req_ms}%", t)
+        self.emit("DONE", t)
+        self._busy_until = t
@@ -0,0 +1,86 @@
+# src/telemetry.py
+
+"""
+Write-behind run telemetry.
+
+The run engine records one row per step (move issued, move done, settle
+done, ACK, DONE, errors) with ``TelemetryWriter.record``, which only appends
+to an in-memory buffer. A background thread flushes the buffer into the
+``run_events`` table with one ``executemany`` per batch, every
+``batch_size`` events or ``flush_ms`` milliseconds, whichever comes first,
+so the device loop never waits on a commit.
+"""
+
+import threading
+import time
+from collections import deque
+from src.log_bus import get_logger
+
+log = get_logger("telemetry")
+
+# run_events.event values
+MOVE_ISSUED = "move_issued"
+MOVE_DONE = "move_done"
+SETTLE_DONE = "settle_done"
+ACK = "ack"
+DONE = "done"
+ERROR = "error"
+ABORTED = "aborted"
+RUN_START = "run_start"
+RUN_END = "run_end"
+
+
+class TelemetryWriter:
+    def __init__(self, data_controller, batch_size=100, flush_ms=500, clock=time):
+        self.data_controller = data_controller
+        self.batch_size = batch_size
+        self.flush_ms = flush_ms
+        self.clock = clock
+        self._buffer = deque()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._flush_lock = threading.Lock()
+        self.written = 0                 # rows committed so far
+        self.batches = 0
+        self._thread = threading.Thread(target=self._flush_loop, name="telemetry-writer",
+                                        daemon=True)
+        self._thread.start()
+
+    def record(self, work_id, event, point_index=None, value=None, message="", rig=None,
+               timestamp=None):
+        """Queue one event; never blocks on the database."""
+        if timestamp is None:
+            timestamp = self.clock.time()
+        self._buffer.append((work_id, rig, point_index, event, timestamp, value, message))
+        if len(self._buffer) >= self.batch_size:
+            self._wake.set()
+
+    def flush(self):
+        """Write everything buffered so far, on the calling thread."""
+        with self._flush_lock:
+            rows = []
+            while self._buffer:
+                rows.append(self._buffer.popleft())
+            if not rows:
+                return 0
+            try:
+                self.data_controller.add_run_events(rows)
+            except Exception as e:
+                log.warning(f"Telemetry flush failed, {len(rows)} event(s) dropped: {e}")
+                return 0
+            self.written += len(rows)
+            self.batches += 1
+            return len(rows)
+
+    def _flush_loop(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_ms / 1000)
+            self._wake.clear()
+            self.flush()
+
+    def close(self):
+        """Stop the flusher and write what is left."""
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout=5)
+        self.flush()
@@ -0,0 +1,81 @@
+# src/waveform.py
+
+"""
+Pulse-train waveforms for (intensity, pulse_duration, frequency, window).
+
+A recipe's light output is a square wave: ``intensity`` for
+``pulse_duration`` ms at the start of every ``1000 / frequency`` ms period.
+Rather than sampling it on a fixed grid (which misses pulses narrower than
+the grid step), ``pulse_edges`` computes the exact on/off times and
+``pulse_signal`` turns them into step-plot vertices. Both are vectorised
+and memoised, so redrawing for a spin-box change is a cache lookup. The
+returned arrays are shared between callers and read-only.
+"""
+
+from functools import lru_cache
+import math
+import numpy as np
+
+WINDOW_MS = 2000.0   # time span the recipe plots show
+
+
+def _check(pulse_duration_ms, frequency_hz):
+    if frequency_hz <= 0:
+        raise ValueError("frequency must be positive")
+    if pulse_duration_ms < 0:
+        raise ValueError("pulse duration must not be negative")
+
+
+def _frozen(*arrays):
+    for array in arrays:
+        array.setflags(write=False)
+    return arrays
+
+
+@lru_cache(maxsize=256)
+def pulse_edges(pulse_duration_ms, frequency_hz, window_ms=WINDOW_MS):
+    """
+    ``(starts, ends)`` in ms of the pulses within ``[0, window_ms)``.
+
+    A pulse no shorter than the period merges with the next one, so a
+    continuous output is a single pulse over the whole window.
+    """
+    _check(pulse_duration_ms, frequency_hz)
+    period = 1000.0 / frequency_hz
+    on = min(pulse_duration_ms, period)
+    if on == 0:
+        starts = ends = np.empty(0)
+    elif on >= period:
+        starts, ends = np.array([0.0]), np.array([float(window_ms)])
+    else:
+        starts = np.arange(math.ceil(window_ms / period)) * period
+        starts = starts[starts < window_ms]
+        ends = np.minimum(starts + on, window_ms)
+    return _frozen(starts, ends)
+
+
+@lru_cache(maxsize=256)
+def pulse_signal(intensity, pulse_duration_ms, frequency_hz, window_ms=WINDOW_MS):
+    """
+    ``(t, y)`` vertices of the pulse train over ``[0, window_ms]`` with
+    vertical edges at the exact pulse starts and ends; plot them as a line.
+    """
+    starts, ends = pulse_edges(pulse_duration_ms, frequency_hz, window_ms)
+    t = np.column_stack((starts, starts, ends, ends)).ravel()
+    y = np.tile([0.0, intensity, intensity, 0.0], len(starts))
+    t = np.concatenate(([0.0], t, [float(window_ms)]))
+    y = np.concatenate(([0.0], y, [0.0]))
+    return _frozen(t, y)
+
+
+def sample(intensity, pulse_duration_ms, frequency_hz, t_ms):
+    """Light output at the times ``t_ms`` (scalar or array, ms)."""
+    _check(pulse_duration_ms, frequency_hz)
+    period = 1000.0 / frequency_hz
+    on = np.mod(t_ms, period) < min(pulse_duration_ms, period)
+    return np.where(on, float(intensity), 0.0)
+
+
+def is_on(t_ms, pulse_duration_ms, frequency_hz):
+    """Whether the light is on ``t_ms`` into the pulse train."""
+    return bool(sample(1.0, pulse_duration_ms, frequency_hz, t_ms))
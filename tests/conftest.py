@@ -0,0 +1,49 @@
+# tests/conftest.py
+
+from functools import partial
+
+import pytest
+from src.arduino_controller import ArduinoController
+from src.gcode_printer_controller import GCodePrinterController
+from src.rig_registry import Rig
+from src.settle import SettlePolicy
+from src.simulators import LaserArduinoSimulator, MarlinSimulator, VirtualClock
+
+
+def simulated_printer(clock):
+    return GCodePrinterController(
+        "sim", reset_delay=0, serial_factory=partial(MarlinSimulator, clock=clock))
+
+
+def simulated_arduino(clock):
+    return ArduinoController(
+        "sim", reset_delay=0, serial_factory=partial(LaserArduinoSimulator, clock=clock))
+
+
+@pytest.fixture
+def clock():
+    return VirtualClock()
+
+
+@pytest.fixture
+def printer(clock):
+    controller = simulated_printer(clock)
+    yield controller
+    controller.close()
+
+
+@pytest.fixture
+def arduino(clock):
+    controller = simulated_arduino(clock)
+    yield controller
+    controller.close()
+
+
+@pytest.fixture
+def simulated_rig():
+    """Factory for a Rig on its own simulated devices and clock; the registry closes it."""
+    def make(name):
+        clock = VirtualClock()
+        return Rig(name, simulated_printer(clock), simulated_arduino(clock),
+                   settle=SettlePolicy(dwell_s=0.1), clock=clock)
+    return make
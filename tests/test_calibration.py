@@ -0,0 +1,41 @@
+# tests/test_calibration.py
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.calibration import fit_affine
+from src.coords import WELL_CENTERS_RAW
+
+
+def _machine(points):
+    # plate rotated by 0.5°, scaled by 1 % and shifted, in a swapped frame
+    a = np.deg2rad(0.5)
+    rot = 1.01 * np.array([[np.cos(a), -np.sin(a)], [np.sin(a), np.cos(a)]])
+    pts = np.asarray(points, dtype=float) @ rot.T + (2.5, -1.0)
+    return pts[:, ::-1]
+
+
+def test_three_points_fit_exactly_and_predict_other_points():
+    cal = fit_affine(WELL_CENTERS_RAW, _machine(WELL_CENTERS_RAW))
+    assert cal.rms_error == pytest.approx(0, abs=1e-9)
+    grid = np.random.default_rng(1).uniform(0, 120, size=(96, 2))
+    np.testing.assert_allclose(cal.apply(grid), _machine(grid), atol=1e-9)
+    np.testing.assert_allclose(cal.coord_system().raw_to_cnc_many(grid), _machine(grid), atol=1e-9)
+
+
+def test_overdetermined_fit_reports_residuals():
+    nominal = WELL_CENTERS_RAW + [(60.0, 60.0)]
+    measured = _machine(nominal)
+    measured[3] += (0.2, 0.0)
+    cal = fit_affine(nominal, measured)
+    assert cal.n_points == 4
+    assert 0 < cal.rms_error < cal.max_error < 0.2
+
+
+def test_rejects_too_few_or_collinear_points():
+    with pytest.raises(ValueError):
+        fit_affine(WELL_CENTERS_RAW[:2], _machine(WELL_CENTERS_RAW[:2]))
+    line = [(0, 0), (10, 10), (20, 20)]
+    with pytest.raises(ValueError):
+        fit_affine(line, _machine(line))
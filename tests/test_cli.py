@@ -0,0 +1,27 @@
+# tests/test_cli.py
+
+import subprocess
+import sys
+
+from src import cli
+from src.data_controller import DataController
+
+
+def test_works_lists_scheduled_works(tmp_path, capsys):
+    db_path = str(tmp_path / "cli.db")
+    controller = DataController(db_path)
+    controller.initialize_db()
+    recipe_id = controller.add_recipe("sweep-1", 50, 10, 20, 2)
+    controller.add_work("overnight", recipe_id, 30, "Scheduled", priority=3)
+    controller.close()
+
+    assert cli.main(["--db", db_path, "works", "--status", "Scheduled"]) == 0
+    out = capsys.readouterr().out
+    assert "overnight" in out and "sweep-1" in out
+
+
+def test_startup_imports_no_gui_libraries():
+    code = ("import sys, src.cli, src.run_engine, src.data_controller;"
+            "print(sorted({m.split('.')[0] for m in sys.modules} & {'PySide6', 'matplotlib'}))")
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "[]"
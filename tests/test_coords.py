@@ -0,0 +1,36 @@
+# tests/test_coords.py
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.coords import CoordSystem
+
+
+def test_batch_matches_single_point_conversions():
+    coords = CoordSystem(mag_factor=4)
+    pts = np.array([(84.93, 36.40), (27.03, 36.40), (51.46, 91.20)])
+    np.testing.assert_allclose(coords.raw_to_disp_many(pts),
+                               [coords.raw_to_disp(x, y) for x, y in pts])
+    np.testing.assert_allclose(coords.raw_to_cnc_many(pts),
+                               [coords.raw_to_cnc(x, y) for x, y in pts])
+    np.testing.assert_allclose(coords.disp_to_raw_many(coords.raw_to_disp_many(pts)), pts)
+
+
+def test_cross_frame_matrix_composes():
+    coords = CoordSystem(mag_factor=2)
+    np.testing.assert_allclose(coords.transform([(10, 20)], "disp", "cnc"), [(10 / 2, 20 / 2)])
+
+
+def test_affine_and_homography_cnc_transforms():
+    affine = [[1.01, 0.02, 3.0], [-0.01, 0.99, -2.0], [0, 0, 1]]
+    coords = CoordSystem(cnc_transform=np.array(affine))
+    pts = np.random.default_rng(0).uniform(0, 120, size=(1000, 2))
+    cnc = coords.raw_to_cnc_many(pts)
+    assert coords.raw_to_cnc(*pts[0]) == pytest.approx(tuple(cnc[0]))
+    np.testing.assert_allclose(coords.cnc_to_raw_many(cnc), pts)
+
+    homography = CoordSystem(cnc_transform=[[1, 0, 0], [0, 1, 0], [0.001, 0, 1]])
+    x, y = homography.raw_to_cnc(100, 50)
+    assert (x, y) == pytest.approx((100 / 1.1, 50 / 1.1))
+    np.testing.assert_allclose(homography.raw_to_cnc_many([(100, 50)]), [(x, y)])
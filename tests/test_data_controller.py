@@ -16,3 +16,176 @@ def test_add_and_get_recipe(db_controller):
     recipes = db_controller.get_all_recipes()
     assert len(recipes) == 1
     assert recipes[0][1] == "Test Recipe"
+
+
+def test_shared_instance_is_initialised_once(tmp_path):
+    path = str(tmp_path / "shared.db")
+    first = DataController.shared(path)
+    assert DataController.shared(path) is first
+    first.add_recipe("r", 50, 10, 20, 2)
+    assert len(DataController.shared(path).get_recipes()) == 1
+    first.close()
+
+
+def test_worker_threads_share_one_writer(tmp_path):
+    import threading
+
+    controller = DataController(str(tmp_path / "threads.db"))
+    controller.initialize_db()
+    recipe_id = controller.add_recipe("r", 50, 10, 20, 2)
+    work_ids = [controller.add_work(f"w{i}", recipe_id, 1, "Scheduled") for i in range(40)]
+    errors = []
+
+    def worker(ids):
+        try:
+            for work_id in ids:
+                controller.update_work_status(work_id, "In Progress")
+                assert controller.get_work_by_id(work_id)[4] == "In Progress"
+                controller.update_work_status(work_id, "Finished")
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(work_ids[i::4],)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    assert {w[4] for w in controller.get_works()} == {"Finished"}
+    controller.close()
+
+
+def test_reader_connections_close_when_their_thread_exits(tmp_path):
+    import gc
+    import threading
+
+    controller = DataController(str(tmp_path / "readers.db"), cache_size=0)
+    controller.initialize_db()
+    controller.add_recipe("r", 50, 10, 20, 2)
+    threads = [threading.Thread(target=controller.get_recipes) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    gc.collect()
+    assert len(controller._readers) == 0
+
+    controller.get_recipes()   # this thread's reader stays open until close()
+    assert len(controller._readers) == 1
+    controller.close()
+    assert len(controller._readers) == 0
+
+
+def test_read_cache_hits_and_invalidates_on_write(tmp_path):
+    controller = DataController(str(tmp_path / "cache.db"), version_check_s=0)
+    controller.initialize_db()
+    recipe_id = controller.add_recipe("r", 50, 10, 20, 2)
+    work_id = controller.add_work("w", recipe_id, 1, "Scheduled")
+
+    for _ in range(3):
+        controller.get_recipe_by_id(recipe_id)
+        controller.get_works("Scheduled")
+    stats = controller.cache_stats()
+    assert stats["hits"] >= 4
+
+    controller.update_work_status(work_id, "Finished")
+    assert controller.get_works("Scheduled") == []
+    assert controller.get_work_by_id(work_id)[4] == "Finished"
+
+    # A commit from another connection (e.g. the scheduler process) clears it
+    other = DataController(str(tmp_path / "cache.db"))
+    other.update_work_status(work_id, "Scheduled")
+    other.close()
+    assert controller.get_work_by_id(work_id)[4] == "Scheduled"
+    assert [w[0] for w in controller.get_works("Scheduled")] == [work_id]
+    controller.close()
+
+
+def test_cache_hits_do_not_wait_for_a_write_in_progress(tmp_path):
+    import threading
+
+    controller = DataController(str(tmp_path / "busy.db"), version_check_s=0)
+    controller.initialize_db()
+    recipe_id = controller.add_recipe("r", 50, 10, 20, 2)
+    controller.get_recipe_by_id(recipe_id)
+
+    holding, release = threading.Event(), threading.Event()
+
+    def long_write():
+        with controller._writing():
+            holding.set()
+            release.wait(5)
+
+    writer = threading.Thread(target=long_write)
+    writer.start()
+    holding.wait(5)
+    result = []
+    reader = threading.Thread(target=lambda: result.append(controller.get_recipe_by_id(recipe_id)))
+    reader.start()
+    reader.join(1)
+    finished = not reader.is_alive()
+    release.set()
+    writer.join()
+    reader.join()
+    controller.close()
+    assert finished and result[0][1] == "r"
+
+
+def test_lookup_miss_is_not_cached(db_controller):
+    assert db_controller.get_recipe_by_id(1) is None
+    assert db_controller.get_work_by_id(1) is None
+    recipe_id = db_controller.add_recipe("r", 50, 10, 20, 2)
+    work_id = db_controller.add_work("w", recipe_id, 1, "Scheduled")
+    assert (recipe_id, work_id) == (1, 1)
+    assert db_controller.get_recipe_by_id(1)[1] == "r"
+    assert db_controller.get_work_by_id(1)[1] == "w"
+
+
+def test_read_cache_evicts_least_recently_used():
+    from src.data_controller import ReadCache
+
+    cache = ReadCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is ReadCache.MISSING
+    assert (cache.hits, cache.misses) == (1, 1)
+    # A result queried before an invalidation is not cached
+    generation = cache.generation
+    cache.invalidate("a")
+    cache.put("a", 0, generation)
+    assert cache.get("a") is ReadCache.MISSING
+
+
+def test_works_page_walks_history_newest_first(db_controller):
+    recipe_id = db_controller.add_recipe("r", 50, 10, 20, 2)
+    ids = [db_controller.add_work(f"w{i}", recipe_id, 1, "Finished") for i in range(25)]
+    first = db_controller.get_works_page(limit=10)
+    assert [w[0] for w in first] == ids[::-1][:10]
+    assert first[0][6] == "r"
+    pages = [first]
+    while len(pages[-1]) == 10:
+        pages.append(db_controller.get_works_page(before_id=pages[-1][-1][0], limit=10))
+    assert [w[0] for page in pages for w in page] == ids[::-1]
+
+
+def test_search_recipes_by_prefix_and_ranges_in_pages(db_controller):
+    for i in range(30):
+        db_controller.add_recipe(f"{'Sweep' if i % 2 else 'ramp'}-{i:02d}", i * 10, 10, i % 5 + 1, 2)
+
+    page = db_controller.search_recipes("sw", limit=10)
+    assert [r[1] for r in page] == [f"Sweep-{i:02d}" for i in range(1, 21, 2)]
+    rest = db_controller.search_recipes("sw", after=(page[-1][1], page[-1][0]), limit=10)
+    assert [r[1] for r in rest] == [f"Sweep-{i:02d}" for i in range(21, 30, 2)]
+
+    ranges = {"intensity": (100, 200), "frequency": (None, 2)}
+    found = db_controller.search_recipes(ranges=ranges)
+    assert {r[1] for r in found} == {"ramp-10", "Sweep-11", "Sweep-15", "ramp-16", "ramp-20"}
+    assert db_controller.count_recipes(ranges=ranges) == 5
+    assert db_controller.count_recipes("RAMP") == 15
+
+    db_controller.add_recipe("Sweep-99", 150, 10, 1, 2)
+    assert db_controller.count_recipes(ranges=ranges) == 6
+    with pytest.raises(ValueError):
+        db_controller.search_recipes(ranges={"name": (1, 2)})
@@ -0,0 +1,94 @@
+# tests/test_device_controller.py
+
+from functools import partial
+import time
+
+import pytest
+from src.gcode_printer_controller import GCodePrinterController
+from src.simulators import MarlinSimulator
+
+
+def test_send_program_waits_for_every_ack(printer):
+    sim = printer.ser
+    sent = printer.send_program(["G90", "; comment", "", "G1 X1 Y1 F700", "G1 X2 Y2 F700"])
+    assert sent == 3
+    assert sim.received == ["G90", "G1 X1 Y1 F700", "G1 X2 Y2 F700"]
+    assert sim._unacked == 0
+    assert not printer._pending
+
+
+def test_send_program_respects_outstanding_limit(printer):
+    printer.send_program([f"G1 X{i} Y0" for i in range(20)])
+    assert printer.ser.max_unacked == printer.max_outstanding
+
+
+class ChecksumErrorSimulator(MarlinSimulator):
+    def handle_line(self, line, t):
+        if line == "BAD":
+            self.emit("Error:checksum mismatch, Last Line: 0", t)
+            self.emit("Resend: 1", t)
+        super().handle_line(line, t)
+
+
+def test_error_reply_keeps_its_line_in_flight_until_ok(clock):
+    printer = GCodePrinterController(
+        "sim", reset_delay=0, serial_factory=partial(ChecksumErrorSimulator, clock=clock))
+    with pytest.raises(Exception, match="checksum"):
+        printer.send_program(["BAD", "G1 X1 Y1 F700"])
+    assert len(printer._pending) == 2
+    # The ok that follows the error releases BAD, not a later line
+    assert printer.send_program(["G1 X2 Y2 F700"]) == 1
+    assert not printer._pending and printer.ser._unacked == 0
+    printer.close()
+
+
+def test_move_completion_waits_for_motion(printer, clock):
+    printer.init_printer()
+    start = clock.time()
+    printer.move_to(50, 50)
+    assert clock.time() - start == pytest.approx(printer.estimate_move_time(50, 50, start=(0, 0)))
+    assert printer.last_position.startswith("X:50.00 Y:50.00")
+    assert "Count X:50.00 Y:50.00" in printer.last_position
+
+
+def test_move_path_syncs_only_where_requested(printer):
+    sim = printer.ser
+    synced = []
+    printer.move_path([(0, 0), (1, 0), (2, 0)], dwell_ms=50, sync_at=[1],
+                      on_sync=lambda i, p: synced.append((i, list(sim.received))))
+    assert synced == [(1, ["G1 X0 Y0 F700", "G4 P50", "G1 X1 Y0 F700", "G4 P50", "M400"])]
+    assert sim.received[-2:] == ["G1 X2 Y0 F700", "G4 P50"]
+
+
+def test_move_path_rejects_mismatched_dwells_before_sending(printer):
+    with pytest.raises(ValueError):
+        printer.move_path([(1, 1), (2, 2)], dwell_ms=[100])
+    assert printer.ser.received == []
+
+
+def test_recipe_handshake_keeps_every_line(arduino, clock):
+    assert arduino.test_connection()
+    assert arduino.send_recipe_command(1, 90, 10, 20)
+    lines = []
+    while not arduino.events.empty():
+        lines.append(arduino.events.get_nowait().line)
+    assert lines == ["OK", "I=1  T=90s  f=10Hz  tOn=20ms", "ACK",
+                     "PROGRESS: 66%", "DONE"]
+    assert clock.time() == pytest.approx(90)
+    assert arduino.ser.pulses_fired == 900
+
+
+def test_bad_recipe_line_is_answered_with_err(arduino):
+    err = arduino.subscribe("ERR")
+    arduino.ser.write(b"R,1,0,10,20\n")
+    assert err.result(timeout=2).line == "ERR"
+
+
+def test_await_response_finds_a_reply_that_arrived_first(arduino):
+    arduino.ser.write(b"TEST\n")
+    deadline = time.time() + 2
+    while arduino.events.empty() and time.time() < deadline:
+        time.sleep(0.01)
+    assert arduino.await_response("OK", timeout=2) == "OK"
+    # Each line is returned once
+    assert arduino.await_response("OK", timeout=0.1) is None
@@ -0,0 +1,69 @@
+# tests/test_dosimetry.py
+
+import math
+
+import numpy as np
+import pytest
+from src.dosimetry import compute_dose, recipe_doses, work_dose, describe
+
+
+def firmware_pulses(seconds, frequency_hz, pulse_ms):
+    """executeRecipe() of laser_control.ino, one segment at a time."""
+    period = 1000 // frequency_hz
+    remaining, pulses, on_ms = seconds * 1000, 0, 0
+    while remaining > 0:
+        segment = min(remaining, 60000)
+        pulses += segment // period
+        on_ms += (segment // period) * min(pulse_ms, period)
+        remaining -= segment
+    return pulses, on_ms
+
+
+RECIPES = [
+    # intensity, pulse_ms, frequency_hz, spot_mm, seconds
+    (50, 100, 1, 1.0, 60),
+    (10, 3, 7, 0.5, 61),        # 142 ms period: segments of 60 s and 1 s truncate separately
+    (255, 1, 1000, 2.0, 125),
+    (12.5, 2.5, 2.5, 1.5, 90.5),  # rounds half to even like round()
+    (80, 333, 3, 1.0, 3600),
+    (50, 400, 3, 1.0, 60),       # pulse longer than the period: refused
+    (50, 10, 0.4, 1.0, 60),      # rounds to 0 Hz: refused
+]
+
+
+def test_matches_host_rounding_and_firmware_truncation(arduino):
+    columns = np.array(RECIPES, dtype=float).T
+    dose = compute_dose(*columns)
+    for i, (intensity, pulse, freq, spot, seconds) in enumerate(RECIPES):
+        try:
+            cmd = arduino.prepare_recipe(intensity, seconds, freq, pulse)
+        except ValueError:
+            assert not dose.valid[i] and dose.pulses[i] == 0 and dose.energy_mj[i] == 0
+            continue
+        assert dose.valid[i]
+        pulses, on_ms = firmware_pulses(cmd.sequence_seconds, cmd.frequency_hz, cmd.pulse_duration_ms)
+        assert dose.pulses[i] == pulses
+        assert dose.on_time_s[i] == pytest.approx(on_ms / 1000)
+        assert dose.energy_mj[i] == pytest.approx(
+            cmd.intensity * on_ms / 1000 * math.pi * spot ** 2)
+
+
+def test_duty_cycle_uses_the_integer_period():
+    dose = compute_dose(10, 3, 7, 1.0, 61)
+    assert dose.period_ms == 142 and dose.duty_cycle == pytest.approx(3 / 142)
+    # 422 pulses in the first minute, 7 in the last second, not int(61 * 7) = 427
+    assert dose.pulses == 429
+    assert dose.train_s == pytest.approx(429 * 0.142)
+
+
+def test_library_batch_agrees_with_single_works():
+    recipes = [(i + 1, f"r{i}", *r[:4]) for i, r in enumerate(RECIPES)]
+    doses = recipe_doses(recipes, 61)
+    assert doses.pulses.shape == (len(recipes),)
+    for i, recipe in enumerate(recipes):
+        work = (1, "w", recipe[0], 61, "Scheduled", 0, recipe[1])
+        single = work_dose(work, recipe)
+        assert doses[i].pulses == single.pulses
+        assert describe(doses[i], n_wells=24) == describe(single, n_wells=24)
+    assert recipe_doses([], 60).pulses.shape == (0,)
+    assert "rejected" in describe(doses[5])
@@ -0,0 +1,28 @@
+# tests/test_kinematics.py
+
+import pytest
+from src.kinematics import MotionLimits, trapezoid_time
+
+
+def test_trapezoid_reaches_cruise_speed_on_long_moves():
+    # 10 mm/s cruise, 100 mm/s²: 0.1 s ramps, 1 mm each way
+    assert trapezoid_time(10, 10, 100) == pytest.approx(1.1)
+
+
+def test_triangle_profile_on_short_moves():
+    assert trapezoid_time(0.25, 10, 100) == pytest.approx(0.1)
+
+
+def test_axis_limits_clip_feedrate_and_acceleration():
+    limits = MotionLimits(feedrate=6000, acceleration=1000,
+                          max_feedrate={"X": 20, "Y": 50}, max_acceleration={"X": 100, "Y": 500})
+    distance, v_max, accel = limits.move_profile((0, 0), (100, 0))
+    assert (distance, v_max, accel) == (100, 20, 100)
+    assert limits.move_time((0, 0), (100, 0)) == pytest.approx(100 / 20 + 20 / 100)
+
+
+def test_path_time_adds_dwell_per_stop():
+    limits = MotionLimits()
+    points = [(10, 0), (10, 10)]
+    expected = (limits.move_time((0, 0), (10, 0)) + limits.move_time((10, 0), (10, 10)) + 2 * 0.5)
+    assert limits.path_time(points, start=(0, 0), dwell_s=0.5) == pytest.approx(expected)
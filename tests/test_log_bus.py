@@ -0,0 +1,48 @@
+# tests/test_log_bus.py
+
+import logging
+import threading
+import pytest
+from src.log_bus import LogBus, get_logger
+
+@pytest.fixture
+def bus():
+    bus = LogBus(capacity=100)
+    logger = get_logger("test")
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(bus)
+    yield bus
+    logger.removeHandler(bus)
+
+
+def test_readers_get_only_new_records_at_their_level(bus):
+    log = get_logger("test")
+    log.debug("serial chatter")
+    log.info("moved")
+    seq, lines, dropped = bus.since(0, logging.INFO)
+    assert [line.split(" ", 2)[2].strip() for line in lines] == ["moved"]
+    assert dropped == 0
+
+    log.error("failed")
+    seq, lines, _ = bus.since(seq)
+    assert len(lines) == 1 and lines[0].endswith("failed")
+    assert bus.since(seq) == (seq, [], 0)
+
+
+def test_ring_buffer_is_bounded_under_concurrent_logging(bus):
+    log = get_logger("test")
+
+    def spam(n):
+        for i in range(500):
+            log.debug(f"thread {n} line {i}")
+
+    threads = [threading.Thread(target=spam, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    seq, lines, dropped = bus.since(0)
+    assert seq == bus.last_seq == 2000
+    assert len(lines) == bus.capacity == 100
+    assert dropped == 1900
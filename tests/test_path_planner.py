@@ -0,0 +1,40 @@
+# tests/test_path_planner.py
+
+import itertools
+import random
+
+import pytest
+from src.coords import CoordSystem
+from src.kinematics import MotionLimits
+from src.path_planner import order_points, plan_route
+
+
+def test_orders_collinear_points_by_position():
+    move = MotionLimits().move_time
+    plan = order_points([(30, 0), (10, 0), (20, 0)], start=(0, 0))
+    assert plan.order == [1, 2, 0]
+    assert plan.travel_time == pytest.approx(3 * move((0, 0), (10, 0)))
+    assert plan.baseline_time == pytest.approx(move((0, 0), (30, 0)) + move((30, 0), (10, 0))
+                                               + move((10, 0), (20, 0)))
+
+
+def test_matches_brute_force_on_small_sets():
+    rng = random.Random(3)
+    cost = MotionLimits().move_time
+    for _ in range(20):
+        points = [(rng.uniform(0, 120), rng.uniform(0, 120)) for _ in range(6)]
+        best = min(
+            sum(cost(a, b) for a, b in zip(((0, 0),) + perm, perm))
+            for perm in itertools.permutations(points)
+        )
+        plan = order_points(points, start=(0, 0))
+        assert plan.travel_time <= best * 1.10
+        assert plan.saving >= 0
+
+
+def test_plan_route_converts_raw_points():
+    coords = CoordSystem()
+    plan = plan_route([(84.93, 36.40), (27.03, 36.40), (51.46, 91.20)], coords,
+                      start_cnc=(0, 0))
+    assert sorted(plan.order) == [0, 1, 2]
+    assert plan.points[0] == coords.raw_to_cnc(27.03, 36.40)
@@ -0,0 +1,49 @@
+# tests/test_rig_registry.py
+
+import pytest
+from src.data_controller import DataController
+from src.rig_registry import RigRegistry
+
+
+@pytest.fixture
+def db():
+    controller = DataController(":memory:")
+    controller.initialize_db()
+    yield controller
+    controller.close()
+
+
+@pytest.fixture
+def registry(simulated_rig):
+    registry = RigRegistry(log=lambda message: None)
+    registry.add(simulated_rig("A"))
+    registry.add(simulated_rig("B"))
+    yield registry
+    registry.close()
+
+
+def test_scheduled_works_are_spread_over_idle_rigs(registry, db):
+    recipe_id = db.add_recipe("r", 50, 10, 20, 2)
+    work_ids = [db.add_work(f"w{i}", recipe_id, 1, "Scheduled") for i in range(3)]
+
+    started = registry.dispatch(db)
+    assert started == [("A", work_ids[0]), ("B", work_ids[1])]
+    assert db.get_work_by_id(work_ids[0])[4] == "In Progress"
+
+    registry.wait_all(30)
+    assert registry.dispatch(db) == [("A", work_ids[2])]
+    registry.wait_all(30)
+    registry.collect(db)
+    assert [db.get_work_by_id(w)[4] for w in work_ids] == ["Finished"] * 3
+    assert not registry.is_busy()
+
+
+def test_failed_work_is_not_retried(registry, db):
+    recipe_id = db.add_recipe("too long", 50, 500, 20, 2)      # pulse > period
+    work_id = db.add_work("w", recipe_id, 1, "Scheduled")
+
+    registry.dispatch(db)
+    registry.wait_all(30)
+    assert registry.dispatch(db) == []
+    assert db.get_work_by_id(work_id)[4] == "Scheduled"
+    assert work_id in registry.skipped
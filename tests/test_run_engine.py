@@ -0,0 +1,104 @@
+# tests/test_run_engine.py
+
+import pytest
+from src.run_engine import RunEngine, RunJob, RunState
+from src.settle import SettlePolicy
+
+RECIPE = (1, "test", 50, 10, 20, 2)       # id, name, intensity, pulse ms, Hz, spot
+
+
+@pytest.fixture
+def engine(printer, arduino, clock):
+    return RunEngine(printer, arduino, settle=SettlePolicy(dwell_s=0.5), clock=clock)
+
+
+def test_run_visits_every_point_in_order(engine):
+    events = []
+    engine.add_listener(events.append)
+    job = RunJob(work_id=7, recipe=RECIPE, duration=2, points=[(10, 10), (20, 10)], home=True)
+
+    assert engine.run(job)
+    states = [e.state for e in events]
+    assert states == [RunState.HOMING,
+                      RunState.MOVING, RunState.SETTLING, RunState.STIMULATING,
+                      RunState.MOVING, RunState.SETTLING, RunState.STIMULATING,
+                      RunState.DONE]
+    assert len(engine.arduino.ser.trains) == 2
+    # move_to already confirmed the position, so only the dwell is paid
+    assert engine.settle_times == [pytest.approx(0.5), pytest.approx(0.5)]
+    assert len(engine.overlap_saved) == 2 and min(engine.overlap_saved) > 0
+    assert engine.overlap_saved_total == pytest.approx(
+        engine.prepare_s + sum(engine.overlap_saved))
+    remaining = [e.remaining for e in events]
+    assert remaining == sorted(remaining, reverse=True)
+    assert remaining[-1] == 0
+
+
+def test_abort_stops_before_the_next_point(engine):
+    events = []
+
+    def abort_after_first_train(event):
+        events.append(event)
+        if event.state == RunState.MOVING and event.point_index == 1:
+            engine.abort()
+
+    engine.add_listener(abort_after_first_train)
+    job = RunJob(work_id=7, recipe=RECIPE, duration=1, points=[(10, 10), (20, 10), (30, 10)])
+
+    assert not engine.run(job)
+    assert events[-1].state == RunState.ABORTED
+    assert len(engine.arduino.ser.trains) == 1
+
+
+def test_invalid_recipe_fails_before_any_motion(engine):
+    job = RunJob(work_id=7, recipe=(1, "bad", 50, 500, 20, 2), duration=1, points=[(10, 10)])
+    assert not engine.run(job)
+    assert engine.state == RunState.FAILED
+    assert engine.printer.ser.received == []
+
+
+def test_recipe_is_staged_while_the_gantry_travels(engine):
+    staged_at = []
+    stage = engine.arduino.stage_recipe
+
+    def spy(recipe):
+        staged_at.append(list(engine.printer.ser.received))
+        return stage(recipe)
+
+    engine.arduino.stage_recipe = spy
+    job = RunJob(work_id=7, recipe=RECIPE, duration=1, points=[(60, 0)])
+    assert engine.run(job)
+    # G1 already queued, M400 not yet sent
+    assert staged_at == [["G1 X60 Y0 F700"]]
+
+
+def test_settle_waits_for_motion_still_in_progress(engine):
+    printer, clock = engine.printer, engine.clock
+    printer.init_printer()
+    printer.send_program(["G1 X40 Y0 F700"])        # queued, not yet finished
+    used = SettlePolicy(dwell_s=0.1).settle(printer, (40, 0), clock)
+    assert printer.reported_position() == (40.0, 0.0)
+    assert used == pytest.approx(printer.estimate_move_time(40, 0, start=(0, 0)) + 0.1, abs=0.05)
+
+
+def test_run_steps_are_recorded_as_telemetry(engine):
+    from src.data_controller import DataController
+    from src.telemetry import TelemetryWriter
+
+    db = DataController(":memory:")
+    db.initialize_db()
+    telemetry = TelemetryWriter(db, batch_size=1000, flush_ms=60_000)
+    engine.telemetry, engine.name = telemetry, "A"
+    engine.run(RunJob(work_id=7, recipe=RECIPE, duration=1, points=[(10, 10), (20, 10)]))
+    assert db.get_run_events(7) == []            # nothing written from the run loop
+    telemetry.close()
+
+    rows = db.get_run_events(7)
+    assert [r[4] for r in rows] == (["run_start"]
+                                    + ["move_issued", "move_done", "settle_done", "ack", "done"] * 2
+                                    + ["run_end"])
+    assert telemetry.batches == 1
+    assert {r[2] for r in rows} == {"A"}
+    settle = [r for r in rows if r[4] == "settle_done"]
+    assert settle[0][6] == pytest.approx(engine.settle_times[0])
+    db.close()
@@ -0,0 +1,56 @@
+# tests/test_scheduler.py
+
+import sqlite3
+
+import pytest
+from src.data_controller import DataController
+from src.rig_registry import RigRegistry
+from src.scheduler import Scheduler
+
+
+@pytest.fixture
+def db():
+    controller = DataController(":memory:")
+    controller.initialize_db()
+    yield controller
+    controller.close()
+
+
+def test_claim_order_is_priority_then_fifo(db):
+    recipe_id = db.add_recipe("r", 50, 10, 20, 2)
+    low = db.add_work("low", recipe_id, 1, "Scheduled")
+    high = db.add_work("high", recipe_id, 1, "Scheduled", priority=5)
+    low2 = db.add_work("low2", recipe_id, 1, "Scheduled")
+
+    claimed = [db.claim_next_work()[0] for _ in range(3)]
+    assert claimed == [high, low, low2]
+    assert db.claim_next_work() is None
+    assert db.get_work_by_id(high)[4] == "In Progress"
+
+
+def test_old_database_gains_priority_column(tmp_path):
+    path = str(tmp_path / "old.db")
+    old = sqlite3.connect(path)
+    old.execute("CREATE TABLE works (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, "
+                "recipe_id INTEGER, duration INTEGER, status TEXT NOT NULL)")
+    old.execute("INSERT INTO works (name, recipe_id, duration, status) VALUES ('w', 1, 1, 'Scheduled')")
+    old.commit()
+    old.close()
+
+    controller = DataController(path)
+    controller.initialize_db()
+    assert controller.get_work_by_id(1)[5] == 0
+    controller.close()
+
+
+def test_scheduler_drains_the_queue(db, simulated_rig):
+    recipe_id = db.add_recipe("r", 50, 10, 20, 2)
+    work_ids = [db.add_work(f"w{i}", recipe_id, 1, "Scheduled") for i in range(3)]
+    rigs = RigRegistry(log=lambda message: None)
+    rigs.add(simulated_rig("A"))
+    rigs.add(simulated_rig("B"))
+    try:
+        Scheduler(db, rigs, poll_s=5, log=lambda message: None).run_forever(until_empty=True)
+    finally:
+        rigs.close()
+    assert [db.get_work_by_id(w)[4] for w in work_ids] == ["Finished"] * 3
@@ -0,0 +1,39 @@
+# tests/test_waveform.py
+
+import numpy as np
+import pytest
+from src.waveform import pulse_edges, pulse_signal, sample, is_on
+
+
+def test_narrow_pulses_keep_exact_edges():
+    # 0.5 ms pulses are narrower than the old 2 ms sample grid
+    starts, ends = pulse_edges(0.5, 3.0)
+    assert len(starts) == 6
+    np.testing.assert_allclose(starts, np.arange(6) * 1000 / 3)
+    np.testing.assert_allclose(ends - starts, 0.5)
+
+    t, y = pulse_signal(2.0, 0.5, 3.0)
+    assert (t[0], y[0], t[-1], y[-1]) == (0.0, 0.0, 2000.0, 0.0)
+    assert np.all(np.diff(t) >= 0)
+    assert y.max() == 2.0 and len(t) == 4 * 6 + 2
+
+
+def test_long_pulses_merge_and_clip_to_window():
+    starts, ends = pulse_edges(900, 0.5)      # 2000 ms period
+    assert list(zip(starts, ends)) == [(0.0, 900.0)]
+    starts, ends = pulse_edges(300, 5.0)      # on for longer than the 200 ms period
+    assert list(zip(starts, ends)) == [(0.0, 2000.0)]
+    starts, ends = pulse_edges(100, 0.6)      # second pulse starts at 1666.7 ms
+    assert ends[-1] == pytest.approx(1766.67, abs=0.01)
+
+
+def test_sample_agrees_with_edges_and_results_are_cached():
+    t = np.linspace(0, 1999, 5000)
+    starts, ends = pulse_edges(20, 7.0)
+    inside = ((t[:, None] >= starts) & (t[:, None] < ends)).any(axis=1)
+    np.testing.assert_array_equal(sample(3.0, 20, 7.0, t), np.where(inside, 3.0, 0.0))
+    assert is_on(5, 20, 7.0) and not is_on(25, 20, 7.0)
+
+    assert pulse_signal(1.0, 20, 7.0) is pulse_signal(1.0, 20, 7.0)
+    with pytest.raises(ValueError):
+        pulse_signal(1.0, 20, 0)
@@ -0,0 +1,70 @@
+# ui/components/AddRigDialog.py
+
+import serial.tools.list_ports
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit,
+    QComboBox, QPushButton, QMessageBox
+)
+
+class AddRigDialog(QDialog):
+    def __init__(self, main_controller, parent=None):
+        super().__init__(parent)
+        self.main_controller = main_controller
+        self.setWindowTitle("Add Rig")
+        self.setup_ui()
+
+    def setup_ui(self):
+        layout = QVBoxLayout()
+
+        # Rig Name
+        name_layout = QHBoxLayout()
+        self.name_input = QLineEdit(f"Rig {len(self.main_controller.rigs) + 1}")
+        name_layout.addWidget(QLabel("Name:"))
+        name_layout.addWidget(self.name_input)
+
+        # Port selection
+        gcode_layout = QHBoxLayout()
+        self.gcode_port_combo = QComboBox()
+        gcode_layout.addWidget(QLabel("G-code Port:"))
+        gcode_layout.addWidget(self.gcode_port_combo)
+
+        arduino_layout = QHBoxLayout()
+        self.arduino_port_combo = QComboBox()
+        arduino_layout.addWidget(QLabel("Arduino Port:"))
+        arduino_layout.addWidget(self.arduino_port_combo)
+
+        for port in serial.tools.list_ports.comports():
+            self.gcode_port_combo.addItem(port.device)
+            self.arduino_port_combo.addItem(port.device)
+
+        # Buttons
+        button_layout = QHBoxLayout()
+        add_button = QPushButton("Connect")
+        cancel_button = QPushButton("Cancel")
+        add_button.clicked.connect(self.add_rig)
+        cancel_button.clicked.connect(self.reject)
+        button_layout.addWidget(add_button)
+        button_layout.addWidget(cancel_button)
+
+        layout.addLayout(name_layout)
+        layout.addLayout(gcode_layout)
+        layout.addLayout(arduino_layout)
+        layout.addLayout(button_layout)
+        self.setLayout(layout)
+
+    def add_rig(self):
+        """Connect the selected ports as a new rig."""
+        name = self.name_input.text().strip()
+        gcode_port = self.gcode_port_combo.currentText()
+        arduino_port = self.arduino_port_combo.currentText()
+        if not name:
+            QMessageBox.warning(self, "Error", "Please enter a name for the rig.")
+            return
+        if not gcode_port or not arduino_port or gcode_port == arduino_port:
+            QMessageBox.warning(self, "Error", "Please select two different ports.")
+            return
+        try:
+            self.main_controller.add_rig(name, gcode_port, arduino_port)
+            self.accept()
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to add rig: {str(e)}")
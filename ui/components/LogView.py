@@ -0,0 +1,71 @@
+# ui/components/LogView.py
+
+import logging
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QPlainTextEdit
+from PySide6.QtCore import QTimer
+
+LEVELS = [("Debug", logging.DEBUG), ("Info", logging.INFO),
+          ("Warning", logging.WARNING), ("Error", logging.ERROR)]
+
+class LogView(QWidget):
+    """
+    Log window fed by a LogBus. A timer appends everything logged since the
+    last tick in one call; the document keeps at most ``max_lines`` lines.
+    """
+
+    def __init__(self, bus, max_lines=2000, interval_ms=100, level=logging.INFO, parent=None):
+        super().__init__(parent)
+        self.bus = bus
+        self.max_lines = max_lines
+        self.level = level
+        self._seq = 0
+
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        # Level filter
+        filter_layout = QHBoxLayout()
+        self.level_combo = QComboBox()
+        for name, value in LEVELS:
+            self.level_combo.addItem(name, value)
+        self.level_combo.setCurrentIndex(self.level_combo.findData(level))
+        self.level_combo.currentIndexChanged.connect(
+            lambda index: self.set_level(self.level_combo.itemData(index)))
+        filter_layout.addWidget(QLabel("Log level:"))
+        filter_layout.addWidget(self.level_combo)
+        filter_layout.addStretch()
+
+        self.text = QPlainTextEdit()
+        self.text.setReadOnly(True)
+        self.text.setMaximumBlockCount(max_lines)
+        self.text.setStyleSheet("""
+            QPlainTextEdit {
+                background-color: #1e1e1e;
+                color: #d4d4d4;
+                font-family: Monaco, monospace;
+                font-size: 12px;
+            }
+        """)
+
+        layout.addLayout(filter_layout)
+        layout.addWidget(self.text)
+        self.setLayout(layout)
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.flush)
+        self.timer.start(interval_ms)
+
+    def flush(self):
+        """Append the records logged since the last flush."""
+        self._seq, lines, dropped = self.bus.since(self._seq, self.level)
+        if dropped:
+            lines.insert(0, f"… {dropped} log record(s) dropped (buffer full)")
+        if lines:
+            self.text.appendPlainText("\n".join(lines[-self.max_lines:]))
+
+    def set_level(self, level):
+        """Show only records at ``level`` or above, re-reading the buffer."""
+        self.level = level
+        self._seq, lines, _ = self.bus.since(0, level)
+        self.text.setPlainText("\n".join(lines[-self.max_lines:]))
+        self.text.moveCursor(self.text.textCursor().MoveOperation.End)
@@ -9,10 +9,10 @@ from PySide6.QtWidgets import (
     QSpinBox,
     QMessageBox
 )
-from PySide6.QtCore import QTimer
+from ui.components.SpotAnimation import SpotAnimation
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 import matplotlib.pyplot as plt
-import numpy as np
+from src.waveform import WINDOW_MS, pulse_signal, is_on
 from src.data_controller import DataController
 
 
@@ -22,18 +22,13 @@ class NewRecipeDialog(QDialog):
         self.setWindowTitle("New Recipe")
         self.setFixedSize(600, 800)  # Adjusted size to accommodate plots
 
-        self.data_controller = DataController()
+        self.data_controller = DataController.shared()
         self.setup_ui()
 
-        # Initialize spot_circle
+        # Initialize spot_circle; it blinks only while the dialog is open
         self.spot_circle = None
-
-        # Initialize animation variables
-        self.animation_timer = QTimer()
-        self.animation_timer.timeout.connect(self.update_spot_animation)
-        self.animation_interval = 50  # milliseconds
-        self.animation_timer.start(self.animation_interval)
-        self.animation_time = 0
+        self.signal_line = None
+        self.spot_animation = SpotAnimation(self.canvas_spot, self.spot_alpha, parent=self)
 
         # Initial plot
         self.update_plot()
@@ -146,34 +141,21 @@ class NewRecipeDialog(QDialog):
         if frequency == 0:
             frequency = 0.1
 
-        # Reset animation time
-        self.animation_time = 0
-
-        # Clear the axes before plotting new data
-        self.ax_signal.cla()
-        self.ax_spot.cla()
-
-        # Plotting the Intensity-Time Signal
-
-        # Generate signal based on frequency and duration
-        time_end = 2000  # ms
-        time = np.linspace(0, time_end, 1000)
-        pulse_interval = 1000 / frequency  # ms per cycle
-        signal = np.zeros_like(time)
-
-        for i, t in enumerate(time):
-            if (t % pulse_interval) < pulse_duration:
-                signal[i] = intensity
-
-        # Plot signal
-        self.ax_signal.plot(time, signal, label="Light Intensity", color='blue')
-        self.ax_signal.set_xlabel("Time (ms)")
-        self.ax_signal.set_ylabel("Intensity (mW/mm²)")
+        # Plotting the Intensity-Time Signal: exact pulse edges from the
+        # shared, cached waveform; the line is created once and updated
+        time, signal = pulse_signal(intensity, pulse_duration, frequency)
+        if self.signal_line is None:
+            self.signal_line, = self.ax_signal.plot(time, signal, label="Light Intensity", color='blue')
+            self.ax_signal.set_xlim(0, WINDOW_MS)
+            self.ax_signal.set_xlabel("Time (ms)")
+            self.ax_signal.set_ylabel("Intensity (mW/mm²)")
+            self.ax_signal.set_title("Intensity-Time Signal")
+            self.ax_signal.legend()
+            self.ax_signal.grid(True)
+        else:
+            self.signal_line.set_data(time, signal)
         self.ax_signal.set_ylim(0, max(intensity + 1, 2))
-        self.ax_signal.set_title("Intensity-Time Signal")
-        self.ax_signal.legend()
-        self.ax_signal.grid(True)
-        self.canvas_signal.draw()
+        self.canvas_signal.draw_idle()
 
         # Plotting the Spot Intensity Visualization
 
@@ -182,28 +164,29 @@ class NewRecipeDialog(QDialog):
         self.ax_spot.set_xlim(-max_size, max_size)
         self.ax_spot.set_ylim(-max_size, max_size)
 
-        # Create the spot_circle
-        self.spot_circle = plt.Circle(
-            (0, 0),
-            radius=spot_size,
-            facecolor='blue',
-            alpha=1.0,  # Initial alpha will be updated in animation
-            edgecolor='black',
-            label=f'Spot Size ({spot_size:.1f} mm)'
-        )
-        self.ax_spot.add_patch(self.spot_circle)
-
-        self.ax_spot.set_aspect('equal', adjustable='box')
-        self.ax_spot.axis('off')  # Hide axes for a cleaner look
-        self.ax_spot.set_title("Spot Intensity Visualization")
+        # Create the spot_circle once, then resize it
+        if self.spot_circle is None:
+            self.spot_circle = plt.Circle(
+                (0, 0),
+                radius=spot_size,
+                facecolor='blue',
+                alpha=1.0,  # Initial alpha will be updated in animation
+                edgecolor='black',
+            )
+            self.ax_spot.add_patch(self.spot_circle)
+
+            self.ax_spot.set_aspect('equal', adjustable='box')
+            self.ax_spot.axis('off')  # Hide axes for a cleaner look
+            self.ax_spot.set_title("Spot Intensity Visualization")
+        else:
+            self.spot_circle.set_radius(spot_size)
+        self.spot_circle.set_label(f"Spot Size ({spot_size:.1f} mm)")
         self.ax_spot.legend()
-        self.canvas_spot.draw()
-
-    def update_spot_animation(self):
-        """Update the spot's alpha value to reflect frequency and pulse duration."""
-        # Update animation time
-        self.animation_time += self.animation_interval / 1000.0  # Convert ms to seconds
+        self.spot_animation.set_artist(self.spot_circle)
+        self.canvas_spot.draw_idle()
 
+    def spot_alpha(self, elapsed):
+        """Spot alpha ``elapsed`` seconds into the pulse train (for SpotAnimation)."""
         intensity = self.intensity_input.value()
         frequency = self.frequency_input.value()
         pulse_duration_ms = self.pulse_duration_input.value()
@@ -212,27 +195,13 @@ class NewRecipeDialog(QDialog):
         if frequency == 0:
             frequency = 0.1
 
-        # Calculate period and pulse duration in seconds
-        period = 1.0 / frequency  # Period in seconds
-        pulse_duration_sec = pulse_duration_ms / 1000.0  # Convert ms to seconds
-
-        # Time within the current period
-        time_in_period = self.animation_time % period
-
-        if time_in_period < pulse_duration_sec:
+        if is_on(elapsed * 1000.0, pulse_duration_ms, frequency):
             current_intensity = intensity
         else:
             current_intensity = 0
 
-        # Update the spot's alpha
         normalized_intensity = current_intensity / self.intensity_input.maximum()
-        alpha = max(0.1, min(normalized_intensity, 1.0))
-
-        # Update the spot_circle's alpha if it exists
-        if self.spot_circle:
-            self.spot_circle.set_alpha(alpha)
-            # Redraw the canvas
-            self.canvas_spot.draw()
+        return max(0.1, min(normalized_intensity, 1.0))
 
     def save_recipe(self):
         """Save the new recipe to the database."""
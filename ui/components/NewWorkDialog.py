@@ -5,13 +5,17 @@ from PySide6.QtWidgets import (
     QComboBox, QSpinBox, QPushButton, QMessageBox
 )
 from src.data_controller import DataController
+from src.dosimetry import recipe_doses, describe
 
 class NewWorkDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.data_controller = DataController()
+        self.data_controller = DataController.shared()
         self.setWindowTitle("New Work")
+        self.recipes = []
+        self.doses = None  # per-well dose of every recipe for the current duration
         self.setup_ui()
+        self.update_dose()
 
     def setup_ui(self):
         layout = QVBoxLayout()
@@ -40,6 +44,21 @@ class NewWorkDialog(QDialog):
         duration_layout.addWidget(duration_label)
         duration_layout.addWidget(self.duration_input)
 
+        # Priority (higher runs first when works are run automatically)
+        priority_layout = QHBoxLayout()
+        priority_label = QLabel("Priority:")
+        self.priority_input = QSpinBox()
+        self.priority_input.setRange(-100, 100)
+        self.priority_input.setValue(0)
+        priority_layout.addWidget(priority_label)
+        priority_layout.addWidget(self.priority_input)
+
+        # Light delivered per well, before the work is saved or run
+        self.dose_label = QLabel()
+        self.dose_label.setWordWrap(True)
+        self.recipe_combo.currentIndexChanged.connect(self.show_dose)
+        self.duration_input.valueChanged.connect(self.update_dose)
+
         # Buttons
         button_layout = QHBoxLayout()
         save_button = QPushButton("Save")
@@ -53,16 +72,31 @@ class NewWorkDialog(QDialog):
         layout.addLayout(name_layout)
         layout.addLayout(recipe_layout)
         layout.addLayout(duration_layout)
+        layout.addLayout(priority_layout)
+        layout.addWidget(self.dose_label)
         layout.addLayout(button_layout)
 
         self.setLayout(layout)
 
     def load_recipes(self):
         """Load recipes into the combo box."""
-        recipes = self.data_controller.get_recipes()
-        for recipe in recipes:
+        self.recipes = self.data_controller.get_recipes()
+        for recipe in self.recipes:
             self.recipe_combo.addItem(recipe[1], recipe[0])  # Display name, store ID
 
+    def update_dose(self):
+        """Recompute the dose of every recipe for the chosen duration."""
+        self.doses = recipe_doses(self.recipes, self.duration_input.value())
+        self.show_dose()
+
+    def show_dose(self):
+        """Show the dose of the selected recipe."""
+        index = self.recipe_combo.currentIndex()
+        if self.doses is None or index < 0:
+            self.dose_label.setText("")
+            return
+        self.dose_label.setText(describe(self.doses[index]))
+
     def save_work(self):
         """Save the new work to the database."""
         name = self.name_input.text().strip()
@@ -72,9 +106,11 @@ class NewWorkDialog(QDialog):
 
         recipe_id = self.recipe_combo.currentData()
         duration = self.duration_input.value()
+        priority = self.priority_input.value()
 
         try:
-            self.data_controller.add_work(name, recipe_id, duration, status="Scheduled")
+            self.data_controller.add_work(name, recipe_id, duration, status="Scheduled",
+                                          priority=priority)
             self.accept()
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to save work: {str(e)}")
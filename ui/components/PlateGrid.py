@@ -8,12 +8,14 @@ from PySide6.QtWidgets import (
     QTabWidget,
     QDoubleSpinBox,
 )
-from PySide6.QtCore import Qt, QTimer, QObject, Signal
+from PySide6.QtCore import Qt, QObject, Signal
+from ui.components.SpotAnimation import SpotAnimation
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 import matplotlib.pyplot as plt
-import numpy as np
+from src.waveform import WINDOW_MS, pulse_signal, is_on
 
-from src.coords import CoordSystem
+from src.calibration import fit_affine
+from src.coords import WELL_CENTERS_RAW, CoordSystem
 
 
 class PlateGridSignalEmitter(QObject):
@@ -49,15 +51,15 @@ class PlateGrid(QWidget):
         )  # Width x Height of the holder
 
 
-        self.well_centers_raw = [
-            (84.93, 36.40),
-            (27.03, 36.40),
-            (51.46, 91.20)]
-        
+        self.well_centers_raw = list(WELL_CENTERS_RAW)
+
         self.well_size = 53 * mag_factor
         self.circle_radius = 10 * mag_factor
 
         self.custom_stimulation_points = self.well_centers_raw.copy()
+        # Jogged reference points (well index → RAW position) and the fit from them
+        self.calibration_refs = {}
+        self.calibration = None
 
         main_layout = QHBoxLayout()
 
@@ -115,9 +117,10 @@ class PlateGrid(QWidget):
             )
             calibration_layout.addWidget(set_button)
 
-        self.laser_x, self.laser_y = self.well_centers_raw[0]
-        self.laser_position, = self.ax.plot([], [], 'ro', markersize=13, label="Laser Position")
-        self.update_laser_position(self.laser_x, self.laser_y)
+        # Fit every well from the jogged reference points
+        fit_button = QPushButton("Fit Calibration (3+ points)")
+        fit_button.clicked.connect(self.fit_calibration)
+        calibration_layout.addWidget(fit_button)
 
         control_layout.addLayout(calibration_layout)
 
@@ -231,8 +234,10 @@ class PlateGrid(QWidget):
         self.frequency_input.valueChanged.connect(self.update_laser_plots)
         self.spot_size_input.valueChanged.connect(self.update_laser_plots)
 
-        # Initialize spot_circle
+        # Initialize spot_circle; it blinks only while the tab is shown
         self.spot_circle = None
+        self.signal_line = None
+        self.spot_animation = SpotAnimation(self.canvas_spot, self.spot_alpha, parent=self)
 
         # Initial plot for laser parameters
         self.update_laser_plots()
@@ -246,36 +251,25 @@ class PlateGrid(QWidget):
 
         self.setLayout(main_layout)
 
+        # Static plate, drawn in full only when the canvas needs it (first
+        # show, resize); the markers on top are blitted over a saved copy
+        self.plot_plate()
+        self._plate_background = None
+        self.canvas.mpl_connect("draw_event", self._on_plate_draw)
+
         # Initialize laser position at the center of the first well
         self.laser_x, self.laser_y = self.well_centers_raw[0]
         self.laser_position, = self.ax.plot(
-            [], [], "ro", markersize=8, label="Laser Position"
+            [], [], "ro", markersize=13, label="Laser Position", animated=True
         )
-        self.update_laser_position(self.laser_x, self.laser_y)
-
-        # Initial plot setup
-        self.plot_plate()
-
-        # Update laser position
-
-        self.laser_position, = self.ax.plot([], [], 'ro', markersize=13, label="Laser Position")
-        self.update_laser_position(self.laser_x, self.laser_y)
-        
-
         self.stimulation_points = []
         for i in range(len(self.well_centers_raw)):
-            point, = self.ax.plot([], [], "go", markersize=8, label=f"Stimulation Point {i + 1}")
+            point, = self.ax.plot([], [], "go", markersize=8, label=f"Stimulation Point {i + 1}",
+                                  animated=True)
             self.stimulation_points.append(point)
 
-        for i in range(len(self.custom_stimulation_points)):
-            self.update_calibration_position(i)
-
-        # Initialize animation timer
-        self.animation_timer = QTimer()
-        self.animation_timer.timeout.connect(self.update_spot_animation)
-        self.animation_interval = 50  # milliseconds
-        self.animation_timer.start(self.animation_interval)
-        self.animation_time = 0
+        self.update_laser_position(self.laser_x, self.laser_y)
+        self.update_calibration_positions()
 
     def plot_plate(self):
         """Plot the plate layout with a white platform background and wells at specified coordinates."""
@@ -298,10 +292,7 @@ class PlateGrid(QWidget):
         self.ax.add_patch(platform_rect)
 
         # Draw each well
-        for i, (x_raw, y_raw) in enumerate(self.well_centers_raw):
-            # Transform for display
-            display_x, display_y = self.coords.raw_to_disp(x_raw, y_raw)
-            display_y = self.platform_size[0] - display_y   # invert Y once
+        for i, (display_x, display_y) in enumerate(self.to_display(self.well_centers_raw)):
 
             # Create a rectangle representing the well
             square = plt.Rectangle(
@@ -335,19 +326,39 @@ class PlateGrid(QWidget):
                 color="white",
             )
 
-        # Update laser position for display
-        display_x = self.laser_y
-        display_x, display_y = self.coords.raw_to_disp(self.laser_x, self.laser_y)
-        display_y = self.platform_size[0] - display_y
-        self.laser_position.set_data([display_x], [display_y])
-
         # Adjust plot aesthetics
         self.ax.invert_yaxis()
         self.ax.grid(visible=True, which="both", color="gray", linestyle="--", linewidth=0.5)
         self.ax.axis("off")
 
-        # Redraw the canvas
-        self.canvas.draw()
+        # Redraw the canvas (the background is saved in _on_plate_draw)
+        self.canvas.draw_idle()
+
+    def _markers(self):
+        return [*self.stimulation_points, self.laser_position]
+
+    def _on_plate_draw(self, event):
+        """After a full draw: save the plate without markers, then add them."""
+        self._plate_background = self.canvas.copy_from_bbox(self.figure.bbox)
+        for artist in self._markers():
+            self.ax.draw_artist(artist)
+
+    def redraw_markers(self):
+        """Redraw only the laser and stimulation point markers."""
+        if self._plate_background is None:
+            # Not drawn yet; the first full draw will paint the markers
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self._plate_background)
+        for artist in self._markers():
+            self.ax.draw_artist(artist)
+        self.canvas.blit(self.figure.bbox)
+
+    def to_display(self, points_raw):
+        """RAW points → N×2 display array, Y inverted for the plate axes."""
+        display = self.coords.raw_to_disp_many(points_raw)
+        display[:, 1] = self.platform_size[0] - display[:, 1]
+        return display
 
     def update_laser_position(self, x, y):
         """Update the laser position to a specific coordinate."""
@@ -355,7 +366,7 @@ class PlateGrid(QWidget):
         display_x, display_y = self.coords.raw_to_disp(x, y)
         display_y = self.platform_size[0] - display_y        # invert once
         self.laser_position.set_data([display_x], [display_y])
-        self.canvas.draw()
+        self.redraw_markers()
 
     def update_calibration_position(self, well_index):
         """Update the custom stimulation point position for a specific well."""
@@ -364,18 +375,50 @@ class PlateGrid(QWidget):
         display_x, display_y = self.coords.raw_to_disp(stim_x, stim_y)
         display_y = self.platform_size[0] - display_y
         self.stimulation_points[well_index].set_data([display_x], [display_y])
-        self.canvas.draw()
+        self.redraw_markers()
+
+    def update_calibration_positions(self):
+        """Update every custom stimulation point marker with one redraw."""
+        display = self.to_display(self.custom_stimulation_points)
+        for marker, (display_x, display_y) in zip(self.stimulation_points, display):
+            marker.set_data([display_x], [display_y])
+        self.redraw_markers()
 
     def set_stimulation_point(self, well_index):
         """Set the custom stimulation point to the current laser position."""
         # Store the actual coordinates
         self.custom_stimulation_points[well_index] = tuple(self.laser_raw)
+        self.calibration_refs[well_index] = tuple(self.laser_raw)
         self.well_calibration_entries[well_index].setText(f"{self.custom_stimulation_points[well_index]}")
 
         # Update the specific well's stimulation point
         self.update_calibration_position(well_index)
 
 
+    def fit_calibration(self):
+        """Fit nominal → machine coordinates from the set wells and derive the rest."""
+        wells = sorted(self.calibration_refs)
+        try:
+            self.calibration = fit_affine(
+                [self.well_centers_raw[i] for i in wells],
+                self.coords.raw_to_cnc_many([self.calibration_refs[i] for i in wells]),
+            )
+        except ValueError as e:
+            self.signal_emitter.log_message_signal.emit(f"Calibration failed: {e}")
+            return
+
+        derived = self.coords.cnc_to_raw_many(self.calibration.apply(self.well_centers_raw))
+        for i, (x, y) in enumerate(derived):
+            if i not in self.calibration_refs:
+                self.custom_stimulation_points[i] = (round(x, 3), round(y, 3))
+                self.well_calibration_entries[i].setText(f"{self.custom_stimulation_points[i]}")
+        self.update_calibration_positions()
+
+        self.signal_emitter.log_message_signal.emit(
+            f"Calibration fitted from {self.calibration.n_points} points: "
+            f"RMS error {self.calibration.rms_error:.3f} mm, "
+            f"max {self.calibration.max_error:.3f} mm")
+
     def _nudge(self, dx=0.0, dy=0.0):
         self.laser_raw[0] += dx
         self.laser_raw[1] += dy
@@ -414,34 +457,21 @@ class PlateGrid(QWidget):
         if frequency == 0:
             frequency = 0.1
 
-        # Reset animation time
-        self.animation_time = 0
-
-        # Clear the axes before plotting new data
-        self.ax_signal.cla()
-        self.ax_spot.cla()
-
-        # Plotting the Intensity-Time Signal
-
-        # Generate signal based on frequency and duration
-        time_end = 2000  # ms
-        time = np.linspace(0, time_end, 1000)
-        pulse_interval = 1000 / frequency  # ms per cycle
-        signal = np.zeros_like(time)
-
-        for i, t in enumerate(time):
-            if (t % pulse_interval) < duration:
-                signal[i] = intensity
-
-        # Plot signal
-        self.ax_signal.plot(time, signal, label="Light Intensity", color="blue")
-        self.ax_signal.set_xlabel("Time (ms)")
-        self.ax_signal.set_ylabel("Intensity (mW/mm²)")
+        # Plotting the Intensity-Time Signal: exact pulse edges from the
+        # shared, cached waveform; the line is created once and updated
+        time, signal = pulse_signal(intensity, duration, frequency)
+        if self.signal_line is None:
+            self.signal_line, = self.ax_signal.plot(time, signal, label="Light Intensity", color="blue")
+            self.ax_signal.set_xlim(0, WINDOW_MS)
+            self.ax_signal.set_xlabel("Time (ms)")
+            self.ax_signal.set_ylabel("Intensity (mW/mm²)")
+            self.ax_signal.set_title("Intensity-Time Signal")
+            self.ax_signal.legend()
+            self.ax_signal.grid(True)
+        else:
+            self.signal_line.set_data(time, signal)
         self.ax_signal.set_ylim(0, max(intensity + 1, 2))
-        self.ax_signal.set_title("Intensity-Time Signal")
-        self.ax_signal.legend()
-        self.ax_signal.grid(True)
-        self.canvas_signal.draw()
+        self.canvas_signal.draw_idle()
 
         # Plotting the Spot Intensity Visualization
 
@@ -450,28 +480,29 @@ class PlateGrid(QWidget):
         self.ax_spot.set_xlim(-max_size, max_size)
         self.ax_spot.set_ylim(-max_size, max_size)
 
-        # Create the spot_circle
-        self.spot_circle = plt.Circle(
-            (0, 0),
-            radius=spot_size,
-            facecolor="blue",
-            alpha=1.0,  # Initial alpha will be updated in animation
-            edgecolor="black",
-            label=f"Spot Size ({spot_size:.1f} mm)",
-        )
-        self.ax_spot.add_patch(self.spot_circle)
+        # Create the spot_circle once, then resize it
+        if self.spot_circle is None:
+            self.spot_circle = plt.Circle(
+                (0, 0),
+                radius=spot_size,
+                facecolor="blue",
+                alpha=1.0,  # Initial alpha will be updated in animation
+                edgecolor="black",
+            )
+            self.ax_spot.add_patch(self.spot_circle)
 
-        self.ax_spot.set_aspect("equal", adjustable="box")
-        self.ax_spot.axis("off")  # Hide axes for a cleaner look
-        self.ax_spot.set_title("Spot Intensity Visualization")
+            self.ax_spot.set_aspect("equal", adjustable="box")
+            self.ax_spot.axis("off")  # Hide axes for a cleaner look
+            self.ax_spot.set_title("Spot Intensity Visualization")
+        else:
+            self.spot_circle.set_radius(spot_size)
+        self.spot_circle.set_label(f"Spot Size ({spot_size:.1f} mm)")
         self.ax_spot.legend()
-        self.canvas_spot.draw()
-
-    def update_spot_animation(self):
-        """Update the spot's alpha value to reflect frequency and pulse duration."""
-        # Update animation time
-        self.animation_time += self.animation_interval / 1000.0  # Convert ms to seconds
+        self.spot_animation.set_artist(self.spot_circle)
+        self.canvas_spot.draw_idle()
 
+    def spot_alpha(self, elapsed):
+        """Spot alpha ``elapsed`` seconds into the pulse train (for SpotAnimation)."""
         intensity = self.intensity_input.value()
         frequency = self.frequency_input.value()
         pulse_duration_ms = self.duration_input.value()
@@ -480,27 +511,13 @@ class PlateGrid(QWidget):
         if frequency == 0:
             frequency = 0.1
 
-        # Calculate period and pulse duration in seconds
-        period = 1.0 / frequency  # Period in seconds
-        pulse_duration_sec = pulse_duration_ms / 1000.0  # Convert ms to seconds
-
-        # Time within the current period
-        time_in_period = self.animation_time % period
-
-        if time_in_period < pulse_duration_sec:
+        if is_on(elapsed * 1000.0, pulse_duration_ms, frequency):
             current_intensity = intensity
         else:
             current_intensity = 0
 
-        # Update the spot's alpha
         normalized_intensity = current_intensity / self.intensity_input.maximum()
-        alpha = max(0.05, min(normalized_intensity, 1.0))
-
-        # Update the spot_circle's alpha if it exists
-        if self.spot_circle:
-            self.spot_circle.set_alpha(alpha)
-            # Redraw the canvas
-            self.canvas_spot.draw()
+        return max(0.05, min(normalized_intensity, 1.0))
 
     def send_settings(self):
         """Send the current laser settings to the laser control system."""
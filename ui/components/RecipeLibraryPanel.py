@@ -1,40 +1,88 @@
 # ui/components/RecipeLibraryPanel.py
 
 from PySide6.QtWidgets import (
-    QWidget, QLabel, QVBoxLayout, QPushButton, QListWidget, 
-    QListWidgetItem, QMessageBox, QHBoxLayout, QMenu
+    QWidget, QLabel, QVBoxLayout, QPushButton, QListView, QLineEdit,
+    QMessageBox, QHBoxLayout, QGridLayout, QMenu
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtGui import QDoubleValidator
 from ui.components.NewRecipeDialog import NewRecipeDialog
+from ui.components.RecipeListModel import RecipeListModel
 from src.data_controller import DataController
 
+# (column, label) of the range filters
+RANGE_FILTERS = [
+    ("intensity", "Intensity"),
+    ("frequency", "Freq (Hz)"),
+    ("pulse_duration", "Pulse (ms)"),
+    ("spot_size", "Spot size"),
+]
+# Typing restarts the timer; the search runs once typing pauses
+FILTER_DEBOUNCE_MS = 250
+
 class RecipeLibraryPanel(QWidget):
     def __init__(self):
         super().__init__()
         self.setFixedWidth(200)
-        self.data_controller = DataController()
+        self.data_controller = DataController.shared()
 
         layout = QVBoxLayout()
-        
+
         # Title
         title = QLabel("Recipe Library")
         title.setStyleSheet("font-weight: bold; font-size: 16px;")
-        
-        # Recipe List
-        self.recipe_list = QListWidget()
+
+        # Search by name prefix
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Search name…")
+        self.search_input.setClearButtonEnabled(True)
+        self.search_input.textChanged.connect(self.schedule_filter)
+
+        # Parameter ranges, hidden until asked for; a blank bound is open
+        self.filters_button = QPushButton("Filters ▸")
+        self.filters_button.setCheckable(True)
+        self.filters_button.toggled.connect(self.toggle_filters)
+        self.filters_widget = QWidget()
+        filters_layout = QGridLayout()
+        filters_layout.setContentsMargins(0, 0, 0, 0)
+        self.range_inputs = {}
+        for row, (column, label) in enumerate(RANGE_FILTERS):
+            low, high = QLineEdit(), QLineEdit()
+            for edit, placeholder in ((low, "min"), (high, "max")):
+                edit.setPlaceholderText(placeholder)
+                edit.setValidator(QDoubleValidator())
+                edit.setFixedWidth(50)
+                edit.textChanged.connect(self.schedule_filter)
+            filters_layout.addWidget(QLabel(label), row, 0)
+            filters_layout.addWidget(low, row, 1)
+            filters_layout.addWidget(high, row, 2)
+            self.range_inputs[column] = (low, high)
+        self.filters_widget.setLayout(filters_layout)
+        self.filters_widget.setVisible(False)
+
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(FILTER_DEBOUNCE_MS)
+        self.filter_timer.timeout.connect(self.apply_filter)
+
+        # Recipe List, paged from the database as it scrolls
+        self.model = RecipeListModel(self.data_controller, parent=self)
+        self.recipe_list = QListView()
+        self.recipe_list.setModel(self.model)
+        self.recipe_list.setUniformItemSizes(True)
         self.recipe_list.setContextMenuPolicy(Qt.CustomContextMenu)
         self.recipe_list.customContextMenuRequested.connect(self.show_context_menu)
-        
-        # Load recipes from the database
-        self.load_recipes()
+        self.match_label = QLabel()
+        self.match_label.setStyleSheet("color: #7f8c8d;")
+        self.update_match_count()
 
         # Buttons Layout
         button_layout = QHBoxLayout()
-        
+
         # New and Delete Buttons
         new_button = QPushButton("New")
         delete_button = QPushButton("Delete")
-        
+
         # Connect buttons
         new_button.clicked.connect(self.open_new_recipe_dialog)
         delete_button.clicked.connect(self.delete_selected_recipe)
@@ -45,21 +93,53 @@ class RecipeLibraryPanel(QWidget):
 
         # Add widgets to main layout
         layout.addWidget(title)
+        layout.addWidget(self.search_input)
+        layout.addWidget(self.filters_button)
+        layout.addWidget(self.filters_widget)
         layout.addWidget(self.recipe_list)
+        layout.addWidget(self.match_label)
         layout.addLayout(button_layout)
-        
+
         self.setLayout(layout)
 
+    def toggle_filters(self, shown):
+        self.filters_widget.setVisible(shown)
+        self.filters_button.setText("Filters ▾" if shown else "Filters ▸")
+
+    def schedule_filter(self):
+        """Restart the debounce timer; the search runs when typing pauses."""
+        self.filter_timer.start()
+
+    def current_ranges(self):
+        """``{column: (low, high)}`` of the filled-in range bounds."""
+        ranges = {}
+        for column, (low, high) in self.range_inputs.items():
+            bounds = tuple(self._bound(edit) for edit in (low, high))
+            if bounds != (None, None):
+                ranges[column] = bounds
+        return ranges
+
+    @staticmethod
+    def _bound(edit):
+        try:
+            return float(edit.text().replace(",", "."))
+        except ValueError:
+            return None
+
+    def apply_filter(self):
+        """Run the search in the name box and range filters."""
+        self.filter_timer.stop()
+        self.model.set_filter(self.search_input.text().strip(), self.current_ranges())
+        self.update_match_count()
+
+    def update_match_count(self):
+        count = self.model.match_count()
+        self.match_label.setText(f"{count} recipe{'s' if count != 1 else ''}")
+
     def load_recipes(self):
-        """Load recipes from the database and display them in the list."""
-        recipes = self.data_controller.get_recipes()
-        self.recipe_list.clear()
-        for recipe in recipes:
-            recipe_id = recipe[0]
-            recipe_name = recipe[1]
-            item = QListWidgetItem(recipe_name)
-            item.setData(Qt.UserRole, recipe_id)  # Store recipe ID in the item
-            self.recipe_list.addItem(item)
+        """Reload the recipes matching the current search."""
+        self.model.reload()
+        self.update_match_count()
 
     def open_new_recipe_dialog(self):
         """Open the New Recipe Dialog."""
@@ -69,13 +149,13 @@ class RecipeLibraryPanel(QWidget):
 
     def delete_selected_recipe(self):
         """Delete the selected recipe after confirmation."""
-        current_item = self.recipe_list.currentItem()
-        if not current_item:
+        current = self.recipe_list.currentIndex()
+        if not current.isValid():
             QMessageBox.warning(self, "No Selection", "Please select a recipe to delete.")
             return
 
-        recipe_id = current_item.data(Qt.UserRole)
-        recipe_name = current_item.text()
+        recipe_id = current.data(Qt.UserRole)
+        recipe_name = current.data(Qt.DisplayRole)
 
         reply = QMessageBox.question(
             self,
@@ -97,7 +177,7 @@ class RecipeLibraryPanel(QWidget):
         """Show context menu for recipe list."""
         menu = QMenu()
         delete_action = menu.addAction("Delete")
-        
+
         action = menu.exec_(self.recipe_list.mapToGlobal(position))
         if action == delete_action:
             self.delete_selected_recipe()
@@ -0,0 +1,72 @@
+# ui/components/RecipeListModel.py
+
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex
+
+class RecipeListModel(QAbstractListModel):
+    """
+    Recipes matching a search, ordered by name and read one page at a time.
+
+    ``set_filter`` swaps in a new search; the view pulls further pages with
+    ``fetchMore`` only as it scrolls.
+    """
+
+    RecipeRole = Qt.UserRole + 1
+
+    def __init__(self, data_controller, page_size=100, parent=None):
+        super().__init__(parent)
+        self.data_controller = data_controller
+        self.page_size = page_size
+        self.prefix = ""
+        self.ranges = {}
+        self._recipes = []
+        self._exhausted = False
+        self.reload()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._recipes)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._recipes):
+            return None
+        recipe = self._recipes[index.row()]
+        if role == Qt.DisplayRole:
+            return recipe[1]
+        if role == Qt.UserRole:
+            return recipe[0]
+        if role == self.RecipeRole:
+            return recipe
+        if role == Qt.ToolTipRole:
+            return (f"Intensity {recipe[2]}, pulse {recipe[3]} ms, "
+                    f"{recipe[4]} Hz, spot {recipe[5]}")
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        after = (self._recipes[-1][1], self._recipes[-1][0]) if self._recipes else None
+        page = self.data_controller.search_recipes(self.prefix, self.ranges, after,
+                                                   self.page_size)
+        self._exhausted = len(page) < self.page_size
+        if page:
+            first = len(self._recipes)
+            self.beginInsertRows(QModelIndex(), first, first + len(page) - 1)
+            self._recipes.extend(page)
+            self.endInsertRows()
+
+    def set_filter(self, prefix="", ranges=None):
+        """Show recipes whose name starts with ``prefix`` and within ``ranges``."""
+        self.prefix = prefix
+        self.ranges = dict(ranges or {})
+        self.reload()
+
+    def reload(self):
+        """Read the first page of the current search again."""
+        self.beginResetModel()
+        self._recipes = self.data_controller.search_recipes(self.prefix, self.ranges,
+                                                            limit=self.page_size)
+        self._exhausted = len(self._recipes) < self.page_size
+        self.endResetModel()
+
+    def match_count(self):
+        return self.data_controller.count_recipes(self.prefix, self.ranges)
@@ -0,0 +1,76 @@
+# ui/components/SpotAnimation.py
+
+import time
+from PySide6.QtCore import QObject, QTimer, QEvent
+
+class SpotAnimation(QObject):
+    """
+    Blinks one matplotlib artist (the laser spot) in step with a pulse train.
+
+    Only the artist is redrawn, blitted over a copy of the rest of the
+    figure saved after each full draw, and only when its alpha changes. The
+    timer runs while the canvas is shown (it pauses when its tab or window
+    is hidden) and is deleted with ``parent``.
+    """
+
+    def __init__(self, canvas, alpha_at, interval_ms=50, parent=None):
+        super().__init__(parent)
+        self.canvas = canvas
+        self.alpha_at = alpha_at          # seconds since restart() → alpha
+        self.artist = None
+        self._background = None
+        self._alpha = None
+        self._t0 = time.perf_counter()
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self.tick)
+        canvas.installEventFilter(self)
+        canvas.mpl_connect("draw_event", self._on_draw)
+        if canvas.isVisible():
+            self.timer.start()
+
+    def set_artist(self, artist):
+        """Animate ``artist``; call before the canvas's next full draw."""
+        artist.set_animated(True)
+        self.artist = artist
+        self._background = None           # until the figure is redrawn with it
+        self._alpha = None
+        self.restart()
+
+    def restart(self):
+        self._t0 = time.perf_counter()
+
+    def eventFilter(self, watched, event):
+        if watched is self.canvas:
+            if event.type() == QEvent.Show:
+                self.restart()
+                self.timer.start()
+            elif event.type() == QEvent.Hide:
+                self.timer.stop()
+        return False
+
+    def _on_draw(self, event):
+        self._background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        if self.artist is not None and self.artist.axes is not None:
+            self._draw_artist()
+
+    def _draw_artist(self):
+        axes = self.artist.axes
+        axes.draw_artist(self.artist)
+        # Keep the legend on top of the spot
+        legend = axes.get_legend()
+        if legend is not None:
+            axes.draw_artist(legend)
+
+    def tick(self):
+        if self.artist is None or self.artist.axes is None or self._background is None:
+            return
+        alpha = self.alpha_at(time.perf_counter() - self._t0)
+        if alpha == self._alpha:
+            return
+        self._alpha = alpha
+        self.artist.set_alpha(alpha)
+        self.canvas.restore_region(self._background)
+        self._draw_artist()
+        self.canvas.blit(self.canvas.figure.bbox)
@@ -2,6 +2,7 @@
 
 import serial.tools.list_ports
 from PySide6.QtWidgets import QWidget, QPushButton, QHBoxLayout, QLabel, QComboBox
+from ui.components.AddRigDialog import AddRigDialog
 
 class TopBar(QWidget):
     def __init__(self, main_controller):
@@ -38,6 +39,14 @@ class TopBar(QWidget):
         self.test_cnc_button = QPushButton("Test CNC")
         self.test_cnc_button.clicked.connect(self.main_controller.test_cnc_connection)
         
+        # Extra rigs and unattended running of Scheduled works
+        self.add_rig_button = QPushButton("Add Rig")
+        self.add_rig_button.clicked.connect(self.show_add_rig_dialog)
+        self.auto_run_button = QPushButton("Auto-run Scheduled")
+        self.auto_run_button.setCheckable(True)
+        self.rig_status_label = QLabel()
+        self.update_rig_status()
+
         # Port selection for G-code printer
         self.gcode_port_combo = QComboBox()
         self.gcode_port_combo.setFixedWidth(120)
@@ -62,6 +71,9 @@ class TopBar(QWidget):
         self.layout.addWidget(self.emergency_stop_button)
         self.layout.addWidget(self.test_arduino_button)  # Add Test Arduino button
         self.layout.addWidget(self.test_cnc_button)  # Add Test CNC button
+        self.layout.addWidget(self.add_rig_button)
+        self.layout.addWidget(self.auto_run_button)
+        self.layout.addWidget(self.rig_status_label)
 
         self.setLayout(self.layout)
 
@@ -80,3 +92,12 @@ class TopBar(QWidget):
     def update_arduino_port(self):
         selected_port = self.arduino_port_combo.currentText()
         self.main_controller.set_arduino_port(selected_port)
+
+    def show_add_rig_dialog(self):
+        AddRigDialog(self.main_controller, self).exec()
+        self.update_rig_status()
+
+    def update_rig_status(self):
+        rigs = list(self.main_controller.rigs)
+        busy = sum(1 for rig in rigs if not rig.is_idle())
+        self.rig_status_label.setText(f"Rigs: {busy}/{len(rigs)} busy")
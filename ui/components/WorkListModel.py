@@ -0,0 +1,194 @@
+# ui/components/WorkListModel.py
+
+from PySide6.QtWidgets import QStyledItemDelegate, QStyle
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex, QRect, QSize, QEvent, Signal
+from PySide6.QtGui import QColor, QFont, QPen
+
+# Row layout of DataController.get_works*(): id, name, recipe_id, duration,
+# status, priority, recipe_name
+WORK_ID, WORK_NAME, WORK_DURATION, WORK_STATUS, WORK_RECIPE_NAME = 0, 1, 3, 4, 6
+
+class WorkListModel(QAbstractListModel):
+    """
+    Works, newest first, read from SQLite one page at a time.
+
+    The view asks for the next page (``fetchMore``) only when it scrolls to
+    the end of the loaded rows. ``refresh`` and ``update_work`` change rows in
+    place, so the view repaints just the rows whose work changed.
+    """
+
+    WorkRole = Qt.UserRole + 1
+
+    def __init__(self, data_controller, page_size=100, parent=None):
+        super().__init__(parent)
+        self.data_controller = data_controller
+        self.page_size = page_size
+        self._works = []
+        self._exhausted = False
+        self.reload()
+
+    # ─────────────────────── Qt model API ───────────────────────
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._works)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._works):
+            return None
+        work = self._works[index.row()]
+        if role == self.WorkRole:
+            return work
+        if role == Qt.DisplayRole:
+            return f"{work[WORK_NAME]} - {work[WORK_STATUS]}"
+        if role == Qt.ToolTipRole:
+            return f"Recipe: {work[WORK_RECIPE_NAME]}, {work[WORK_DURATION]} s per point"
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        before = self._works[-1][WORK_ID] if self._works else None
+        page = self.data_controller.get_works_page(before, self.page_size)
+        self._exhausted = len(page) < self.page_size
+        if page:
+            first = len(self._works)
+            self.beginInsertRows(QModelIndex(), first, first + len(page) - 1)
+            self._works.extend(page)
+            self.endInsertRows()
+
+    # ───────────────────────── updates ──────────────────────────
+    def reload(self):
+        """Drop every loaded row and read the first page again."""
+        self.beginResetModel()
+        self._works = self.data_controller.get_works_page(None, self.page_size)
+        self._exhausted = len(self._works) < self.page_size
+        self.endResetModel()
+
+    def row_of(self, work_id):
+        for row, work in enumerate(self._works):
+            if work[WORK_ID] == work_id:
+                return row
+        return None
+
+    def update_work(self, work_id):
+        """Re-read one work and update, insert or remove its row."""
+        work = self.data_controller.get_work_by_id(work_id)
+        row = self.row_of(work_id)
+        if row is None:
+            if work is not None:
+                self.refresh()
+        elif work is None:
+            self._remove_row(row)
+        elif work != self._works[row]:
+            self._works[row] = work
+            index = self.index(row)
+            self.dataChanged.emit(index, index)
+
+    def refresh(self):
+        """
+        Bring the loaded rows up to date with the database: new works are
+        inserted, deleted ones removed and changed ones updated in place.
+        The pages come through DataController's read cache, so a refresh
+        with nothing changed does not touch the disk.
+        """
+        if not self._works:
+            self.reload()
+            return
+        floor = self._works[-1][WORK_ID]
+        fresh, before = [], None
+        while True:
+            page = self.data_controller.get_works_page(before, self.page_size)
+            fresh.extend(work for work in page if work[WORK_ID] >= floor)
+            if len(page) < self.page_size or page[-1][WORK_ID] <= floor:
+                break
+            before = page[-1][WORK_ID]
+
+        fresh_ids = {work[WORK_ID] for work in fresh}
+        for row in reversed(range(len(self._works))):
+            if self._works[row][WORK_ID] not in fresh_ids:
+                self._remove_row(row)
+
+        # Both lists are now sorted newest first; merge the differences
+        for row, work in enumerate(fresh):
+            if row < len(self._works) and self._works[row][WORK_ID] == work[WORK_ID]:
+                if self._works[row] != work:
+                    self._works[row] = work
+                    index = self.index(row)
+                    self.dataChanged.emit(index, index)
+            else:
+                self.beginInsertRows(QModelIndex(), row, row)
+                self._works.insert(row, work)
+                self.endInsertRows()
+
+    def _remove_row(self, row):
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._works[row]
+        self.endRemoveRows()
+
+
+class WorkItemDelegate(QStyledItemDelegate):
+    """Paints a work row with its Start and Delete buttons; no widgets per row."""
+
+    start_clicked = Signal(int)
+    delete_clicked = Signal(int)
+
+    ROW_HEIGHT = 48
+    BUTTON_WIDTH = 80
+    BUTTON_HEIGHT = 26
+    BACKGROUNDS = {"Finished": "#e8f5e9", "In Progress": "#fff3e0"}
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.ROW_HEIGHT)
+
+    def button_rects(self, rect):
+        """(start, delete) button rectangles inside a row's ``rect``."""
+        top = rect.top() + (rect.height() - self.BUTTON_HEIGHT) // 2
+        delete = QRect(rect.right() - 5 - self.BUTTON_WIDTH, top,
+                       self.BUTTON_WIDTH, self.BUTTON_HEIGHT)
+        start = delete.translated(-self.BUTTON_WIDTH - 5, 0)
+        return start, delete
+
+    def paint(self, painter, option, index):
+        work = index.data(WorkListModel.WorkRole)
+        if work is None:
+            return
+        painter.save()
+        rect = option.rect.adjusted(0, 1, 0, -1)
+        painter.fillRect(rect, QColor(self.BACKGROUNDS.get(work[WORK_STATUS], "white")))
+        if option.state & QStyle.State_MouseOver:
+            painter.setPen(QPen(QColor("#bdc3c7")))
+            painter.drawRect(rect.adjusted(0, 0, -1, -1))
+
+        start, delete = self.button_rects(option.rect)
+        text_rect = QRect(rect.left() + 5, rect.top() + 2,
+                          start.left() - rect.left() - 10, rect.height() - 4)
+        font = QFont(option.font)
+        font.setBold(True)
+        painter.setFont(font)
+        painter.setPen(QColor("#2c3e50"))
+        painter.drawText(text_rect, Qt.AlignLeft | Qt.AlignTop, index.data(Qt.DisplayRole))
+        painter.setFont(option.font)
+        painter.drawText(text_rect, Qt.AlignLeft | Qt.AlignBottom,
+                         f"ID: {work[WORK_ID]}  ·  {work[WORK_RECIPE_NAME]}")
+
+        for button, label, background, color in ((start, "Start", "#e0e0e0", "black"),
+                                                  (delete, "Delete", "#ff4444", "white")):
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor(background))
+            painter.drawRoundedRect(button, 4, 4)
+            painter.setPen(QColor(color))
+            painter.drawText(button, Qt.AlignCenter, label)
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            work = index.data(WorkListModel.WorkRole)
+            start, delete = self.button_rects(option.rect)
+            pos = event.position().toPoint()
+            if work is not None and start.contains(pos):
+                self.start_clicked.emit(work[WORK_ID])
+                return True
+            if work is not None and delete.contains(pos):
+                self.delete_clicked.emit(work[WORK_ID])
+                return True
+        return super().editorEvent(event, model, option, index)